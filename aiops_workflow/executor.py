@@ -0,0 +1,324 @@
+"""
+Concurrent Workflow Executor
+
+Runs many AIOps workflows at once on a fixed pool of worker threads, all
+sharing one compiled graph (get_aiops_app; each incident is its own
+checkpointed thread, so runs do not interfere):
+
+1. Priority: queued incidents start in order of alert_details["severity"]
+   (critical first), then arrival.
+2. Backpressure: at most AIOPS_MAX_QUEUED_WORKFLOWS wait. When the queue is
+   full a more severe incident displaces the least severe queued one
+   ("shed"; queued approvals are never shed, their checkpoint would stay
+   paused with no run to resume it); otherwise submit() blocks up to its timeout or raises
+   OverloadedError.
+3. Status: every incident has a record (queued, running,
+   awaiting_approval, completed, failed, cancelled, shed) with its queue
+   wait and run time, queryable by incident id.
+4. Cancellation: queued runs are dropped; running ones stop at the next
+   superstep boundary (a LangGraph run cannot be interrupted mid-node).
+
+Approvals are resumed through the same pool (resume()).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from langgraph.types import Command
+from config.settings import settings
+from chatops.perf import perf
+from .intake import severity_rank
+
+FINISHED = ("completed", "failed", "cancelled", "shed")
+MAX_FINISHED_RECORDS = 1000
+
+
+class OverloadedError(RuntimeError):
+    """Raised when the workflow queue is full"""
+
+
+class _Run:
+    __slots__ = ("incident_id", "severity", "rank", "payload", "status", "error", "result",
+                 "submitted_at", "started_at", "finished_at", "queue_wait_s", "cancel_requested")
+
+    def __init__(self, incident_id: str, severity: str, payload):
+        self.incident_id = incident_id
+        self.severity = severity
+        self.rank = severity_rank(severity)
+        self.payload = payload
+        self.status = "queued"
+        self.error = None
+        self.result = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.queue_wait_s = None
+        self.cancel_requested = False
+
+    def info(self) -> Dict:
+        return {
+            "incident_id": self.incident_id,
+            "severity": self.severity,
+            "status": self.status,
+            "error": self.error,
+            "queue_wait_s": self.queue_wait_s,
+            "run_s": (self.finished_at or time.time()) - self.started_at if self.started_at else None,
+            "submitted_at": self.submitted_at,
+            "state": self.result,
+        }
+
+
+class WorkflowExecutor:
+    """Bounded, severity-prioritised pool running AIOps workflows concurrently"""
+
+    def __init__(self, app=None, max_workers: int = None, max_queue: int = None):
+        """
+        Initialize WorkflowExecutor
+
+        Args:
+            app: Compiled graph with a checkpointer (default: get_aiops_app())
+            max_workers: Workflows running at once (default AIOPS_MAX_CONCURRENT_WORKFLOWS)
+            max_queue: Workflows waiting for a worker (default AIOPS_MAX_QUEUED_WORKFLOWS)
+        """
+        from .graph import get_aiops_app
+        self.app = app or get_aiops_app()
+        self.max_workers = max_workers or settings.AIOPS_MAX_CONCURRENT_WORKFLOWS
+        self.max_queue = max_queue if max_queue is not None else settings.AIOPS_MAX_QUEUED_WORKFLOWS
+
+        self._cond = threading.Condition()
+        self._heap = []  # (-rank, seq, run); cancelled/shed entries are skipped when popped
+        self._sequence = itertools.count()
+        self._queued = 0
+        self._running = 0
+        self._runs: "OrderedDict[str, _Run]" = OrderedDict()
+        self._closed = False
+        self.counts = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "shed": 0, "rejected": 0}
+        self._workers = [threading.Thread(target=self._work, name=f"aiops-workflow-{i}", daemon=True)
+                         for i in range(self.max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, state: Dict, block: bool = False, timeout: float = None) -> str:
+        """
+        Queue a workflow for an incident (idempotent per alert_id)
+
+        Args:
+            state: Initial AgentState (alert_id is the incident id)
+            block: Wait for queue space instead of failing when the queue is full
+            timeout: Maximum wait when blocking (None = no limit)
+
+        Returns:
+            The incident id
+
+        Raises:
+            OverloadedError: If the queue is full (after the timeout when blocking)
+        """
+        incident_id = state["alert_id"]
+        run = _Run(incident_id, (state.get("alert_details") or {}).get("severity"), state)
+        with self._cond:
+            if incident_id in self._runs and self._runs[incident_id].status not in ("failed", "cancelled", "shed"):
+                return incident_id  # already queued, running or done: never run the collectors twice
+            self._wait_for_room(run, block, timeout)
+            self.counts["submitted"] += 1
+            self._enqueue(run)
+        return incident_id
+
+    def resume(self, incident_id: str, approved: bool, block: bool = False, timeout: float = None) -> bool:
+        """
+        Queue the human decision for a workflow paused at the approval interrupt
+
+        Args:
+            incident_id: Incident awaiting approval
+            approved: The decision
+            block: Wait for queue space instead of failing when the queue is full
+            timeout: Maximum wait when blocking (None = no limit)
+
+        Returns:
+            False if the incident is not awaiting approval
+
+        Raises:
+            OverloadedError: If the queue is full (after the timeout when blocking)
+        """
+        with self._cond:
+            run = self._runs.get(incident_id)
+            if run is None:
+                # Paused before a restart: the checkpoint knows the incident
+                state = self.app.get_state({"configurable": {"thread_id": incident_id}})
+                if "human_approval" not in state.next:
+                    return False
+                run = _Run(incident_id, (state.values.get("alert_details") or {}).get("severity"), None)
+                run.status = "awaiting_approval"
+            elif run.status != "awaiting_approval":
+                return False
+            self._wait_for_room(run, block, timeout)
+            if self._runs.get(incident_id, run) is not run or run.status != "awaiting_approval":
+                return False  # resumed by someone else while waiting
+            run.payload = Command(resume=approved)
+            run.status = "queued"
+            run.submitted_at = time.time()
+            run.started_at = run.finished_at = None
+            self._enqueue(run)
+            return True
+
+    def cancel(self, incident_id: str) -> bool:
+        """
+        Cancel a queued or running workflow
+
+        Returns:
+            False if the incident is unknown or already finished
+        """
+        with self._cond:
+            run = self._runs.get(incident_id)
+            if run is None or run.status not in ("queued", "running"):
+                return False
+            if run.status == "queued":
+                self._finish(run, "cancelled")
+                self._queued -= 1
+            else:
+                run.cancel_requested = True
+            return True
+
+    def status(self, incident_id: str) -> Optional[Dict]:
+        with self._cond:
+            run = self._runs.get(incident_id)
+            return run.info() if run else None
+
+    def list_runs(self, status: str = None) -> List[Dict]:
+        """Incident records, most recently submitted first"""
+        with self._cond:
+            return [run.info() for run in reversed(self._runs.values()) if status is None or run.status == status]
+
+    def wait(self, incident_id: str, timeout: float = None) -> Optional[Dict]:
+        """Block until the incident leaves the queued/running states; returns its status"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                run = self._runs.get(incident_id)
+                if run is None or run.status not in ("queued", "running"):
+                    return run.info() if run else None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return run.info()
+                self._cond.wait(remaining)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return dict(self.counts, running=self._running, queued=self._queued,
+                        max_workers=self.max_workers, max_queue=self.max_queue)
+
+    def close(self, wait: bool = True):
+        """Stop taking work; workers finish what is queued"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _wait_for_room(self, run: _Run, block: bool, timeout: Optional[float]):
+        """Wait until run fits in the queue, shedding a less severe run if needed (called with the lock held)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queued >= self.max_queue and not self._shed_for(run):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not block or (remaining is not None and remaining <= 0):
+                self.counts["rejected"] += 1
+                perf.incr("aiops_executor.rejected")
+                raise OverloadedError(
+                    f"AIOps workflow queue is full ({self._running} running, {self._queued} queued)."
+                )
+            self._cond.wait(remaining)
+
+    def _enqueue(self, run: _Run):
+        self._runs[run.incident_id] = run
+        self._runs.move_to_end(run.incident_id)
+        heapq.heappush(self._heap, (-run.rank, next(self._sequence), run))
+        self._queued += 1
+        self._cond.notify_all()
+
+    def _shed_for(self, run: _Run) -> bool:
+        """Drop the least severe (then newest) queued new run if it is less severe than run"""
+        queued = [entry for entry in self._heap
+                  if entry[2].status == "queued" and not isinstance(entry[2].payload, Command)]
+        if not queued:
+            return False
+        victim = max(queued, key=lambda entry: (entry[0], entry[1]))[2]
+        if victim.rank >= run.rank:
+            return False
+        self._finish(victim, "shed")
+        self._queued -= 1
+        perf.incr("aiops_executor.shed")
+        return True
+
+    def _finish(self, run: _Run, status: str, error: str = None):
+        """Record a final status (called with the lock held)"""
+        run.status = status
+        run.error = error
+        run.finished_at = time.time()
+        if status in self.counts:
+            self.counts[status] += 1
+        # Keep the most recent finished records only
+        finished = len(self._runs) - self._queued - self._running
+        for incident_id in list(self._runs):
+            if finished <= MAX_FINISHED_RECORDS:
+                break
+            if self._runs[incident_id].status in FINISHED:
+                del self._runs[incident_id]
+                finished -= 1
+        self._cond.notify_all()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                run = heapq.heappop(self._heap)[2]
+                if run.status != "queued":
+                    continue  # cancelled or shed while queued
+                self._queued -= 1
+                self._running += 1
+                run.status = "running"
+                run.started_at = time.time()
+                run.queue_wait_s = run.started_at - run.submitted_at
+                payload, run.payload = run.payload, None
+                self._cond.notify_all()  # room in the queue for blocked submitters
+            perf.observe("aiops_executor.queue_wait_s", run.queue_wait_s)
+            self._execute(run, payload)
+
+    def _execute(self, run: _Run, payload):
+        config = {"configurable": {"thread_id": run.incident_id}}
+        status, error = "completed", None
+        try:
+            # Stream so cancellation is checked between supersteps
+            for _ in self.app.stream(payload, config, stream_mode="updates"):
+                if run.cancel_requested:
+                    status = "cancelled"
+                    break
+            snapshot = self.app.get_state(config)
+            run.result = snapshot.values
+            if status == "completed" and snapshot.next:
+                status = "awaiting_approval"
+        except Exception as e:
+            status, error = "failed", str(e)
+            print(f"Error running AIOps workflow {run.incident_id}: {e}")
+        perf.observe("aiops_executor.run_s", time.time() - run.started_at)
+        with self._cond:
+            self._running -= 1
+            self._finish(run, status, error)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_workflow_executor() -> WorkflowExecutor:
+    """Process-wide executor on the shared compiled graph"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = WorkflowExecutor()
+        return _executor
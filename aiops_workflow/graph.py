@@ -1,26 +1,92 @@
-from langgraph.graph import StateGraph, END
+import threading
+import time
+from langgraph.graph import StateGraph, START, END
+from config.settings import settings
+from .checkpoint import SqliteCheckpointer
 from .state import AgentState
 from .nodes import metric_agent, log_agent, change_agent, rca_agent, human_approval_node, execution_agent
 
-def create_aiops_graph():
+# Data-gathering nodes and the state key each one fills
+COLLECTORS = {
+    "metric_agent": (metric_agent, "metrics_data"),
+    "log_agent": (log_agent, "logs_data"),
+    "change_agent": (change_agent, "recent_changes"),
+}
+
+def with_deadline(name: str, node, timeout_s: float):
+    """
+    Wrap a collector node with a per-node timeout
+
+    On timeout or error the node returns no data for its key (rca_agent
+    works with what arrived) and records the outcome in collection_status.
+    Each call runs on its own thread, so the deadline starts when the
+    collector does (no time waiting for a shared pool) and a call that
+    overruns it does not hold up other workflows' collectors. A timed-out
+    call cannot be killed; it finishes in the background and its result is
+    dropped.
+    """
+    def run(state: AgentState) -> dict:
+        outcome = {}
+        done = threading.Event()
+
+        def call():
+            try:
+                outcome["update"] = node(state)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        started = time.perf_counter()
+        threading.Thread(target=call, name=f"aiops-{name}", daemon=True).start()
+        if not done.wait(timeout_s):
+            update, status = {}, {"status": "timeout"}
+            print(f"--- {name} timed out after {timeout_s}s ---")
+        elif "error" in outcome:
+            update, status = {}, {"status": "error", "error": str(outcome["error"])}
+            print(f"--- {name} failed: {outcome['error']} ---")
+        else:
+            update, status = dict(outcome["update"] or {}), {"status": "ok"}
+        status["duration_s"] = round(time.perf_counter() - started, 3)
+        update["collection_status"] = {name: status}
+        return update
+
+    run.__name__ = name
+    return run
+
+
+def create_aiops_graph(collector_timeout_s: float = None, checkpointer=None):
+    """
+    Build the RCA workflow
+
+    Args:
+        collector_timeout_s: Per-collector deadline (default AIOPS_COLLECTOR_TIMEOUT_S)
+        checkpointer: LangGraph checkpointer; required for the human-approval
+            interrupt to pause and resume (see get_aiops_app)
+
+    Returns:
+        Compiled graph
+    """
     workflow = StateGraph(AgentState)
+    timeout_s = settings.AIOPS_COLLECTOR_TIMEOUT_S if collector_timeout_s is None else collector_timeout_s
 
     # Add Nodes
-    workflow.add_node("metric_agent", metric_agent)
-    workflow.add_node("log_agent", log_agent)
-    workflow.add_node("change_agent", change_agent)
+    for name, (node, _) in COLLECTORS.items():
+        workflow.add_node(name, with_deadline(name, node, timeout_s))
     workflow.add_node("rca_agent", rca_agent)
     workflow.add_node("human_approval", human_approval_node)
     workflow.add_node("execution_agent", execution_agent)
 
     # Define Edges
-    # Parallel execution of data gathering
-    workflow.set_entry_point("metric_agent")
-    workflow.add_edge("metric_agent", "log_agent")
-    workflow.add_edge("log_agent", "change_agent")
+    # Parallel execution of data gathering: the three collectors are
+    # independent, so they run in one step (fan-out) and rca_agent waits
+    # for all of them (fan-in). Each collector is bounded by the timeout,
+    # so RCA starts at the latest when the deadline passes.
+    for name in COLLECTORS:
+        workflow.add_edge(START, name)
     
     # Then RCA
-    workflow.add_edge("change_agent", "rca_agent")
+    workflow.add_edge(list(COLLECTORS), "rca_agent")
     
     # Then Human Approval
     workflow.add_edge("rca_agent", "human_approval")
@@ -43,4 +109,22 @@ def create_aiops_graph():
     
     workflow.add_edge("execution_agent", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_aiops_app():
+    """Process-wide compiled workflow with the persistent checkpointer (AIOPS_CHECKPOINT_DB)"""
+    global _app
+    with _app_lock:
+        if _app is None:
+            _app = create_aiops_graph(checkpointer=SqliteCheckpointer(settings.AIOPS_CHECKPOINT_DB))
+        return _app
+
+
+def alert_config(alert_id: str) -> dict:
+    """Run config of an alert: one checkpointed thread per alert_id"""
+    return {"configurable": {"thread_id": alert_id}}
@@ -0,0 +1,315 @@
+"""
+Alert Intake: deduplication and correlation before RCA
+
+During an alert storm the same problem fires thousands of alerts a minute.
+Running the RCA workflow per alert is not viable, so alerts pass through
+the intake first:
+
+1. Fingerprint: hash of alert_type, service and labels (not severity,
+   values or timestamps), so repeats of the same alert match.
+2. Deduplicate: a fingerprint seen within ALERT_DEDUP_WINDOW_S (sliding:
+   every repeat extends it) while its incident is still open is a
+   duplicate and only counted.
+3. Correlate: alerts of the same service arriving within
+   ALERT_CORRELATION_WINDOW_S of the previous one join the same incident
+   group; a longer quiet period closes the group.
+4. Dispatch: each group starts one RCA workflow, ALERT_GROUP_WAIT_S after
+   its first alert so the initial burst is summarised in one state. Later
+   alerts of the group are counted but do not start another run. If the
+   workflow executor is full (OverloadedError) the group stays pending and
+   is retried every ALERT_DISPATCH_RETRY_S.
+
+Window logic runs on the alerts' own timestamps; a background ticker
+dispatches due groups when no alerts arrive. Memory is bounded by the
+number of distinct fingerprints in the dedup window plus the open groups.
+"""
+
+import hashlib
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from config.settings import settings
+
+# Highest first; unknown severities rank as "warning"
+SEVERITY_RANK = {"critical": 4, "high": 3, "warning": 2, "medium": 2, "low": 1, "info": 0}
+
+
+def severity_rank(severity: Optional[str]) -> int:
+    return SEVERITY_RANK.get(str(severity).lower(), SEVERITY_RANK["warning"])
+
+
+def fingerprint(alert: Dict) -> str:
+    """Identity of an alert: alert_type, service and labels"""
+    labels = alert.get("labels") or {}
+    key = "\x1f".join([alert.get("alert_type", ""), alert.get("service", "")] +
+                      [f"{k}={labels[k]}" for k in sorted(labels)])
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def normalize_alert(alert: Dict) -> Dict:
+    """
+    Flatten an incoming alert
+
+    Accepts the dashboard's shape ({"alert_type", "alert_details": {...}})
+    or a flat one; the timestamp may be epoch seconds or an ISO string
+    (default: now).
+
+    Returns:
+        {"alert_type", "service", "severity", "source", "labels", "timestamp"}
+    """
+    details = alert.get("alert_details") or {}
+    timestamp = alert.get("timestamp", details.get("timestamp"))
+    if timestamp is None:
+        timestamp = time.time()
+    elif isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp).timestamp()
+    source = alert.get("source", details.get("source", ""))
+    return {
+        "alert_type": alert.get("alert_type", "Unknown"),
+        "service": alert.get("service", details.get("service", source)) or "unknown",
+        "severity": alert.get("severity", details.get("severity", "warning")),
+        "source": source,
+        "labels": alert.get("labels", details.get("labels")) or {},
+        "timestamp": float(timestamp),
+    }
+
+
+class IncidentGroup:
+    """Correlated alerts of one service"""
+
+    __slots__ = ("incident_id", "service", "source", "alert_type", "severity", "alert_types",
+                 "fingerprints", "alert_count", "duplicates", "first_seen", "last_seen", "dispatched")
+
+    def __init__(self, incident_id: str, alert: Dict):
+        self.incident_id = incident_id
+        self.service = alert["service"]
+        self.source = alert["source"]
+        self.alert_type = alert["alert_type"]
+        self.severity = alert["severity"]
+        self.alert_types: Dict[str, int] = {}
+        self.fingerprints = 0
+        self.alert_count = 0
+        self.duplicates = 0
+        self.first_seen = alert["timestamp"]
+        self.last_seen = alert["timestamp"]
+        self.dispatched = False
+
+    def add(self, alert: Dict, duplicate: bool):
+        self.alert_count += 1
+        self.last_seen = max(self.last_seen, alert["timestamp"])
+        if severity_rank(alert["severity"]) > severity_rank(self.severity):
+            self.severity = alert["severity"]
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.fingerprints += 1
+            self.alert_types[alert["alert_type"]] = self.alert_types.get(alert["alert_type"], 0) + 1
+
+    def state(self) -> Dict:
+        """Initial AgentState of the group's RCA workflow"""
+        return {
+            "alert_id": self.incident_id,
+            # The most frequent distinct alert drives the analysis
+            "alert_type": max(self.alert_types, key=self.alert_types.get) if self.alert_types else self.alert_type,
+            "alert_details": {
+                "severity": self.severity,
+                "source": self.source,
+                "service": self.service,
+                "alert_count": self.alert_count,
+                "duplicates": self.duplicates,
+                "alert_types": sorted(self.alert_types),
+                "first_seen": datetime.fromtimestamp(self.first_seen).isoformat(),
+                "last_seen": datetime.fromtimestamp(self.last_seen).isoformat(),
+            },
+            "human_approval": None,
+        }
+
+
+_sequence = itertools.count(1)
+
+
+def alert_state(alert: Dict) -> Dict:
+    """Workflow state for a single alert (bypasses dedup and correlation)"""
+    alert = normalize_alert(alert)
+    group = IncidentGroup(_incident_id(alert, next(_sequence)), alert)
+    group.add(alert, duplicate=False)
+    return group.state()
+
+
+def _incident_id(alert: Dict, seq: int) -> str:
+    return f"INC-{datetime.fromtimestamp(alert['timestamp']):%Y%m%d-%H%M%S}-{alert['service']}-{seq}"
+
+
+def start_rca(state: Dict):
+    """Default dispatch: queue the group's workflow on the shared executor"""
+    from .executor import get_workflow_executor
+    get_workflow_executor().submit(state)
+
+
+class AlertIntake:
+    """Fingerprints, deduplicates and correlates alerts; dispatches one RCA per incident group"""
+
+    def __init__(self, dispatch: Callable[[Dict], None] = start_rca,
+                 dedup_window_s: float = None, correlation_window_s: float = None,
+                 group_wait_s: float = None, retry_s: float = None, tick_s: float = 1.0):
+        """
+        Initialize AlertIntake
+
+        Args:
+            dispatch: Called with the initial workflow state of each incident group
+            dedup_window_s: Sliding dedup window (default ALERT_DEDUP_WINDOW_S)
+            correlation_window_s: Max gap between alerts of one group (default ALERT_CORRELATION_WINDOW_S)
+            group_wait_s: Delay between a group's first alert and its dispatch (default ALERT_GROUP_WAIT_S)
+            retry_s: Delay before retrying a dispatch rejected as overloaded (default ALERT_DISPATCH_RETRY_S)
+            tick_s: Background dispatch interval (0 = only dispatch from submit/dispatch_due)
+        """
+        self.dispatch = dispatch
+        self.dedup_window_s = settings.ALERT_DEDUP_WINDOW_S if dedup_window_s is None else dedup_window_s
+        self.correlation_window_s = (settings.ALERT_CORRELATION_WINDOW_S
+                                     if correlation_window_s is None else correlation_window_s)
+        self.group_wait_s = settings.ALERT_GROUP_WAIT_S if group_wait_s is None else group_wait_s
+        self.retry_s = settings.ALERT_DISPATCH_RETRY_S if retry_s is None else retry_s
+        self._lock = threading.Lock()
+        # fingerprint -> (last seen, group), least recently seen first
+        self._seen: "OrderedDict[str, Tuple[float, IncidentGroup]]" = OrderedDict()
+        self._open: Dict[str, IncidentGroup] = {}  # service -> open group
+        self._due: List[Tuple[float, int, IncidentGroup]] = []  # (dispatch at, seq, group) heap
+        self._sequence = itertools.count(1)
+        self._due_sequence = itertools.count()  # heap tie-break
+        self._clock = 0.0  # newest alert timestamp seen
+        self._last_sweep = 0.0
+        self.counts = {"received": 0, "duplicates": 0, "correlated": 0, "incidents": 0, "dispatched": 0,
+                       "dispatch_retries": 0, "dispatch_failed": 0}
+        self._stop = threading.Event()
+        if tick_s > 0:
+            self._tick_s = tick_s
+            threading.Thread(target=self._tick_loop, name="alert-intake", daemon=True).start()
+
+    def submit(self, alert: Dict) -> Tuple[str, str]:
+        """
+        Take in one alert
+
+        Returns:
+            (outcome, incident_id); outcome is "duplicate", "correlated" or "new"
+        """
+        alert = normalize_alert(alert)
+        fp = fingerprint(alert)
+        ts = alert["timestamp"]
+        to_dispatch = []
+        with self._lock:
+            self.counts["received"] += 1
+            self._clock = max(self._clock, ts)
+            self._expire(self._clock)
+
+            seen = self._seen.pop(fp, None)
+            group = self._open.get(alert["service"])
+            if group is not None and ts - group.last_seen > self.correlation_window_s:
+                del self._open[alert["service"]]  # quiet too long, the incident is over
+                group = None
+
+            if seen is not None and group is not None and seen[1] is group:
+                outcome = "duplicate"
+                self.counts["duplicates"] += 1
+            elif group is not None:
+                outcome = "correlated"
+                self.counts["correlated"] += 1
+            else:
+                outcome = "new"
+                group = IncidentGroup(_incident_id(alert, next(self._sequence)), alert)
+                self._open[alert["service"]] = group
+                heapq.heappush(self._due, (ts + self.group_wait_s, next(self._due_sequence), group))
+                self.counts["incidents"] += 1
+            group.add(alert, duplicate=outcome == "duplicate")
+            self._seen[fp] = (ts, group)
+            to_dispatch = self._pop_due(self._clock)
+
+        self._dispatch(to_dispatch, self._clock)
+        return outcome, group.incident_id
+
+    def dispatch_due(self, now: float = None) -> int:
+        """Dispatch groups whose wait has passed (default: wall clock); returns how many"""
+        now = time.time() if now is None else now
+        with self._lock:
+            to_dispatch = self._pop_due(now)
+        return self._dispatch(to_dispatch, now)
+
+    def flush(self) -> int:
+        """Dispatch every pending group now (e.g. at shutdown)"""
+        return self.dispatch_due(float("inf"))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counts, open_groups=len(self._open), pending=len(self._due),
+                        fingerprints=len(self._seen))
+
+    def close(self):
+        self._stop.set()
+
+    def _expire(self, now: float):
+        """Forget fingerprints not seen within the dedup window"""
+        horizon = now - self.dedup_window_s
+        while self._seen:
+            fp, (last_seen, _) = next(iter(self._seen.items()))
+            if last_seen >= horizon:
+                break
+            del self._seen[fp]
+        # Groups are closed lazily in submit; now and then drop the ones whose service went quiet
+        if now - self._last_sweep > self.correlation_window_s:
+            self._last_sweep = now
+            for service in [s for s, g in self._open.items() if now - g.last_seen > self.correlation_window_s]:
+                del self._open[service]
+
+    def _pop_due(self, now: float) -> List[Tuple[IncidentGroup, Dict]]:
+        """Groups due for dispatch with their initial states (called with the lock held)"""
+        due = []
+        while self._due and self._due[0][0] <= now:
+            group = heapq.heappop(self._due)[2]
+            group.dispatched = True
+            due.append((group, group.state()))
+        return due
+
+    def _dispatch(self, due: List[Tuple[IncidentGroup, Dict]], now: float) -> int:
+        """Start the groups' workflows; overloaded ones go back on the heap. Returns how many started"""
+        from .executor import OverloadedError
+        started = failed = 0
+        retry = []
+        for group, state in due:
+            try:
+                self.dispatch(state)
+                started += 1
+            except OverloadedError:
+                retry.append(group)
+            except Exception as e:
+                failed += 1
+                print(f"Error starting RCA for {state['alert_id']}: {e}")
+        with self._lock:
+            self.counts["dispatched"] += started
+            self.counts["dispatch_failed"] += failed
+            self.counts["dispatch_retries"] += len(retry)
+            # now is inf on flush(); retry on the wall clock then
+            retry_at = min(now, time.time()) + self.retry_s
+            for group in retry:
+                group.dispatched = False
+                heapq.heappush(self._due, (retry_at, next(self._due_sequence), group))
+        return started
+
+    def _tick_loop(self):
+        while not self._stop.wait(self._tick_s):
+            self.dispatch_due()
+
+
+_intake = None
+_intake_lock = threading.Lock()
+
+
+def get_alert_intake() -> AlertIntake:
+    """Process-wide intake dispatching to the checkpointed workflow"""
+    global _intake
+    with _intake_lock:
+        if _intake is None:
+            _intake = AlertIntake()
+        return _intake
@@ -0,0 +1,335 @@
+"""
+Streaming Log Scanner for log_agent
+
+Finds the error lines around an alert in large local log files without
+reading them whole:
+
+1. Each file is memory-mapped read-only; the OS pages in only the parts
+   that are touched.
+2. A sparse index maps timestamps to byte offsets: one entry every
+   INDEX_STRIDE bytes (the first line starting after the stride boundary),
+   so a multi-GB file needs a few thousand entries, built by seeking, not
+   reading. Appends extend the index; rotation (new inode or shrink)
+   rebuilds it.
+3. A time window becomes a byte range by binary search over the index.
+4. Candidate lines are found with plain substring searches over the
+   mapped range (one per literal the pattern needs; on large buffers
+   Python's regex alternation is several times slower than find, and
+   case-insensitive groups about 100x), with no per-line splitting or
+   decoding. Only candidates are decoded, confirmed
+   with the compiled pattern, checked against the exact window and
+   deduplicated by their message with numbers and hex ids masked.
+5. Results are capped (distinct messages and total matches), so a storm of
+   identical errors costs one entry with a count.
+
+Log lines are expected to start with an ISO timestamp
+("2026-10-19 07:15:00,123 ..." or "2026-10-19T07:15:00Z ..."), read as
+local time like the alert timestamps. Lines without one (stack traces) are
+matched but not time-checked. Timestamps are assumed to be roughly
+ordered; the window starts one index entry early to tolerate small
+reordering.
+"""
+
+import bisect
+import glob
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+from config.settings import settings
+
+INDEX_STRIDE = 1 << 20  # bytes between sparse index entries
+TIMESTAMP_LEN = 19  # "YYYY-MM-DD HH:MM:SS"
+MAX_PROBE_LINES = 64  # lines tried after a stride boundary to find a timestamp
+SCAN_CHUNK = 8 << 20  # bytes searched per literal before candidates are processed in order
+
+DEFAULT_PATTERN = (r"\b(?:ERROR|FATAL|CRITICAL|SEVERE)\b|Exception|Traceback|\bORA-\d{5}\b"
+                   r"|[Tt]imed out|[Tt]imeout|TIMEOUT|[Cc]onnection refused|[Uu]nreachable")
+# Every match of DEFAULT_PATTERN contains one of these
+DEFAULT_LITERALS = ("ERROR", "FATAL", "CRITICAL", "SEVERE", "Exception", "Traceback", "ORA-",
+                    "imed out", "imeout", "IMEOUT", "onnection refused", "nreachable")
+_REGEX_SYNTAX = set(".^$*+?{}[]\\|()")
+
+# Masked when deduplicating, so "timeout after 5012 ms" and "timeout after 498 ms" are one message
+_VARIABLE = re.compile(r"0x[0-9a-fA-F]+|[0-9a-f]{8,}|\d+")
+
+
+def parse_timestamp(raw: bytes) -> Optional[float]:
+    """Epoch seconds of a line's leading ISO timestamp, or None"""
+    try:
+        return datetime.fromisoformat(raw[:TIMESTAMP_LEN].decode("ascii")).timestamp()
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class LinePattern:
+    """Line filter: a bytes regex plus literals one of which every match contains (for the fast prefilter)"""
+
+    def __init__(self, pattern: str = None, literals: Optional[tuple] = None):
+        """
+        Initialize LinePattern
+
+        Args:
+            pattern: Line regex (default DEFAULT_PATTERN)
+            literals: Substrings every match contains; derived for a plain
+                "word|other word" pattern, otherwise None (the regex scans
+                the whole range, slower)
+        """
+        if not pattern:
+            pattern, literals = DEFAULT_PATTERN, DEFAULT_LITERALS
+        elif literals is None and not _REGEX_SYNTAX.intersection(pattern.replace("|", "")):
+            literals = tuple(filter(None, pattern.split("|")))
+        self.regex = re.compile(pattern.encode("utf-8"))
+        self.literals = tuple(literal.encode("utf-8") for literal in literals) if literals else None
+
+
+def compile_pattern(pattern: str = None) -> LinePattern:
+    return LinePattern(pattern)
+
+
+def _candidate_lines(mm: mmap.mmap, lo: int, hi: int, pattern: LinePattern):
+    """(start, end) of lines in [lo, hi) that may match, in file order"""
+    if pattern.literals is None:
+        pos = lo
+        while pos < hi:
+            match = pattern.regex.search(mm, pos, hi)
+            if match is None:
+                return
+            start = mm.rfind(b"\n", lo, match.start()) + 1 or lo
+            end = mm.find(b"\n", match.end(), hi)
+            end = hi if end < 0 else end
+            pos = end + 1
+            yield start, end
+        return
+
+    last_end = lo
+    for chunk_start in range(lo, hi, SCAN_CHUNK):
+        chunk_end = min(hi, chunk_start + SCAN_CHUNK)
+        hits = []
+        for literal in pattern.literals:
+            # Only hits starting in this chunk (a hit may straddle its end)
+            limit = min(hi, chunk_end + len(literal) - 1)
+            pos = mm.find(literal, chunk_start, limit)
+            while pos >= 0:
+                hits.append(pos)
+                pos = mm.find(literal, pos + 1, limit)
+        hits.sort()
+        for pos in hits:
+            if pos < last_end:
+                continue  # same line as the previous hit
+            start = mm.rfind(b"\n", lo, pos) + 1 or lo
+            end = mm.find(b"\n", pos, hi)
+            end = hi if end < 0 else end
+            last_end = end + 1
+            yield start, end
+
+
+class LogFile:
+    """Memory-mapped log file with a sparse timestamp -> offset index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mm: Optional[mmap.mmap] = None
+        self._size = 0
+        self._inode = None
+        self._timestamps: List[float] = []
+        self._offsets: List[int] = []
+        self._indexed_to = 0  # next stride boundary to probe
+
+    def refresh(self):
+        """Map new data and extend the index (rebuild after rotation)"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._mm, self._size = None, 0
+                return
+            if stat.st_ino != self._inode or stat.st_size < self._size:
+                self._timestamps, self._offsets, self._indexed_to = [], [], 0
+            elif stat.st_size == self._size and self._mm is not None:
+                return
+            self._inode = stat.st_ino
+            if stat.st_size == 0:
+                self._mm, self._size = None, 0
+                return
+            # Scans in progress keep their own reference to the previous map
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._size = len(self._mm)
+            self._extend_index()
+
+    def _extend_index(self):
+        mm, size = self._mm, self._size
+        pos = self._indexed_to
+        while pos < size:
+            line_start = 0 if pos == 0 else mm.find(b"\n", pos - 1) + 1
+            if line_start == 0 and pos:
+                break  # no complete line after the boundary yet
+            for _ in range(MAX_PROBE_LINES):
+                if line_start >= size:
+                    break
+                ts = parse_timestamp(mm[line_start:line_start + TIMESTAMP_LEN])
+                if ts is not None:
+                    if not self._timestamps or ts >= self._timestamps[-1]:
+                        self._timestamps.append(ts)
+                        self._offsets.append(line_start)
+                    break
+                next_line = mm.find(b"\n", line_start)
+                line_start = size if next_line < 0 else next_line + 1
+            pos = max(pos + INDEX_STRIDE, line_start)
+        # Re-probe the last partial stride when the file grows
+        self._indexed_to = self._offsets[-1] + INDEX_STRIDE if self._offsets else 0
+
+    def byte_range(self, start: float, end: float):
+        """
+        Byte range covering the time window [start, end]
+
+        Returns:
+            (mmap, lo, hi); mmap is None for a missing or empty file
+        """
+        with self._lock:
+            mm, size = self._mm, self._size
+            if mm is None:
+                return None, 0, 0
+            i = bisect.bisect_left(self._timestamps, start) - 2  # one entry of slack for reordering
+            j = bisect.bisect_right(self._timestamps, end)
+            lo = self._offsets[i] if i >= 0 else 0
+            hi = self._offsets[j] if j < len(self._offsets) else size
+            return mm, lo, hi
+
+    def index_size(self) -> int:
+        return len(self._offsets)
+
+
+class ScanResult:
+    """Deduplicated matching lines of a scan"""
+
+    def __init__(self, max_results: int):
+        self.max_results = max_results
+        self.entries: "OrderedDict[str, List]" = OrderedDict()  # message key -> [first line, count]
+        self.matches = 0
+        self.bytes_scanned = 0
+        self.truncated = False
+
+    def add(self, text: str, has_timestamp: bool):
+        key = _VARIABLE.sub("#", text[TIMESTAMP_LEN:] if has_timestamp else text)
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[1] += 1
+        elif len(self.entries) < self.max_results:
+            self.entries[key] = [text, 1]
+        self.matches += 1
+
+    def lines(self) -> List[str]:
+        """First occurrence of each message, with a repeat count"""
+        return [line if count == 1 else f"{line} (x{count})" for line, count in self.entries.values()]
+
+
+def scan_file(log_file: LogFile, start: float, end: float, pattern: LinePattern,
+              result: ScanResult, include: Optional["re.Pattern"] = None, max_matches: int = None) -> ScanResult:
+    """
+    Add the lines of log_file within [start, end] matching pattern (and include) to result
+
+    Args:
+        log_file: File to scan (refreshed first)
+        start: Window start (epoch seconds)
+        end: Window end (epoch seconds)
+        pattern: LinePattern selecting lines
+        result: Accumulates results across files
+        include: Optional second bytes regex every line must also match (e.g. the service)
+        max_matches: Stop after this many matching lines in total
+
+    Returns:
+        result
+    """
+    log_file.refresh()
+    mm, lo, hi = log_file.byte_range(start, end)
+    if mm is None:
+        return result
+    result.bytes_scanned += hi - lo
+    max_matches = max_matches or settings.LOG_SCAN_MAX_MATCHES
+    confirm = pattern.regex.search if pattern.literals else None
+    for line_start, line_end in _candidate_lines(mm, lo, hi, pattern):
+        line = mm[line_start:line_end]
+        if confirm is not None and confirm(line) is None:
+            continue
+        ts = parse_timestamp(line)
+        if ts is not None and not start <= ts <= end:
+            continue
+        if include is not None and include.search(line) is None:
+            continue
+        result.add(line.decode("utf-8", "replace").rstrip("\r"), ts is not None)
+        if result.matches >= max_matches:
+            result.truncated = True
+            break
+    return result
+
+
+_files: Dict[str, LogFile] = {}
+_files_lock = threading.Lock()
+
+
+def open_log(path: str) -> LogFile:
+    """Shared LogFile per path (keeps the map and index between scans)"""
+    path = os.path.abspath(path)
+    with _files_lock:
+        log_file = _files.get(path)
+        if log_file is None:
+            log_file = _files[path] = LogFile(path)
+        return log_file
+
+
+def find_log_files(service: str = None) -> List[str]:
+    """Files matching LOG_SCAN_PATHS ("{service}" is replaced by the service, or * if unknown)"""
+    paths = []
+    for pattern in filter(None, (p.strip() for p in settings.LOG_SCAN_PATHS.split(","))):
+        paths.extend(sorted(glob.glob(pattern.replace("{service}", service or "*"))))
+    return paths
+
+
+def scan_logs(start: float, end: float, service: str = None, pattern: str = None,
+              max_results: int = None) -> ScanResult:
+    """
+    Scan every configured log file for matching lines in a time window
+
+    Args:
+        start: Window start (epoch seconds)
+        end: Window end (epoch seconds)
+        service: Selects files via "{service}" in LOG_SCAN_PATHS
+        pattern: Line regex (default LOG_SCAN_PATTERN, else DEFAULT_PATTERN)
+        max_results: Distinct messages kept (default LOG_SCAN_MAX_RESULTS)
+
+    Returns:
+        ScanResult
+    """
+    compiled = compile_pattern(pattern or settings.LOG_SCAN_PATTERN)
+    result = ScanResult(max_results or settings.LOG_SCAN_MAX_RESULTS)
+    for path in find_log_files(service):
+        scan_file(open_log(path), start, end, compiled, result)
+        if result.truncated:
+            break
+    return result
+
+
+def alert_window(alert_details: Dict) -> tuple:
+    """Scan window of an alert: LOG_SCAN_BEFORE_S before its first sighting to LOG_SCAN_AFTER_S after the last"""
+    first_seen = alert_details.get("first_seen")
+    last_seen = alert_details.get("last_seen", first_seen)
+    now = datetime.now()
+    first = datetime.fromisoformat(first_seen) if first_seen else now
+    last = datetime.fromisoformat(last_seen) if last_seen else now
+    return first.timestamp() - settings.LOG_SCAN_BEFORE_S, last.timestamp() + settings.LOG_SCAN_AFTER_S
+
+
+def scan_alert_logs(alert_details: Dict) -> List[str]:
+    """Deduplicated error lines around an alert, ready for AgentState.logs_data"""
+    start, end = alert_window(alert_details)
+    result = scan_logs(start, end, service=alert_details.get("service"))
+    lines = result.lines()
+    if result.truncated:
+        lines.append(f"(Log scan stopped after {result.matches} matching lines.)")
+    return lines
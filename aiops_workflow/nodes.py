@@ -1,41 +1,46 @@
+from langgraph.types import interrupt
+from config.settings import settings
 from .state import AgentState
+from .log_scanner import scan_alert_logs
 import random
 import json
 
 # Mock Agents/Nodes
 
-def metric_agent(state: AgentState) -> AgentState:
+# The data-gathering nodes run in parallel: each returns only the keys it
+# writes (a partial update), never the whole state.
+
+def metric_agent(state: AgentState) -> dict:
     """Analyzes metrics related to the alert."""
     print(f"--- Metric Agent Processing Alert: {state['alert_type']} ---")
     # Mock logic: fetch metrics
-    state['metrics_data'] = {
+    return {"metrics_data": {
         "cpu_usage": "95%",
         "memory_usage": "80%",
         "latency_p99": "500ms"
-    }
-    return state
+    }}
 
-def log_agent(state: AgentState) -> AgentState:
+def log_agent(state: AgentState) -> dict:
     """Fetches logs around the time of the alert."""
     print("--- Log Agent Fetching Logs ---")
+    if settings.LOG_SCAN_PATHS:
+        return {"logs_data": scan_alert_logs(state.get('alert_details') or {})}
     # Mock logic
-    state['logs_data'] = [
+    return {"logs_data": [
         "Error: Connection timeout to DB",
         "Warning: High latency detected in API Gateway"
-    ]
-    return state
+    ]}
 
-def change_agent(state: AgentState) -> AgentState:
+def change_agent(state: AgentState) -> dict:
     """Checks for recent deployments or config changes."""
     print("--- Change Agent Checking History ---")
     # Mock logic
-    state['recent_changes'] = [
+    return {"recent_changes": [
         "Deployment #1234: Update RiskEngine (20 mins ago)",
         "Config Change: Increased connection pool size"
-    ]
-    return state
+    ]}
 
-def rca_agent(state: AgentState) -> AgentState:
+def rca_agent(state: AgentState) -> dict:
     """Synthesizes data to find Root Cause."""
     print("--- RCA Agent Analyzing ---")
     
@@ -46,31 +51,43 @@ def rca_agent(state: AgentState) -> AgentState:
     # Simple mock logic
     rca = f"Potential Root Cause: High CPU and Latency correlated with Deployment #1234. Logs indicate DB timeouts."
     suggestion = "Rollback Deployment #1234 immediately."
+
+    # Collectors that timed out or failed leave their key empty
+    missing = [name for name, status in (state.get('collection_status') or {}).items()
+               if status.get("status") != "ok"]
+    if missing:
+        rca += f" (Partial data: {', '.join(missing)} unavailable.)"
     
-    state['rca_analysis'] = rca
-    state['suggested_action'] = suggestion
-    return state
+    return {"rca_analysis": rca, "suggested_action": suggestion}
+
+def human_approval_node(state: AgentState) -> dict:
+    """
+    Pauses the workflow until a human approves or rejects the suggested action.
+
+    With a checkpointer, interrupt() saves the state and ends the run; the
+    caller resumes the same thread (alert_id) with Command(resume=True/False)
+    and execution continues here, without re-running the collectors. A
+    decision already present in the state (scripted runs) skips the pause.
+    """
+    if state.get('human_approval') is not None:
+        return {}
 
-def human_approval_node(state: AgentState) -> AgentState:
-    """Simulates human approval (in a real app, this would pause/wait)."""
     print("--- Waiting for Human Approval ---")
     print(f"Suggestion: {state['suggested_action']}")
-    
-    # For demo purposes, we'll simulate approval if not already set
-    if state.get('human_approval') is None:
-        # In a real UI, we would interrupt here. 
-        # For this skeleton, we assume 'True' or handle it in the runner.
-        pass 
-    
-    return state
+    approved = interrupt({
+        "alert_id": state.get('alert_id'),
+        "rca_analysis": state.get('rca_analysis'),
+        "suggested_action": state.get('suggested_action'),
+    })
+    return {"human_approval": bool(approved)}
 
-def execution_agent(state: AgentState) -> AgentState:
+def execution_agent(state: AgentState) -> dict:
     """Executes the action if approved."""
     if state.get('human_approval'):
         print(f"--- Executing: {state['suggested_action']} ---")
-        state['final_report'] = f"Action '{state['suggested_action']}' executed successfully. System recovering."
+        final_report = f"Action '{state['suggested_action']}' executed successfully. System recovering."
     else:
         print("--- Action Rejected by Human ---")
-        state['final_report'] = "Action rejected. Escalating to manual investigation."
+        final_report = "Action rejected. Escalating to manual investigation."
     
-    return state
+    return {"final_report": final_report}
@@ -1,12 +1,34 @@
-from typing import TypedDict, List, Optional
+from typing import Annotated, TypedDict, List, Optional
+
+
+def merge_dict(left: Optional[dict], right: Optional[dict]) -> Optional[dict]:
+    """Reducer: merge dict updates (parallel nodes may write the same key)"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return {**left, **right}
+
+
+def merge_unique(left: Optional[List[str]], right: Optional[List[str]]) -> Optional[List[str]]:
+    """Reducer: concatenate list updates, dropping duplicates (re-invoking with a previous state)"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left + [item for item in right if item not in left]
+
 
 class AgentState(TypedDict):
     alert_id: str
     alert_type: str
     alert_details: dict
-    metrics_data: Optional[dict]
-    logs_data: Optional[List[str]]
-    recent_changes: Optional[List[str]]
+    # Written concurrently by the data-gathering fan-out
+    metrics_data: Annotated[Optional[dict], merge_dict]
+    logs_data: Annotated[Optional[List[str]], merge_unique]
+    recent_changes: Annotated[Optional[List[str]], merge_unique]
+    # Per collector: {"status": "ok" | "timeout" | "error", "duration_s", "error"?}
+    collection_status: Annotated[Optional[dict], merge_dict]
     rca_analysis: Optional[str]
     suggested_action: Optional[str]
     human_approval: Optional[bool]
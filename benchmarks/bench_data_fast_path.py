@@ -0,0 +1,80 @@
+"""
+Benchmark: DATA-intent fast path vs. agent flow
+
+Runs the common status queries through the deterministic fast path and,
+with --agent, through the data agent + responder crew, then reports the
+p50/p95 latency of each and the p50 drop.
+
+Usage:
+    python benchmarks/bench_data_fast_path.py [--runs 20] [--agent]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from chatops.data_fast_path import DataFastPath
+from chatops.perf import percentile
+
+COMMON_STATUS_QUERIES = [
+    "What is the current system status?",
+    "Is the Gateway down?",
+    "Status of the risk engine",
+    "What is the trade volume today?",
+    "Trade volume for the last hour",
+    "How many matched orders so far today?",
+    "Show current status and trade volume",
+]
+
+
+def time_calls(fn, queries, runs):
+    samples = []
+    for _ in range(runs):
+        for query in queries:
+            started = time.perf_counter()
+            fn(query)
+            samples.append(time.perf_counter() - started)
+    return sorted(samples)
+
+
+def report(label, samples):
+    print(f"{label:<12} n={len(samples):<5} p50={percentile(samples, 50) * 1000:9.2f} ms  "
+          f"p95={percentile(samples, 95) * 1000:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="Repetitions of the query set (fast path)")
+    parser.add_argument("--agent", action="store_true", help="Also run the agent flow (needs a configured LLM)")
+    parser.add_argument("--agent-runs", type=int, default=1, help="Repetitions of the query set (agent flow)")
+    args = parser.parse_args()
+
+    fast_path = DataFastPath()
+    unmapped = [q for q in COMMON_STATUS_QUERIES if fast_path.plan(q) is None]
+    if unmapped:
+        print(f"Warning: queries not handled by the fast path: {unmapped}")
+
+    fast = time_calls(fast_path.answer, COMMON_STATUS_QUERIES, args.runs)
+    report("fast path", fast)
+
+    if args.agent:
+        from chatops.crew import ChatOpsCrew
+
+        def agent_flow(query):
+            crew = ChatOpsCrew()
+            return crew._kickoff(crew._data_only_tasks(query, ""))
+
+        agent = time_calls(agent_flow, COMMON_STATUS_QUERIES, args.agent_runs)
+        report("agent flow", agent)
+
+        drop = percentile(agent, 50) - percentile(fast, 50)
+        print(f"p50 latency drop: {drop * 1000:.1f} ms "
+              f"({drop / percentile(agent, 50) * 100:.1f}% of agent p50)")
+
+
+if __name__ == "__main__":
+    main()
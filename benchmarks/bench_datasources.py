@@ -0,0 +1,106 @@
+"""
+Benchmark: data-source adapters against the local stub backend
+
+1. Pooled adapter vs a fresh HTTP client per call, with many concurrent
+   tool calls (latency, connections opened on the backend)
+2. Circuit breaker: calls reaching a failing backend vs short-circuited
+
+Usage:
+    python benchmarks/bench_datasources.py [--calls 200] [--concurrency 50] [--latency fixed:20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.request
+import httpx
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from stub_datasource_server import start_server
+from chatops.datasources import CircuitBreaker, DataSourceError, PrometheusSource, RestStatusSource, run_sync
+from chatops.perf import percentile
+
+QUERY = "sum(increase(trade_notional_usd_total[{window}]))"
+
+
+def backend_stats(base_url: str):
+    with urllib.request.urlopen(f"{base_url}/stats") as response:
+        return json.load(response)
+
+
+def control(base_url: str, **settings):
+    request = urllib.request.Request(f"{base_url}/control", data=json.dumps(settings).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    urllib.request.urlopen(request).read()
+
+
+async def run_calls(call, calls: int, concurrency: int):
+    gate = asyncio.Semaphore(concurrency)
+    samples, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await call()
+                samples.append(time.perf_counter() - started)
+            except (DataSourceError, httpx.HTTPError):
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(calls)])
+    return sorted(samples), errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent callers")
+    parser.add_argument("--latency", default="fixed:20", help="Stub backend latency spec")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    now = time.time()
+
+    async def fresh_client_call():
+        async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+            response = await client.get("/api/v1/query", params={"query": QUERY.format(window="3600s"), "time": now})
+            response.raise_for_status()
+
+    prometheus = PrometheusSource("prometheus", base_url, max_concurrency=20, timeout_s=5)
+    status = RestStatusSource("status", base_url, max_concurrency=20, timeout_s=5)
+    run_sync(status.fetch_statuses())  # warm the pool
+
+    print(f"{'client':<14} {'ok':>5} {'err':>4} {'wall s':>7} {'p50 ms':>8} {'p95 ms':>8} {'conns':>6}")
+    runs = (
+        ("fresh client", lambda: fresh_client_call()),
+        ("pooled adapter", lambda: prometheus.query_window(QUERY, now - 3600, now)),
+    )
+    for label, call in runs:
+        before = backend_stats(base_url)["connections"]
+        samples, errors, wall = run_sync(run_calls(call, args.calls, args.concurrency))
+        print(f"{label:<14} {len(samples):>5} {errors:>4} {wall:>7.2f} {percentile(samples, 50) * 1000:>8.1f} "
+              f"{percentile(samples, 95) * 1000:>8.1f} {backend_stats(base_url)['connections'] - before:>6}")
+
+    # Circuit breaker against a failing backend
+    control(base_url, fail_rate=1.0)
+    failing = PrometheusSource("prometheus_failing", base_url, timeout_s=5,
+                               breaker=CircuitBreaker(failure_threshold=5, reset_timeout_s=60))
+    before = backend_stats(base_url)["requests"]
+    samples, errors, wall = run_sync(run_calls(lambda: failing.query(QUERY.format(window="60s")), args.calls, 1))
+    reached = backend_stats(base_url)["requests"] - before
+    print(f"\nfailing backend: {args.calls} calls, {reached} reached the backend, "
+          f"{args.calls - reached} short-circuited, circuit={failing.breaker.state}, wall {wall * 1000:.1f} ms")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
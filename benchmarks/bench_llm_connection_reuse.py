@@ -0,0 +1,83 @@
+"""
+Benchmark: connection setup removed by the pooled LLM HTTP client
+
+Compares a fresh HTTP client per call (what every per-message crew used to
+do) with the shared keep-alive client from config.llm, against the local
+stub LLM server or any OpenAI-compatible endpoint (--base-url; TLS
+handshakes make the difference much larger against real endpoints).
+
+Usage:
+    python benchmarks/bench_llm_connection_reuse.py [--calls 50] [--calls-per-turn 4]
+    python benchmarks/bench_llm_connection_reuse.py --base-url https://api.openai.com/v1 --api-key sk-...
+"""
+
+import argparse
+import os
+import sys
+import time
+import httpx
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from stub_llm_server import start_server
+from config.llm import http_client
+from chatops.perf import percentile
+
+
+def completion_request(client: httpx.Client, base_url: str, api_key: str):
+    response = client.post(
+        f"{base_url}/chat/completions",
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={"model": "gpt-4o-mini", "max_tokens": 1, "messages": [{"role": "user", "content": "ping"}]},
+    )
+    response.raise_for_status()
+
+
+def measure(call, calls: int):
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--calls-per-turn", type=int, default=4,
+                        help="LLM calls in a typical chat turn (classifier + agents + responder)")
+    parser.add_argument("--base-url", help="OpenAI-compatible base URL (default: local stub server)")
+    parser.add_argument("--api-key", default="stub")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = start_server(latency_s=0)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def fresh_client_call():
+        with httpx.Client(timeout=30) as client:
+            completion_request(client, base_url, args.api_key)
+
+    pooled = http_client()
+    completion_request(pooled, base_url, args.api_key)  # warm the pool
+
+    fresh = measure(fresh_client_call, args.calls)
+    reused = measure(lambda: completion_request(pooled, base_url, args.api_key), args.calls)
+
+    for label, samples in (("fresh client", fresh), ("pooled client", reused)):
+        print(f"{label:<14} p50={percentile(samples, 50) * 1000:8.2f} ms  p95={percentile(samples, 95) * 1000:8.2f} ms")
+
+    saved = percentile(fresh, 50) - percentile(reused, 50)
+    print(f"connection setup removed: {saved * 1000:.2f} ms per call, "
+          f"~{saved * 1000 * args.calls_per_turn:.1f} ms per chat turn ({args.calls_per_turn} LLM calls)")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark: streaming log scanner on multi-GB logs
+
+Writes a synthetic application log of --size-gb (one block of
+--lines-per-s lines per second of log time, ~0.5% of them errors drawn
+from a few recurring messages), then runs --queries alert windows
+(LOG_SCAN_BEFORE_S before to LOG_SCAN_AFTER_S after a random moment) and
+reports:
+- sparse index build time and size (first scan of the file)
+- query latency p50/p95/max, MB scanned per query and distinct results
+- with --baseline: one naive query reading the file line by line from the
+  start until the window ends (what log_agent would otherwise do)
+
+The file was just written, so it is mostly in the page cache; on a cold
+cache the index build costs one random read per INDEX_STRIDE and a query
+one sequential read of its window.
+
+Usage:
+    python benchmarks/bench_log_scanner.py [--size-gb 2] [--queries 50] [--baseline] [--keep PATH]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from config.settings import settings
+from aiops_workflow import log_scanner
+from chatops.perf import percentile
+
+PLACEHOLDER = b"@" * log_scanner.TIMESTAMP_LEN
+SERVICES = ["trading-gateway", "order-matching", "risk-engine", "market-data", "settlement-db"]
+INFO = [
+    "INFO  [{s}] request handled path=/api/v1/orders status=200 duration_ms={n}",
+    "INFO  [{s}] heartbeat ok peers={p} lag_ms={n}",
+    "DEBUG [{s}] cache hit key=order:{n} ttl=30",
+    "WARN  [{s}] slow query duration_ms={n} table=trades",
+]
+ERRORS = [
+    "ERROR [{s}] ORA-12541: TNS:no listener (pool=primary, attempt={p})",
+    "ERROR [{s}] Connection timed out after {n} ms to risk-engine:8443",
+    "ERROR [{s}] java.lang.IllegalStateException: order {n} already settled",
+    "FATAL [{s}] connection pool exhausted (active=200, max=200)",
+]
+
+
+def block_templates(lines_per_s: int, variants: int = 16):
+    """One second of log lines with a timestamp placeholder"""
+    random.seed(3)
+    templates = []
+    for _ in range(variants):
+        lines = []
+        for i in range(lines_per_s):
+            error = random.random() < 0.005
+            text = random.choice(ERRORS if error else INFO).format(
+                s=random.choice(SERVICES), n=random.randint(1, 99999), p=random.randint(1, 9))
+            lines.append(b"%s,%03d %s" % (PLACEHOLDER, i * 1000 // lines_per_s, text.encode()))
+        templates.append(b"\n".join(lines) + b"\n")
+    return templates
+
+
+def write_log(path: str, size_bytes: int, lines_per_s: int, start: datetime):
+    templates = block_templates(lines_per_s)
+    written, second = 0, 0
+    with open(path, "wb") as f:
+        while written < size_bytes:
+            stamp = (start + timedelta(seconds=second)).strftime("%Y-%m-%d %H:%M:%S").encode()
+            block = templates[second % len(templates)].replace(PLACEHOLDER, stamp)
+            f.write(block)
+            written += len(block)
+            second += 1
+    return second
+
+
+def naive_scan(path: str, start: float, end: float, pattern) -> int:
+    matches = 0
+    with open(path, "rb") as f:
+        for line in f:
+            ts = log_scanner.parse_timestamp(line)
+            if ts is None or ts < start:
+                continue
+            if ts > end:
+                break
+            if pattern.regex.search(line):
+                matches += 1
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=2)
+    parser.add_argument("--lines-per-s", type=int, default=2000, help="Log lines per second of log time")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--baseline", action="store_true", help="Also time one naive line-by-line query")
+    parser.add_argument("--keep", help="Write the log here and keep it (reused if it exists)")
+    args = parser.parse_args()
+
+    tmp = None if args.keep else tempfile.TemporaryDirectory()
+    path = args.keep or os.path.join(tmp.name, "app.log")
+    start = datetime(2026, 1, 5, 8, 0, 0)
+    try:
+        if not os.path.exists(path):
+            started = time.perf_counter()
+            seconds = write_log(path, int(args.size_gb * 1e9), args.lines_per_s, start)
+            print(f"wrote {os.path.getsize(path) / 1e9:.2f} GB ({seconds / 3600:.1f} h of logs) "
+                  f"in {time.perf_counter() - started:.1f}s")
+        log_file = log_scanner.LogFile(path)
+        first = log_scanner.parse_timestamp(open(path, "rb").read(64))
+        with open(path, "rb") as f:
+            f.seek(-4096, os.SEEK_END)
+            last = log_scanner.parse_timestamp(f.read().splitlines()[-1])
+
+        started = time.perf_counter()
+        log_file.refresh()
+        print(f"index: {log_file.index_size():,} entries in {(time.perf_counter() - started) * 1000:.1f} ms "
+              f"(stride {log_scanner.INDEX_STRIDE // 1024} KB)")
+
+        pattern = log_scanner.compile_pattern()
+        random.seed(11)
+        samples, scanned, results = [], [], []
+        for _ in range(args.queries):
+            moment = random.uniform(first + settings.LOG_SCAN_BEFORE_S, last - settings.LOG_SCAN_AFTER_S)
+            window = (moment - settings.LOG_SCAN_BEFORE_S, moment + settings.LOG_SCAN_AFTER_S)
+            started = time.perf_counter()
+            result = log_scanner.scan_file(log_file, *window, pattern, log_scanner.ScanResult(
+                settings.LOG_SCAN_MAX_RESULTS))
+            samples.append(time.perf_counter() - started)
+            scanned.append(result.bytes_scanned)
+            results.append((result.matches, len(result.entries)))
+        samples.sort()
+        window_s = settings.LOG_SCAN_BEFORE_S + settings.LOG_SCAN_AFTER_S
+        print(f"{args.queries} queries, {window_s:g}s windows: p50={percentile(samples, 50) * 1000:.1f} ms "
+              f"p95={percentile(samples, 95) * 1000:.1f} ms max={samples[-1] * 1000:.1f} ms, "
+              f"{sum(scanned) / len(scanned) / 1e6:.0f} MB scanned/query "
+              f"({sum(scanned) / sum(samples) / 1e6:,.0f} MB/s)")
+        print(f"per query: ~{sum(m for m, _ in results) // len(results):,} matching lines -> "
+              f"~{sum(d for _, d in results) // len(results)} distinct messages returned")
+
+        if args.baseline:
+            started = time.perf_counter()
+            naive_scan(path, *window, pattern)
+            print(f"naive line-by-line (last window): {time.perf_counter() - started:.1f}s")
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: compressed cold-session archive
+
+Seeds N ChatOps-like sessions into live storage, archives all of them and
+reports, per codec (zlib and, if installed, zstd; each with and without
+the shared dictionary):
+- disk footprint of the live files vs the archive segments
+- archiving throughput
+- rehydration latency (archive -> live, what reopening an old chat costs)
+
+Usage:
+    python benchmarks/bench_session_archive.py [--sessions 2000] [--messages 24]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from config.settings import settings
+from chatops.session_backends import cold_archive
+from chatops.session_manager import SessionManager
+from chatops.perf import percentile
+
+COMPONENTS = ["trading-gateway", "order-matching", "risk-engine", "market-data", "settlement-db"]
+QUESTIONS = [
+    "What is the status of {c}?",
+    "Why is {c} latency above {n} ms since {t}?",
+    "Show trade volume for the last {n} minutes",
+    "Any errors in {c} logs after deployment #{d}?",
+    "How do I restart {c} safely?",
+]
+ANSWERS = [
+    "**{c}** is `{s}`. p99 latency {n} ms (threshold 250 ms), error rate {e}%.",
+    "Found {n} matching log lines in {c} between {t} and now:\n- ORA-{o}: TNS:no listener\n"
+    "- connection pool exhausted (active={n}, max=200)\nLikely cause: deployment #{d} changed the pool size.",
+    "Trade volume: {n:,} trades, ${v:,.2f} notional. Peak at {t}.",
+    "Runbook for {c}:\n1. Drain traffic in the load balancer\n2. `kubectl rollout restart deploy/{c}`\n"
+    "3. Watch the health endpoint until it reports UP\n4. Re-enable traffic",
+]
+
+
+def fake_session(i: int, messages: int, start: datetime) -> dict:
+    created = start + timedelta(minutes=7 * i)
+    session = {"id": f"sess_bench_{i:06d}", "title": f"Incident {i}: {random.choice(COMPONENTS)}",
+               "created_at": created.isoformat(), "last_updated": created.isoformat(), "messages": []}
+    for j in range(messages):
+        fields = dict(c=random.choice(COMPONENTS), n=random.randint(5, 5000), t=created.strftime("%H:%M"),
+                      d=random.randint(1000, 9999), s=random.choice(["UP", "DEGRADED", "DOWN"]),
+                      e=round(random.random() * 5, 2), o=random.randint(10000, 12999), v=random.random() * 1e7)
+        user = j % 2 == 0
+        message = {"role": "user" if user else "assistant",
+                   "content": random.choice(QUESTIONS if user else ANSWERS).format(**fields),
+                   "timestamp": (created + timedelta(seconds=30 * j)).isoformat()}
+        if not user:
+            message["timings"] = {"ttft_s": round(random.random() * 3, 3), "total_s": round(random.random() * 9, 3)}
+        session["messages"].append(message)
+    return session
+
+
+def session_files_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path) if f.startswith("sess_"))
+
+
+def run(codec: str, dictionary: bool, args):
+    random.seed(7)
+    cold_archive.DICT_SAMPLES = 32 if dictionary else 10 ** 9
+    with tempfile.TemporaryDirectory() as storage_path:
+        manager = SessionManager(storage_path, backend="jsonl", cache_size=0)
+        manager.archive = cold_archive.ColdArchiveBackend(os.path.join(storage_path, "archive-" + codec), codec)
+        start = datetime.now() - timedelta(days=400)
+        ids = []
+        for i in range(args.sessions):
+            session = fake_session(i, args.messages, start)
+            manager.backend.create(session)
+            ids.append(session["id"])
+        live_bytes = session_files_size(storage_path)
+
+        started = time.perf_counter()
+        for session_id in ids:
+            manager.archive_session(session_id)
+        archive_s = time.perf_counter() - started
+        stats = manager.archive_stats()
+
+        samples = []
+        for session_id in random.sample(ids, min(args.rehydrate, len(ids))):
+            started = time.perf_counter()
+            manager.get_session(session_id)
+            samples.append(time.perf_counter() - started)
+        samples.sort()
+        manager.backend.close()
+
+    label = f"{codec}{' + dict' if dictionary else ''}"
+    print(f"{label:<12} live {live_bytes / 1e6:7.1f} MB -> archive {stats['disk_bytes'] / 1e6:6.1f} MB "
+          f"(x{live_bytes / stats['disk_bytes']:.1f} vs live files, x{stats['ratio']} vs compact JSON)  "
+          f"archive {args.sessions / archive_s:6.0f} sessions/s  "
+          f"rehydrate p50={percentile(samples, 50) * 1000:.2f} ms p95={percentile(samples, 95) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=24, help="Messages per session")
+    parser.add_argument("--rehydrate", type=int, default=200, help="Archived sessions to reopen")
+    args = parser.parse_args()
+
+    # Archive explicitly below, not from the background maintenance
+    settings.SESSION_ARCHIVE_IDLE_DAYS = 0
+    settings.SESSION_RETENTION_POLICY = "off"
+    codecs = ["zlib"] + (["zstd"] if cold_archive.zstandard is not None else [])
+    print(f"{args.sessions:,} sessions x {args.messages} messages")
+    for codec in codecs:
+        for dictionary in (False, True):
+            run(codec, dictionary, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: SessionManager list/get/update at scale, per storage backend
+
+Seeds N sessions (M messages each) into a temporary directory for every
+backend, then times the operations the Streamlit page performs:
+list_sessions (sidebar, every rerun), get_session (current chat),
+get_messages (the rendered window of the current chat), update_session (one chat turn appended) and search_sessions (sidebar
+full-text search).
+
+Usage:
+    python benchmarks/bench_sessions.py [--sessions 10000] [--messages 20] [--backends json sqlite] [--cache-size 64]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from chatops.session_backends import BACKENDS
+from chatops.session_manager import SessionManager
+from chatops.perf import percentile
+
+WORDS = ("gateway latency order matching deploy rollback incident alert risk engine timeout "
+         "connection pool error ORA-12541 restart pod kubernetes volume spike threshold").split()
+
+
+def fake_message(role: str) -> dict:
+    return {"role": role, "content": " ".join(random.choices(WORDS, k=random.randint(8, 60)))}
+
+
+def seed(manager: SessionManager, sessions: int, messages: int):
+    """Write sessions straight through the backend (fast, no per-turn updates)"""
+    start = datetime.now() - timedelta(days=90)
+    ids = []
+    for i in range(sessions):
+        created = (start + timedelta(minutes=13 * i)).isoformat()
+        session_id = f"sess_bench_{i:06d}"
+        manager.backend.create({
+            "id": session_id,
+            "title": " ".join(random.choices(WORDS, k=5)).capitalize(),
+            "created_at": created,
+            "last_updated": created,
+            "messages": [fake_message("user" if j % 2 == 0 else "assistant") for j in range(messages)],
+        })
+        ids.append(session_id)
+    return ids
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)
+
+
+def report(label: str, samples):
+    print(f"  {label:<16} p50={percentile(samples, 50) * 1000:9.2f} ms  p95={percentile(samples, 95) * 1000:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=20, help="Messages per seeded session")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=50, help="Samples per operation")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="Write-back session cache size (0 measures the backend directly)")
+    args = parser.parse_args()
+
+    for backend in args.backends:
+        random.seed(1)
+        with tempfile.TemporaryDirectory() as storage_path:
+            manager = SessionManager(storage_path, backend=backend, cache_size=args.cache_size)
+            started = time.perf_counter()
+            ids = seed(manager, args.sessions, args.messages)
+            print(f"{backend}: seeded {args.sessions:,} sessions x {args.messages} messages "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+            report("list_sessions", timed(manager.list_sessions, max(3, args.repeat // 10)))
+            report("get_session", timed(lambda: manager.get_session(random.choice(ids)), args.repeat))
+            report("get_messages", timed(lambda: manager.get_messages(random.choice(ids), -30), args.repeat))
+
+            def chat_turn():
+                session_id = random.choice(ids)
+                messages = manager.get_session(session_id)["messages"]
+                messages += [fake_message("user"), fake_message("assistant")]
+                manager.update_session(session_id, messages)
+
+            report("get+update turn", timed(chat_turn, args.repeat))
+            if manager.cache is not None:
+                report("flush", timed(manager.flush, 1))
+
+            if manager.search is not None:
+                started = time.perf_counter()
+                manager.search.sync(manager.list_sessions(), manager.backend.load)
+                print(f"  search index built in {time.perf_counter() - started:.1f}s")
+                queries = iter(["ORA-12541", "connection pool", "rollback deploy", "kube"] * args.repeat)
+                report("search_sessions", timed(lambda: manager.search_sessions(next(queries)), args.repeat))
+            manager.backend.close()
+
+
+if __name__ == "__main__":
+    main()
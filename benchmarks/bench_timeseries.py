@@ -0,0 +1,81 @@
+"""
+Benchmark: time-series store ingest rate and window query latency
+
+Ingests synthetic trade ticks (single points and batches), then compares
+rollup-backed window queries with a full scan of the raw points for the
+time ranges the data tools use.
+
+Usage:
+    python benchmarks/bench_timeseries.py [--hours 24] [--rate 50] [--batch 1000] [--queries 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from chatops.timeseries import TimeSeriesStore, SimulatedTradeFeed, resolve_time_range
+from chatops.perf import percentile
+
+TIME_RANGES = ["last_15m", "last_hour", "today", "last_24h"]
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=24, help="History to ingest")
+    parser.add_argument("--rate", type=float, default=50, help="Trades per second")
+    parser.add_argument("--batch", type=int, default=1000, help="Points per ingest_many call")
+    parser.add_argument("--queries", type=int, default=200, help="Repetitions per query")
+    args = parser.parse_args()
+
+    now = time.time()
+    feed = SimulatedTradeFeed(trades_per_s=args.rate, backfill_s=args.hours * 3600, seed=7)
+    (_, timestamps, values), = feed.backfill(now)
+    n = len(timestamps)
+    store = TimeSeriesStore(raw_capacity=n)
+
+    # Ingest: single points (first 20k) vs batches
+    single = min(n, 20000)
+    started = time.perf_counter()
+    for i in range(single):
+        store.ingest("single", timestamps[i], values[i])
+    single_rate = single / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for i in range(0, n, args.batch):
+        store.ingest_many("trade_volume", timestamps[i:i + args.batch], values[i:i + args.batch])
+    batch_rate = n / (time.perf_counter() - started)
+
+    print(f"ingest: {n:,} points; single {single_rate:,.0f} pts/s, batch({args.batch}) {batch_rate:,.0f} pts/s")
+
+    raw_ts, raw_values = store.raw_points("trade_volume")
+    print(f"{'range':<10} {'points':>10} {'rollup p50':>11} {'rollup p95':>11} {'scan p50':>10} {'speedup':>8}")
+    for time_range in TIME_RANGES:
+        start, end = resolve_time_range(time_range, now)
+
+        def scan():
+            mask = (raw_ts >= start) & (raw_ts < end)
+            return raw_values[mask].sum()
+
+        rollup = timed(lambda: store.aggregate("trade_volume", start, end), args.queries)
+        full = timed(scan, max(args.queries // 10, 5))
+        points = int(((raw_ts >= start) & (raw_ts < end)).sum())
+        print(f"{time_range:<10} {points:>10,} {percentile(rollup, 50) * 1e3:>9.3f}ms "
+              f"{percentile(rollup, 95) * 1e3:>9.3f}ms {percentile(full, 50) * 1e3:>8.2f}ms "
+              f"{percentile(full, 50) / percentile(rollup, 50):>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
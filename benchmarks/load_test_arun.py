@@ -0,0 +1,104 @@
+"""
+Load test: ChatOpsCrew.arun against the local stub LLM server
+
+Simulates 1/10/50 concurrent operators, each sending a sequence of
+questions (with deliberate duplicates so coalescing kicks in), and reports
+throughput, latency percentiles, shed and coalesced requests and LLM calls.
+
+Usage:
+    python benchmarks/load_test_arun.py [--users 1 10 50] [--requests 5] [--latency-ms 300]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from stub_llm_server import start_server
+
+QUESTIONS = [
+    "Is Gateway down?",
+    "Is Gateway down?",
+    "What is the current system status?",
+    "Hello, what can you do?",
+    "Thanks for the help!",
+    "Can you explain what a circuit breaker is?",
+]
+
+
+def configure_stub(base_url: str):
+    # Must happen before chatops/config are imported
+    os.environ["USE_LOCAL_LLM"] = "false"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ["CREWAI_TELEMETRY_OPT_OUT"] = "true"
+
+
+def llm_calls(base_url: str) -> int:
+    with urllib.request.urlopen(base_url.replace("/v1", "/stats")) as response:
+        return json.load(response)["requests"]
+
+
+async def user_session(crew_cls, requests: int, latencies: list, errors: dict):
+    from chatops.admission import OverloadedError
+
+    for _ in range(requests):
+        question = random.choice(QUESTIONS)
+        started = time.perf_counter()
+        try:
+            await crew_cls().arun(question)
+            latencies.append(time.perf_counter() - started)
+        except OverloadedError:
+            errors["shed"] += 1
+        except Exception as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+
+
+async def run_level(crew_cls, users: int, requests: int):
+    latencies, errors = [], {"shed": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*[user_session(crew_cls, requests, latencies, errors) for _ in range(users)])
+    return latencies, errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=5, help="Requests per user")
+    parser.add_argument("--latency-ms", type=float, default=300, help="Stub LLM latency")
+    args = parser.parse_args()
+
+    server = start_server(latency_s=args.latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    configure_stub(base_url)
+
+    from chatops.crew import ChatOpsCrew
+    from chatops.perf import perf, percentile
+
+    print(f"{'users':>5} {'ok':>5} {'shed':>5} {'req/s':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'coalesced':>9} {'llm calls':>9}")
+    for users in args.users:
+        perf.reset()
+        calls_before = llm_calls(base_url)
+        latencies, errors, elapsed = asyncio.run(run_level(ChatOpsCrew, users, args.requests))
+        latencies.sort()
+        other_errors = {k: v for k, v in errors.items() if k != "shed"}
+        print(f"{users:>5} {len(latencies):>5} {errors['shed']:>5} {len(latencies) / elapsed:>8.2f} "
+              f"{percentile(latencies, 50) or 0:>7.2f} {percentile(latencies, 95) or 0:>7.2f} "
+              f"{percentile(latencies, 99) or 0:>7.2f} {int(perf.count('admission.coalesced')):>9} "
+              f"{llm_calls(base_url) - calls_before:>9}"
+              + (f"  errors={other_errors}" if other_errors else ""))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
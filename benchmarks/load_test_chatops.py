@@ -0,0 +1,233 @@
+"""
+End-to-end load test: ChatOps chat turns against the local stub LLM server
+
+Each simulated operator runs the same path as the Streamlit ChatOps page:
+load the session, build the bounded history, run ChatOpsCrew (run() or
+stream()), save the session and list sessions for the sidebar. Questions
+are drawn from a KNOWLEDGE / DATA / HYBRID / GENERAL traffic mix and every
+request is tagged with a "#r<N>" ref so the stub can count the LLM calls it
+caused.
+
+Reports per flow (the intent the request was actually routed to):
+throughput, latency p50/p95/p99, TTFT p50 (--stream) and LLM calls per
+request. All traffic is local, so runs are free and repeatable.
+
+Usage:
+    python benchmarks/load_test_chatops.py [--users 10] [--requests 5] [--stream]
+        [--backend openai|ollama] [--latency lognormal:300:0.4] [--token-ms 15]
+        [--mix knowledge=40,data=30,hybrid=20,general=10] [--script rules.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from stub_llm_server import start_server
+
+# Questions per requested flow. KNOWLEDGE/DATA/GENERAL ones are keyword
+# routed; HYBRID ones are ambiguous and go through the (stub) LLM classifier.
+QUESTIONS = {
+    "knowledge": [
+        "How to deploy the OrderMatching service?",
+        "Where is the rollback procedure documented?",
+        "Gateway configuration guide",
+        "SOP for the RiskEngine setup",
+    ],
+    "data": [
+        "Gateway status now",
+        "Trade volume today",
+        "Current match count",
+        "RiskEngine health",
+    ],
+    "hybrid": [
+        "Gateway status is degraded, which runbook procedure applies?",
+        "Volume dropped, how do I check the deployment?",
+    ],
+    "general": [
+        "Hello, what can you do?",
+        "Explain what a circuit breaker is",
+        "Thanks for the help!",
+        "Gateway keeps dropping FIX sessions",
+    ],
+}
+
+DEFAULT_MIX = "knowledge=40,data=30,hybrid=20,general=10"
+
+
+def parse_mix(spec: str):
+    weights = {}
+    for part in spec.split(","):
+        flow, _, weight = part.partition("=")
+        if flow.strip() not in QUESTIONS:
+            raise ValueError(f"Unknown flow in mix: {flow}")
+        weights[flow.strip()] = float(weight)
+    return list(weights), list(weights.values())
+
+
+def configure_stub(port: int, backend: str):
+    # Must happen before chatops/config are imported
+    if backend == "ollama":
+        os.environ["USE_LOCAL_LLM"] = "true"
+        os.environ["OLLAMA_BASE_URL"] = f"http://127.0.0.1:{port}"
+    else:
+        base_url = f"http://127.0.0.1:{port}/v1"
+        os.environ["USE_LOCAL_LLM"] = "false"
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = base_url
+        os.environ["OPENAI_API_BASE"] = base_url
+    os.environ["CREWAI_TELEMETRY_OPT_OUT"] = "true"
+
+
+def stub_stats(port: int):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as response:
+        return json.load(response)
+
+
+class Operator:
+    """One simulated ChatOps user with its own session"""
+
+    _ref_lock = threading.Lock()
+    _next_ref = 0
+
+    def __init__(self, session_manager, flows, weights, stream: bool):
+        self.sessions = session_manager
+        self.flows = flows
+        self.weights = weights
+        self.stream = stream
+        self.session_id = session_manager.create_session()
+
+    @classmethod
+    def new_ref(cls) -> str:
+        with cls._ref_lock:
+            cls._next_ref += 1
+            return f"#r{cls._next_ref}"
+
+    def turn(self):
+        """One chat turn; returns a result record"""
+        from chatops.crew import ChatOpsCrew
+        from chatops.history import HistoryManager
+
+        requested = random.choices(self.flows, self.weights)[0]
+        question = random.choice(QUESTIONS[requested])
+        ref = self.new_ref()
+        record = {"requested": requested, "ref": ref, "flow": requested, "error": None}
+
+        started = time.perf_counter()
+        try:
+            session = self.sessions.get_session(self.session_id)
+            messages = session["messages"] + [{"role": "user", "content": question}]
+            history, summary = HistoryManager().build(messages[:-1], session.get("summary"))
+            session_s = time.perf_counter() - started
+
+            crew = ChatOpsCrew()
+            # The ref is only sent to the crew, so history never carries old refs
+            tagged = f"{question} (ref {ref})"
+            if self.stream:
+                answer = "".join(crew.stream(tagged, history))
+                record["ttft_s"] = crew.last_timings.get("ttft_s")
+            else:
+                answer = str(crew.run(tagged, history))
+            record["flow"] = crew.last_intent.value if crew.last_intent else requested
+
+            saved = time.perf_counter()
+            messages.append({"role": "assistant", "content": answer})
+            self.sessions.update_session(self.session_id, messages, summary=summary)
+            self.sessions.list_sessions()
+            record["session_s"] = session_s + time.perf_counter() - saved
+        except Exception as e:
+            record["error"] = type(e).__name__
+
+        record["latency_s"] = time.perf_counter() - started
+        return record
+
+
+def report(records, elapsed: float, calls_by_ref):
+    from chatops.perf import percentile
+
+    by_flow = defaultdict(list)
+    for record in records:
+        by_flow[record["flow"]].append(record)
+    by_flow["all"] = records
+
+    print(f"{'flow':<10} {'ok':>5} {'err':>4} {'req/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'ttft p50':>8} {'session ms':>10} {'llm/req':>7}")
+    for flow, rows in sorted(by_flow.items(), key=lambda item: item[0] == "all"):
+        ok = [r for r in rows if not r["error"]]
+        latencies = sorted(r["latency_s"] for r in ok)
+        ttfts = sorted(r["ttft_s"] for r in ok if r.get("ttft_s") is not None)
+        session_ms = [r["session_s"] * 1000 for r in ok]
+        calls = sum(calls_by_ref.get(r["ref"], 0) for r in rows)
+        print(f"{flow:<10} {len(ok):>5} {len(rows) - len(ok):>4} {len(ok) / elapsed:>7.2f} "
+              f"{percentile(latencies, 50) or 0:>7.2f} {percentile(latencies, 95) or 0:>7.2f} "
+              f"{percentile(latencies, 99) or 0:>7.2f} {percentile(ttfts, 50) or 0:>8.2f} "
+              f"{(sum(session_ms) / len(session_ms)) if session_ms else 0:>10.1f} "
+              f"{calls / len(rows):>7.2f}")
+
+    errors = defaultdict(int)
+    for record in records:
+        if record["error"]:
+            errors[record["error"]] += 1
+    if errors:
+        print(f"errors: {dict(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent operators")
+    parser.add_argument("--requests", type=int, default=5, help="Chat turns per operator")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Traffic mix (flow=weight,...)")
+    parser.add_argument("--stream", action="store_true", help="Use ChatOpsCrew.stream() like the UI")
+    parser.add_argument("--backend", choices=["openai", "ollama"], default="openai",
+                        help="API the stub serves to ChatOps")
+    parser.add_argument("--latency", default="lognormal:300:0.4", help="Stub LLM latency spec")
+    parser.add_argument("--token-ms", type=float, default=15, help="Stub delay between streamed tokens")
+    parser.add_argument("--script", help="JSON file with scripted stub replies")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    script = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+
+    server = start_server(latency=args.latency, token_ms=args.token_ms, script=script)
+    port = server.server_address[1]
+    configure_stub(port, args.backend)
+
+    from chatops.session_manager import SessionManager
+
+    flows, weights = parse_mix(args.mix)
+    with tempfile.TemporaryDirectory() as sessions_dir:
+        session_manager = SessionManager(sessions_dir)
+        operators = [Operator(session_manager, flows, weights, args.stream) for _ in range(args.users)]
+
+        def operate(operator):
+            return [operator.turn() for _ in range(args.requests)]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            records = [r for batch in pool.map(operate, operators) for r in batch]
+        elapsed = time.perf_counter() - started
+
+    stats = stub_stats(port)
+    print(f"{args.users} users x {args.requests} turns, backend={args.backend}, "
+          f"{'stream' if args.stream else 'run'}, latency={args.latency}, {elapsed:.1f}s wall, "
+          f"{stats['requests']} LLM calls {stats['by_endpoint']}")
+    report(records, elapsed, stats["by_ref"])
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
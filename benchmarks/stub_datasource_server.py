@@ -0,0 +1,136 @@
+"""
+Local stub data-source server (Prometheus query API + REST status endpoint)
+
+Stands in for the live metrics backends so the data-source adapters and
+the data tools can be exercised locally:
+- GET /api/v1/query   Prometheus instant query; answers any expression
+                      with a vector whose value grows with the [window]
+- GET /status         {"components": {name: status}}
+- GET /stats          request and connection counters
+- POST /control       {"fail_rate": 0..1, "latency": "<spec>"} at runtime
+
+Usage:
+    python benchmarks/stub_datasource_server.py [--port 9090] [--latency fixed:20] [--fail-rate 0]
+
+Point ChatOps at it:
+    DATASOURCE_PROMETHEUS_URL=http://127.0.0.1:9090 DATASOURCE_STATUS_URL=http://127.0.0.1:9090 ...
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from stub_llm_server import parse_latency
+
+WINDOW = re.compile(r"\[(\d+)s\]")
+COMPONENTS = ["OrderMatching", "Gateway", "RiskEngine"]
+NOTIONAL_PER_S = 2500.0
+
+
+class StubDataSourceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            self._send_json(self.server.stats())
+            return
+
+        self.server.count("requests")
+        time.sleep(self.server.latency())
+        if random.random() < self.server.fail_rate:
+            self._send_json({"status": "error", "error": "injected failure"}, status=503)
+            return
+
+        if url.path == "/api/v1/query":
+            params = parse_qs(url.query)
+            match = WINDOW.search(params.get("query", [""])[0])
+            seconds = int(match.group(1)) if match else 0
+            at = float(params.get("time", [time.time()])[0])
+            value = seconds * NOTIONAL_PER_S * random.uniform(0.9, 1.1)
+            self._send_json({
+                "status": "success",
+                "data": {"resultType": "vector", "result": [{"metric": {}, "value": [at, f"{value:.2f}"]}]},
+            })
+        elif url.path == "/status":
+            self._send_json({"components": {c: random.choice(["Healthy", "Healthy", "Degraded"]) for c in COMPONENTS}})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0) or 0)) or b"{}")
+        if self.path == "/control":
+            if "fail_rate" in body:
+                self.server.fail_rate = float(body["fail_rate"])
+            if "latency" in body:
+                self.server.latency = parse_latency(body["latency"])
+            self._send_json({"ok": True})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubDataSourceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency="fixed:20", fail_rate: float = 0.0):
+        super().__init__(address, StubDataSourceHandler)
+        self.latency = parse_latency(latency)
+        self.fail_rate = fail_rate
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "connections": 0}
+
+    def count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+def start_server(port: int = 0, latency="fixed:20", fail_rate: float = 0.0) -> StubDataSourceServer:
+    """Start the stub server in a background thread (call shutdown() to stop)"""
+    server = StubDataSourceServer(("127.0.0.1", port), latency=latency, fail_rate=fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9090)
+    parser.add_argument("--latency", default="fixed:20", help="Latency distribution spec")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = start_server(args.port, latency=args.latency, fail_rate=args.fail_rate)
+    print(f"Stub data-source server listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Local stub LLM server (OpenAI-compatible and Ollama chat APIs)
+
+Stands in for OpenAI / Ollama so ChatOps can be benchmarked for free:
+- POST /v1/chat/completions  (OpenAI; "stream": true -> SSE chunks)
+- POST /api/chat, /api/generate (Ollama; streams NDJSON unless "stream": false)
+- GET  /api/tags, /v1/models
+- GET  /stats  request counters (total, per endpoint, per "#r<N>" request ref)
+- POST /stats/reset
+
+Replies are scripted: a JSON script file holds rules
+    [{"pattern": "<regex on the prompt>", "response": "<text>", "latency": "<spec>"}]
+checked in order; without a match, built-in behaviour answers intent
+classification prompts, drives CrewAI's ReAct loop through one tool call,
+and otherwise returns a final answer.
+
+Latency specs: "fixed:300", "uniform:100:500", "normal:300:50",
+"lognormal:300:0.5" (median ms, sigma). Streaming sends the first token
+after the sampled latency and the rest --token-ms apart.
+
+Usage:
+    python benchmarks/stub_llm_server.py [--port 8765] [--latency fixed:300] [--token-ms 15] [--script rules.json]
+
+Point ChatOps at it (OpenAI mode):
+    USE_LOCAL_LLM=false OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8765/v1 ...
+or (Ollama mode):
+    USE_LOCAL_LLM=true OLLAMA_BASE_URL=http://127.0.0.1:8765 ...
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REQUEST_REF = re.compile(r"#r\d+")
+
+# Arguments the built-in ReAct script passes to each ChatOps tool
+TOOL_INPUTS = {
+    "Search Knowledge Base": {"search_query": "deployment procedure"},
+    "Get Trade Volume": {"time_range": "today"},
+    "Get System Status": {"component": "all"},
+    "Get Match Count": {"dummy_arg": ""},
+    "Get Metrics Batch": {"requests": [{"metric": "system_status", "component": "all"},
+                                       {"metric": "trade_volume", "time_range": "today"}]},
+}
+
+
+def parse_latency(spec):
+    """
+    Build a latency sampler (seconds) from a spec string
+
+    Args:
+        spec: "fixed:ms", "uniform:lo_ms:hi_ms", "normal:mean_ms:sd_ms" or
+            "lognormal:median_ms:sigma"; a bare number means fixed ms
+
+    Returns:
+        Zero-argument callable returning a delay in seconds
+    """
+    if isinstance(spec, (int, float)):
+        return lambda: spec / 1000
+    kind, *params = str(spec).split(":")
+    if not params:
+        kind, params = "fixed", [kind]
+    values = [float(p) for p in params]
+
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        import math
+        mu = math.log(values[0])
+        return lambda: random.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def builtin_reply(prompt: str) -> str:
+    """Default scripted behaviour for ChatOps prompts"""
+    if "Classify this query" in prompt:
+        query = prompt.split("Query:", 1)[-1].split("\n", 1)[0].lower()
+        wants_docs = any(w in query for w in ("how", "deploy", "procedure", "guide", "runbook", "sop"))
+        wants_data = any(w in query for w in ("status", "volume", "now", "current", "match", "health"))
+        if wants_docs and wants_data:
+            return "HYBRID"
+        if wants_data:
+            return "DATA"
+        if wants_docs:
+            return "KNOWLEDGE"
+        return "GENERAL"
+
+    if "Update the running summary" in prompt:
+        return "Operator discussed ChatOps questions; no open issues."
+
+    # CrewAI ReAct: call the first listed tool once, then give the final answer
+    tools = re.findall(r"Tool Name: ([^\n]+)", prompt)
+    if tools and "Observation:" not in prompt:
+        tool = tools[0].strip()
+        return (f"Thought: I should use a tool to answer this.\n"
+                f"Action: {tool}\n"
+                f"Action Input: {json.dumps(TOOL_INPUTS.get(tool, {}))}")
+
+    return ("Thought: I now can give a great answer\n"
+            "Final Answer: This is a stub response from the local LLM server.")
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(self.server.stats())
+        elif self.path == "/api/tags":
+            self._send_json({"models": [{"name": "stub", "model": "stub"}]})
+        elif self.path == "/v1/models":
+            self._send_json({"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        if self.path == "/stats/reset":
+            self.server.reset_stats()
+            self._send_json({"ok": True})
+            return
+
+        request = json.loads(body or b"{}")
+        if self.path.endswith("/chat/completions"):
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            handler = self._openai_stream if request.get("stream") else self._openai_complete
+        elif self.path == "/api/chat":
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            handler = self._ollama_stream if request.get("stream", True) else self._ollama_complete
+        elif self.path == "/api/generate":
+            prompt = str(request.get("prompt", ""))
+            handler = self._ollama_stream if request.get("stream", True) else self._ollama_complete
+        else:
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        self.server.record(self.path, prompt)
+        reply, latency = self.server.reply(prompt)
+        time.sleep(latency)
+        handler(request, reply)
+
+    # --- OpenAI ---
+
+    def _openai_complete(self, request, reply):
+        self._send_json({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(reply.split()), "total_tokens": len(reply.split())},
+        })
+
+    def _openai_stream(self, request, reply):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        def chunk(delta, finish_reason=None):
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+
+        self._start_chunked("text/event-stream")
+        for i, token in enumerate(self._tokens(reply)):
+            delta = {"role": "assistant", "content": token} if i == 0 else {"content": token}
+            self._write_chunk(f"data: {json.dumps(chunk(delta))}\n\n")
+        self._write_chunk(f"data: {json.dumps(chunk({}, 'stop'))}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self._end_chunked()
+
+    # --- Ollama ---
+
+    def _ollama_message(self, request, content, done):
+        message = {"model": request.get("model", "stub"), "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+        if self.path == "/api/chat":
+            message["message"] = {"role": "assistant", "content": content}
+        else:
+            message["response"] = content
+        if done:
+            message.update({"done_reason": "stop", "total_duration": 0, "eval_count": 0, "prompt_eval_count": 0})
+        return message
+
+    def _ollama_complete(self, request, reply):
+        self._send_json(self._ollama_message(request, reply, done=True))
+
+    def _ollama_stream(self, request, reply):
+        self._start_chunked("application/x-ndjson")
+        for token in self._tokens(reply):
+            self._write_chunk(json.dumps(self._ollama_message(request, token, done=False)) + "\n")
+        self._write_chunk(json.dumps(self._ollama_message(request, "", done=True)) + "\n")
+        self._end_chunked()
+
+    # --- helpers ---
+
+    def _tokens(self, reply):
+        """Split a reply into word tokens, pacing all but the first"""
+        tokens = re.findall(r"\S+\s*|\s+", reply) or [""]
+        for i, token in enumerate(tokens):
+            if i and self.server.token_s:
+                time.sleep(self.server.token_s)
+            yield token
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency="fixed:300", token_ms=0.0, script=None):
+        super().__init__(address, StubLLMHandler)
+        self.latency = parse_latency(latency)
+        self.token_s = token_ms / 1000
+        self.rules = [
+            (re.compile(rule["pattern"], re.S), rule["response"],
+             parse_latency(rule["latency"]) if "latency" in rule else None)
+            for rule in (script or [])
+        ]
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = 0
+            self.by_endpoint = Counter()
+            self.by_ref = Counter()
+
+    def record(self, endpoint, prompt):
+        with self.lock:
+            self.requests += 1
+            self.by_endpoint[endpoint] += 1
+            for ref in set(REQUEST_REF.findall(prompt)):
+                self.by_ref[ref] += 1
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "by_endpoint": dict(self.by_endpoint), "by_ref": dict(self.by_ref)}
+
+    def reply(self, prompt):
+        """Scripted reply and sampled latency for a prompt"""
+        for pattern, response, latency in self.rules:
+            if pattern.search(prompt):
+                return response, (latency or self.latency)()
+        return builtin_reply(prompt), self.latency()
+
+
+def start_server(port: int = 0, latency_s: float = 0.3, latency=None, token_ms: float = 0.0, script=None) -> StubLLMServer:
+    """
+    Start the stub server in a background thread
+
+    Args:
+        port: TCP port (0 picks a free one; see server.server_address)
+        latency_s: Fixed delay before each completion (ignored if latency is given)
+        latency: Optional latency spec (see parse_latency)
+        token_ms: Delay between streamed tokens
+        script: Optional list of scripted reply rules
+
+    Returns:
+        Running server (call shutdown() to stop)
+    """
+    server = StubLLMServer(("127.0.0.1", port), latency if latency is not None else latency_s * 1000,
+                           token_ms=token_ms, script=script)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:300", help="Latency distribution spec")
+    parser.add_argument("--token-ms", type=float, default=15, help="Delay between streamed tokens")
+    parser.add_argument("--script", help="JSON file with scripted reply rules")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+
+    server = start_server(args.port, latency=args.latency, token_ms=args.token_ms, script=script)
+    print(f"Stub LLM server listening on http://127.0.0.1:{server.server_address[1]} "
+          f"(OpenAI: /v1, Ollama: /api)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
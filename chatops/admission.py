@@ -0,0 +1,205 @@
+"""
+Admission Control for ChatOps Requests
+
+Process-wide limiter shared by every ChatOpsCrew:
+1. At most N requests execute at once (one worker thread each)
+2. Up to M further requests wait in a bounded queue; beyond that, or after
+   waiting too long, requests are shed with OverloadedError
+3. Identical in-flight requests are coalesced onto one execution
+
+Waiters are plain futures, not threads, so a waiting request costs nothing.
+The limiter is loop-agnostic: Streamlit runs each browser session in its
+own thread (and event loop), and they all share this one instance.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Callable, Optional
+from config.settings import settings
+from .perf import perf
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a request is shed by admission control"""
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue and request coalescing"""
+
+    def __init__(self, max_concurrent: int = None, max_queue: int = None, queue_timeout_s: float = None):
+        """
+        Initialize AdmissionController
+
+        Args:
+            max_concurrent: Maximum requests executing at once
+            max_queue: Maximum requests waiting for a slot
+            queue_timeout_s: Maximum time a request may wait for a slot
+        """
+        self.max_concurrent = max_concurrent or settings.CHATOPS_MAX_CONCURRENT
+        self.max_queue = max_queue if max_queue is not None else settings.CHATOPS_MAX_QUEUE
+        self.queue_timeout_s = queue_timeout_s or settings.CHATOPS_QUEUE_TIMEOUT_S
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+        self._in_flight = {}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="chatops")
+
+    async def run(self, fn: Callable, key: Optional[str] = None):
+        """
+        Run a blocking callable under admission control
+
+        Args:
+            fn: Zero-argument callable doing the work
+            key: Optional coalescing key; concurrent calls with the same key
+                share one execution
+
+        Returns:
+            Result of fn
+
+        Raises:
+            OverloadedError: If the request was shed
+        """
+        if key is None:
+            return await self._admit_and_run(fn)
+
+        with self._lock:
+            shared = self._in_flight.get(key)
+            if shared is None:
+                shared = Future()
+                self._in_flight[key] = shared
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            perf.incr("admission.coalesced")
+            # Shielded: a cancelled follower (client gone) must not cancel the shared result
+            return await asyncio.shield(asyncio.wrap_future(shared))
+
+        try:
+            result = await self._admit_and_run(fn)
+        except BaseException as e:
+            if not shared.done():
+                shared.set_exception(e)
+            raise
+        else:
+            if not shared.done():
+                shared.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    @contextmanager
+    def slot(self):
+        """
+        Blocking (thread) variant: hold an execution slot for a with-block
+
+        Raises:
+            OverloadedError: If the request was shed
+        """
+        waiter = self._acquire()
+        try:
+            waiter.result(timeout=self.queue_timeout_s)
+        except FutureTimeoutError:
+            if self._abandon(waiter):
+                raise self._timeout_error()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": len(self._waiters),
+                "in_flight_keys": len(self._in_flight),
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+            }
+
+    async def _admit_and_run(self, fn: Callable):
+        waiter = self._acquire()
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(waiter), timeout=self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                raise self._timeout_error()
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self._release()
+            raise
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn)
+        finally:
+            self._release()
+
+    def _acquire(self) -> Future:
+        """Reserve a slot; the returned future resolves once the slot is granted"""
+        waiter = Future()
+        waiter.enqueued_at = time.perf_counter()
+        with self._lock:
+            if self._active < self.max_concurrent:
+                self._active += 1
+                waiter.set_result(0.0)
+            elif len(self._waiters) >= self.max_queue:
+                perf.incr("admission.shed")
+                raise OverloadedError(
+                    f"ChatOps is overloaded ({self._active} requests running, "
+                    f"{len(self._waiters)} queued). Please retry shortly."
+                )
+            else:
+                self._waiters.append(waiter)
+        perf.incr("admission.admitted")
+        return waiter
+
+    def _release(self) -> None:
+        """Free a slot, handing it directly to the oldest live waiter"""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.set_running_or_notify_cancel():
+                    wait_s = time.perf_counter() - waiter.enqueued_at
+                    waiter.set_result(wait_s)
+                    perf.observe("admission.queue_wait_s", wait_s)
+                    return
+            self._active -= 1
+
+    def _abandon(self, waiter: Future) -> bool:
+        """
+        Give up on a queued waiter after timeout/cancellation
+
+        Returns:
+            True if the waiter was dropped, False if its slot had already
+            been granted (the caller then holds the slot)
+        """
+        with self._lock:
+            if waiter.cancel():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+                perf.incr("admission.shed")
+                return True
+            return False
+
+    def _timeout_error(self) -> OverloadedError:
+        return OverloadedError(f"Timed out after {self.queue_timeout_s:.0f}s waiting for a free ChatOps slot.")
+
+
+def request_key(user_question: str, chat_history: str = "") -> str:
+    """Coalescing key: identical question in identical context"""
+    normalized = " ".join(user_question.lower().split())
+    return hashlib.sha256(f"{normalized}\x00{chat_history}".encode("utf-8")).hexdigest()
+
+
+admission = AdmissionController()
@@ -1,21 +1,16 @@
-from crewai import Agent, LLM
-from .tools.dynamic_data import get_trade_volume, get_system_status, get_match_count
+from crewai import Agent
+from .tools.dynamic_data import get_trade_volume, get_system_status, get_match_count, get_metrics_batch
 from .tools.rag_tool import search_knowledge_base
-from langchain_openai import ChatOpenAI
-from config.settings import settings
+from config.llm import get_agent_llm, get_chat_model
 
 class ChatOpsAgents:
     def __init__(self):
-        if settings.USE_LOCAL_LLM:
-            self.llm = LLM(
-                model=f"ollama/{settings.OLLAMA_MODEL_NAME}",
-                base_url=settings.OLLAMA_BASE_URL
-            )
-        else:
-            self.llm = ChatOpenAI(
-                model=settings.OPENAI_MODEL_NAME, 
-                api_key=settings.OPENAI_API_KEY
-            )
+        # Shared, pooled client (agents are recreated per chat message)
+        self.llm = get_agent_llm()
+
+    def streaming_llm(self):
+        """Chat model used to stream the responder stage token by token"""
+        return get_chat_model(streaming=True)
 
     def knowledge_retriever_agent(self):
         return Agent(
@@ -31,8 +26,9 @@ class ChatOpsAgents:
         return Agent(
             role='Data Analyst',
             goal='Fetch and interpret real-time system data and metrics.',
-            backstory='You have access to all live production metrics. You can query trade volumes, system status, and other dynamic data.',
+            backstory='You have access to all live production metrics. You can query trade volumes, system status, and other dynamic data. When a question needs more than one metric, you fetch them all at once with Get Metrics Batch instead of calling tools one by one.',
             tools=[
+                get_metrics_batch,
                 get_trade_volume,
                 get_system_status,
                 get_match_count
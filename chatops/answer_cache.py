@@ -0,0 +1,176 @@
+"""
+Semantic Answer Cache for Knowledge Queries
+
+Caches final answers of the knowledge-only flow:
+1. Lookup by query embedding (cosine similarity above a threshold)
+2. Each entry is tied to the knowledge index version and the content
+   hashes of the sources its answer was built from
+3. When re-ingestion bumps the index version, entries whose sources changed
+   are dropped; entries built from untouched sources stay valid
+
+Only KNOWLEDGE answers belong here: DATA and HYBRID answers contain live
+data and must never be served from cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import numpy as np
+from config.settings import settings
+
+
+@dataclass
+class CacheEntry:
+    """A cached answer and the index state it was computed against"""
+    query: str
+    embedding: np.ndarray
+    answer: str
+    sources: Dict[str, Optional[str]]  # source name -> content hash
+    index_version: Optional[int]
+    compute_s: float
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+class SemanticAnswerCache:
+    """Thread-safe embedding-keyed answer cache with LRU eviction"""
+
+    def __init__(self, threshold: float = None, max_entries: int = None, ttl_s: float = None):
+        """
+        Initialize SemanticAnswerCache
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of cached answers
+            ttl_s: Maximum entry age in seconds
+        """
+        self.threshold = threshold if threshold is not None else settings.ANSWER_CACHE_SIMILARITY
+        self.max_entries = max_entries or settings.ANSWER_CACHE_MAX_ENTRIES
+        self.ttl_s = ttl_s if ttl_s is not None else settings.ANSWER_CACHE_TTL_S
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> CacheEntry (LRU order)
+        self._matrix = None            # stacked normalized embeddings
+        self._keys = []
+        self._next_key = 0
+        self._index_version = None
+        self._hits = 0
+        self._misses = 0
+        self._saved_s = 0.0
+
+    def lookup(self, embedding, manifest: Dict) -> Optional[CacheEntry]:
+        """
+        Find a cached answer for a semantically similar query
+
+        Args:
+            embedding: Query embedding
+            manifest: Current knowledge index manifest (see knowledge_base.manifest)
+
+        Returns:
+            Matching entry or None
+        """
+        query_vector = self._normalize(embedding)
+
+        with self._lock:
+            if manifest.get("version") != self._index_version:
+                self._revalidate(manifest)
+
+            entry = None
+            if self._entries:
+                if self._matrix is None:
+                    self._keys = list(self._entries.keys())
+                    self._matrix = np.vstack([self._entries[k].embedding for k in self._keys])
+                scores = self._matrix @ query_vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    key = self._keys[best]
+                    candidate = self._entries[key]
+                    if time.time() - candidate.created_at <= self.ttl_s:
+                        entry = candidate
+                        entry.hits += 1
+                        self._entries.move_to_end(key)
+                    else:
+                        self._remove(key)
+
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._saved_s += entry.compute_s
+            return entry
+
+    def store(self, query: str, embedding, answer: str, sources: List[str], manifest: Dict, compute_s: float) -> None:
+        """
+        Cache a freshly computed answer
+
+        Args:
+            query: User query string
+            embedding: Query embedding
+            answer: Final answer text
+            sources: Names of the sources the answer was built from
+            manifest: Knowledge index manifest at retrieval time
+            compute_s: Time it took to compute the answer (reported as saved on hits)
+        """
+        index_sources = manifest.get("sources", {})
+        entry = CacheEntry(
+            query=query,
+            embedding=self._normalize(embedding),
+            answer=answer,
+            sources={source: index_sources.get(source) for source in sources},
+            index_version=manifest.get("version"),
+            compute_s=compute_s,
+        )
+
+        with self._lock:
+            if manifest.get("version") != self._index_version:
+                self._revalidate(manifest)
+            self._entries[self._next_key] = entry
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def stats(self) -> Dict:
+        """Entry count, hit rate and total latency saved"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "latency_saved_s": self._saved_s,
+                "index_version": self._index_version,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def _revalidate(self, manifest: Dict) -> None:
+        """Drop entries whose sources were changed or removed by re-ingestion"""
+        index_sources = manifest.get("sources", {})
+        for key in list(self._entries.keys()):
+            entry = self._entries[key]
+            if all(index_sources.get(source) == digest for source, digest in entry.sources.items()):
+                entry.index_version = manifest.get("version")
+            else:
+                del self._entries[key]
+        self._matrix = None
+        self._index_version = manifest.get("version")
+
+    def _remove(self, key) -> None:
+        del self._entries[key]
+        self._matrix = None
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+answer_cache = SemanticAnswerCache()
@@ -1,6 +1,18 @@
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 from crewai import Crew, Task, Process
+from langchain_core.documents import Document
+from knowledge_base.manifest import load_manifest
+from knowledge_base.retriever import KnowledgeRetriever, get_retriever
 from .agents import ChatOpsAgents
 from .intent_classifier import IntentClassifier, Intent
+from .data_fast_path import DataFastPath
+from .speculation import Speculation
+from .answer_cache import answer_cache
+from .admission import admission, request_key
+from .perf import perf
+from config.settings import settings
+from config.tracing import span, open_span, traced, current_span
 
 class ChatOpsCrew:
     def __init__(self):
@@ -9,6 +21,12 @@ class ChatOpsCrew:
         self.data_agent = agents.data_analyst_agent()
         self.responder_agent = agents.responder_agent()
         self.intent_classifier = IntentClassifier()
+        self.data_fast_path = DataFastPath()
+        self.streaming_llm = agents.streaming_llm()
+        # Timings of the most recent stream() call (seconds)
+        self.last_timings = {}
+        # Intent the most recent request was routed to
+        self.last_intent = None
 
     def run(self, user_question: str, chat_history: str = ""):
         """
@@ -23,6 +41,29 @@ class ChatOpsCrew:
         """
         return self.run_with_routing(user_question, chat_history)
 
+    async def arun(self, user_question: str, chat_history: str = ""):
+        """
+        Async entry point with admission control.
+
+        Runs run_with_routing on the shared ChatOps worker pool. Identical
+        concurrent requests (same question and history) share one execution.
+
+        Args:
+            user_question: User's query
+            chat_history: Optional conversation history
+
+        Returns:
+            Agent response
+
+        Raises:
+            OverloadedError: If the request was shed by admission control
+        """
+        return await admission.run(
+            lambda: self.run_with_routing(user_question, chat_history),
+            key=request_key(user_question, chat_history)
+        )
+
+    @traced("chatops.request")
     def run_with_routing(self, user_question: str, chat_history: str = ""):
         """
         Main entry point with smart routing.
@@ -34,24 +75,274 @@ class ChatOpsCrew:
         Returns:
             Agent response
         """
-        # Step 1: Classify intent
-        intent = self._classify_intent(user_question, chat_history)
+        started = time.perf_counter()
+
+        # Step 1: Classify intent (speculative prefetch runs meanwhile)
+        intent, knowledge, status = self._classify_with_speculation(user_question, chat_history)
 
         # Step 2: Route to appropriate flow
         if intent == Intent.KNOWLEDGE:
-            return self._knowledge_only_flow(user_question, chat_history)
+            result = self._knowledge_only_flow(user_question, chat_history, knowledge=knowledge)
         elif intent == Intent.DATA:
-            return self._data_only_flow(user_question, chat_history)
+            result = self._data_only_flow(user_question, chat_history, prefetched_status=status)
         elif intent == Intent.GENERAL:
-            return self._general_flow(user_question, chat_history)
+            result = self._general_flow(user_question, chat_history)
         else:  # HYBRID or fallback
-            return self._hybrid_flow(user_question, chat_history)
+            result = self._hybrid_flow(user_question, chat_history, knowledge=knowledge)
+
+        perf.observe("chatops.total_latency_s", time.perf_counter() - started)
+        return result
+
+    def stream(self, user_question: str, chat_history: str = "") -> Iterator[str]:
+        """
+        Streaming entry point with smart routing.
+
+        Runs the retrieval/data stages of the routed flow as a crew, then
+        streams the responder stage token by token. Time-to-first-token and
+        total latency are recorded in ``self.last_timings`` and in the
+        process-wide perf counters once the stream is exhausted.
+
+        Args:
+            user_question: User's query
+            chat_history: Optional conversation history
+
+        Yields:
+            Response text chunks as they arrive from the LLM
+        """
+        # No span may be current across a yield: the request span is
+        # activated for each step instead
+        with open_span("chatops.request", streaming=True) as request:
+            with request.activate():
+                started = time.perf_counter()
+                self.last_timings = {}
+                answer, embedding, prompt = None, None, None
+
+                intent, knowledge, status = self._classify_with_speculation(user_question, chat_history)
+
+                if intent == Intent.DATA:
+                    answer = self._data_fast_path_answer(user_question, prefetched_status=status)
+
+                if intent == Intent.KNOWLEDGE:
+                    answer, embedding = self._answer_cache_lookup(user_question, chat_history)
+                    if answer is None and embedding is not None and knowledge is None:
+                        knowledge = get_retriever().search_by_vector(embedding)
+
+                if answer is None:
+                    tasks = self._tasks_for_intent(intent, user_question, chat_history, knowledge=knowledge)
+                    *context_tasks, task_respond = tasks
+
+                    context = ""
+                    if context_tasks:
+                        self._kickoff(context_tasks)
+                        context = "\n\n".join(
+                            f"Output of {task.agent.role}:\n{task.output.raw}" for task in context_tasks
+                        )
+                    prompt = self._responder_prompt(task_respond, context)
+
+            if answer is not None:
+                self._record_complete_answer(started)
+                yield answer
+                return
+
+            first_token_at = None
+            streamed = []
+            with open_span("responder.stream", parent=request):
+                for chunk in self.streaming_llm.stream(prompt):
+                    text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                    if not text:
+                        continue
+                    streamed.append(text)
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        self.last_timings["ttft_s"] = first_token_at - started
+                        perf.observe("chatops.ttft_s", self.last_timings["ttft_s"])
+                    yield text
+
+            with request.activate():
+                self.last_timings["total_s"] = time.perf_counter() - started
+                perf.observe("chatops.total_latency_s", self.last_timings["total_s"])
+
+                if intent == Intent.KNOWLEDGE:
+                    self._answer_cache_store(user_question, embedding, "".join(streamed), knowledge, self.last_timings["total_s"])
+
+    def _record_complete_answer(self, started: float):
+        """Timings for an answer available in full at once (fast path, cache hit)"""
+        self.last_timings["ttft_s"] = self.last_timings["total_s"] = time.perf_counter() - started
+        perf.observe("chatops.ttft_s", self.last_timings["ttft_s"])
+        perf.observe("chatops.total_latency_s", self.last_timings["total_s"])
 
     def _classify_intent(self, query: str, chat_history: str) -> Intent:
         """Classify query intent"""
         return self.intent_classifier.classify(query, chat_history)
 
-    def _knowledge_only_flow(self, user_question: str, chat_history: str):
+    def _classify_with_speculation(self, query: str, chat_history: str) -> Tuple[Intent, Optional[List[Document]], Optional[Dict]]:
+        """
+        Classify intent while knowledge search / status prefetch run speculatively.
+
+        Speculation only starts when the classifier has to fall back to the
+        LLM; keyword routing is instant and gains nothing from it.
+
+        Args:
+            query: User's query
+            chat_history: Optional conversation history
+
+        Returns:
+            (intent, prefetched knowledge documents or None, prefetched status or None)
+        """
+        speculation = None
+        if settings.USE_SPECULATIVE_RETRIEVAL and self.intent_classifier.needs_llm(query):
+            speculation = Speculation(query, prefetch_status=settings.SPECULATIVE_STATUS_PREFETCH)
+
+        intent = self._classify_intent(query, chat_history)
+        self.last_intent = intent
+        current_span().set(intent=intent.value, speculated=speculation is not None)
+
+        knowledge = status = None
+        if speculation is not None:
+            if intent in (Intent.KNOWLEDGE, Intent.HYBRID):
+                knowledge = speculation.knowledge()
+            elif intent == Intent.DATA:
+                status = speculation.system_status()
+            speculation.discard()
+        return intent, knowledge, status
+
+    def _tasks_for_intent(self, intent: Intent, user_question: str, chat_history: str,
+                          knowledge: Optional[List[Document]] = None) -> List[Task]:
+        """Task list of the flow an intent routes to (responder task last)"""
+        if intent == Intent.KNOWLEDGE:
+            return self._knowledge_only_tasks(user_question, chat_history, knowledge=knowledge)
+        elif intent == Intent.DATA:
+            return self._data_only_tasks(user_question, chat_history)
+        elif intent == Intent.GENERAL:
+            return self._general_tasks(user_question, chat_history)
+        else:  # HYBRID or fallback
+            return self._hybrid_tasks(user_question, chat_history, knowledge=knowledge)
+
+    def _kickoff(self, tasks: List[Task], verbose: bool = True):
+        """Run tasks sequentially as a crew of their agents"""
+        agents = []
+        for task in tasks:
+            if task.agent not in agents:
+                agents.append(task.agent)
+
+        crew = Crew(
+            agents=agents,
+            tasks=tasks,
+            verbose=verbose,
+            process=Process.sequential
+        )
+        with span("crew.kickoff", agents=[agent.role for agent in agents]):
+            return crew.kickoff()
+
+    def _responder_prompt(self, task: Task, context: str) -> str:
+        """Render a responder task as a single prompt for direct streaming"""
+        agent = task.agent
+        return f"""You are {agent.role}. {agent.backstory}
+Your personal goal is: {agent.goal}
+
+Current Task: {task.description}
+
+This is the expected criteria for your final answer: {task.expected_output}
+
+This is the context you're working with:
+{context if context else "(No additional context)"}
+
+Respond directly with your final answer."""
+
+    def _knowledge_only_flow(self, user_question: str, chat_history: str, knowledge: Optional[List[Document]] = None):
+        """Knowledge-only flow: skips data agent entirely, answers from the semantic cache when possible"""
+        started = time.perf_counter()
+
+        answer, embedding = self._answer_cache_lookup(user_question, chat_history)
+        if answer is not None:
+            return answer
+
+        if embedding is not None and knowledge is None:
+            # Retrieve here (not via the agent tool) so the answer's sources are known
+            knowledge = get_retriever().search_by_vector(embedding)
+
+        result = self._kickoff(self._knowledge_only_tasks(user_question, chat_history, knowledge=knowledge))
+        self._answer_cache_store(user_question, embedding, str(result), knowledge, time.perf_counter() - started)
+        return result
+
+    def _answer_cache_lookup(self, user_question: str, chat_history: str = ""):
+        """
+        Look up a cached knowledge answer
+
+        Args:
+            user_question: Current question
+            chat_history: Conversation history; answers built with history depend on it
+                (follow-ups like "what about the second one?"), so they are neither
+                served from nor stored in the cache
+
+        Returns:
+            (cached answer or None, query embedding or None if caching is off/unavailable)
+        """
+        if not settings.USE_ANSWER_CACHE or chat_history.strip():
+            return None, None
+
+        started = time.perf_counter()
+        try:
+            with span("answer_cache.embed_query"):
+                embedding = get_retriever().embed_query(user_question)
+        except Exception:
+            return None, None
+
+        with span("answer_cache.lookup") as lookup_span:
+            entry = answer_cache.lookup(embedding, load_manifest())
+            lookup_span.set(hit=entry is not None)
+        if entry is None:
+            return None, embedding
+
+        perf.observe("answer_cache.saved_s", max(0.0, entry.compute_s - (time.perf_counter() - started)))
+        return entry.answer, embedding
+
+    def _answer_cache_store(self, user_question: str, embedding, answer: str,
+                            knowledge: Optional[List[Document]], compute_s: float):
+        """Cache a knowledge answer together with the sources it was built from"""
+        if embedding is None or not knowledge:
+            return
+        sources = sorted({doc.metadata.get('source', 'Unknown Source') for doc in knowledge})
+        answer_cache.store(user_question, embedding, answer, sources, load_manifest(), compute_s)
+
+    def _data_only_flow(self, user_question: str, chat_history: str, prefetched_status: Optional[Dict] = None):
+        """Data-only flow: tries the deterministic fast path, then the data agent"""
+        answer = self._data_fast_path_answer(user_question, prefetched_status=prefetched_status)
+        if answer is not None:
+            return answer
+
+        started = time.perf_counter()
+        result = self._kickoff(self._data_only_tasks(user_question, chat_history))
+        perf.observe("data_flow.agent_s", time.perf_counter() - started)
+        return result
+
+    def _data_fast_path_answer(self, user_question: str, prefetched_status: Optional[Dict] = None):
+        """Answer from direct tool calls, or None to fall back to the agent"""
+        if not settings.USE_DATA_FAST_PATH:
+            return None
+
+        started = time.perf_counter()
+        with span("data.fast_path") as fast_path_span:
+            answer = self.data_fast_path.answer(user_question, prefetched_status=prefetched_status)
+            fast_path_span.set(hit=answer is not None)
+        if answer is None:
+            perf.incr("data_fast_path.fallbacks")
+            return None
+
+        perf.incr("data_fast_path.hits")
+        perf.observe("data_flow.fast_path_s", time.perf_counter() - started)
+        return answer
+
+    def _general_flow(self, user_question: str, chat_history: str):
+        """General flow: responder only, less verbose for simple queries"""
+        return self._kickoff(self._general_tasks(user_question, chat_history), verbose=False)
+
+    def _hybrid_flow(self, user_question: str, chat_history: str, knowledge: Optional[List[Document]] = None):
+        """Full hybrid flow using all three agents"""
+        return self._kickoff(self._hybrid_tasks(user_question, chat_history, knowledge=knowledge))
+
+    def _knowledge_only_tasks(self, user_question: str, chat_history: str,
+                              knowledge: Optional[List[Document]] = None) -> List[Task]:
         """
         Optimized flow for knowledge-only queries.
         Skips data agent entirely.
@@ -59,10 +350,15 @@ class ChatOpsCrew:
         Args:
             user_question: User's query
             chat_history: Optional conversation history
+            knowledge: Optional knowledge base results retrieved ahead of time;
+                replaces the knowledge agent's search task
 
         Returns:
-            Agent response
+            Tasks ending with the responder task
         """
+        if knowledge:
+            return [self._synthesize_from_knowledge_task(user_question, chat_history, knowledge)]
+
         task_retrieve_knowledge = Task(
             description=f"Search the knowledge base for information to answer this question: {user_question}",
             agent=self.knowledge_agent,
@@ -84,17 +380,29 @@ class ChatOpsCrew:
             expected_output="A final natural language response to the user with clear source citations."
         )
 
-        crew = Crew(
-            agents=[self.knowledge_agent, self.responder_agent],
-            tasks=[task_retrieve_knowledge, task_synthesize],
-            verbose=True,
-            process=Process.sequential
-        )
+        return [task_retrieve_knowledge, task_synthesize]
 
-        result = crew.kickoff()
-        return result
+    def _synthesize_from_knowledge_task(self, user_question: str, chat_history: str, knowledge: List[Document]) -> Task:
+        """Responder task answering from knowledge base results already retrieved"""
+        knowledge_results = "\n\n".join(KnowledgeRetriever.format_results(knowledge))
+        return Task(
+            description=f"""Answer the user's question: '{user_question}' using the knowledge base information below.
+
+            Knowledge Base search results:
+            {knowledge_results}
+
+            Context from previous conversation:
+            {chat_history}
+
+            Instructions:
+            1. Use ONLY the information from the Knowledge Base search results.
+            2. You MUST cite the source (e.g., 'According to [Source Name]...').
+            3. Provide a clear, helpful response.""",
+            agent=self.responder_agent,
+            expected_output="A final natural language response to the user with clear source citations."
+        )
 
-    def _data_only_flow(self, user_question: str, chat_history: str):
+    def _data_only_tasks(self, user_question: str, chat_history: str) -> List[Task]:
         """
         Optimized flow for data-only queries.
         Skips knowledge base search.
@@ -104,10 +412,10 @@ class ChatOpsCrew:
             chat_history: Optional conversation history
 
         Returns:
-            Agent response
+            Tasks ending with the responder task
         """
         task_fetch_data = Task(
-            description=f"Fetch real-time data for: '{user_question}'. Query the appropriate tools to get current metrics or status.",
+            description=f"Fetch real-time data for: '{user_question}'. Query the appropriate tools to get current metrics or status; if more than one metric is needed, fetch them in a single Get Metrics Batch call.",
             agent=self.data_agent,
             expected_output="JSON data of requested metrics."
         )
@@ -127,17 +435,9 @@ class ChatOpsCrew:
             expected_output="A final natural language response to the user with clear data attribution."
         )
 
-        crew = Crew(
-            agents=[self.data_agent, self.responder_agent],
-            tasks=[task_fetch_data, task_synthesize],
-            verbose=True,
-            process=Process.sequential
-        )
+        return [task_fetch_data, task_synthesize]
 
-        result = crew.kickoff()
-        return result
-
-    def _general_flow(self, user_question: str, chat_history: str):
+    def _general_tasks(self, user_question: str, chat_history: str) -> List[Task]:
         """
         Optimized flow for general queries.
         Uses only responder agent (no tool calls).
@@ -147,7 +447,7 @@ class ChatOpsCrew:
             chat_history: Optional conversation history
 
         Returns:
-            Agent response
+            Tasks ending with the responder task
         """
         task_respond = Task(
             description=f"""Provide a helpful response to the user's question: '{user_question}'
@@ -163,17 +463,10 @@ class ChatOpsCrew:
             expected_output="A helpful natural language response to the user."
         )
 
-        crew = Crew(
-            agents=[self.responder_agent],
-            tasks=[task_respond],
-            verbose=False,  # Less verbose for simple queries
-            process=Process.sequential
-        )
+        return [task_respond]
 
-        result = crew.kickoff()
-        return result
-
-    def _hybrid_flow(self, user_question: str, chat_history: str):
+    def _hybrid_tasks(self, user_question: str, chat_history: str,
+                      knowledge: Optional[List[Document]] = None) -> List[Task]:
         """
         Full hybrid flow for complex queries.
         Uses all three agents (original behavior).
@@ -181,9 +474,11 @@ class ChatOpsCrew:
         Args:
             user_question: User's query
             chat_history: Optional conversation history
+            knowledge: Optional knowledge base results retrieved ahead of time;
+                replaces the knowledge agent's search task
 
         Returns:
-            Agent response
+            Tasks ending with the responder task
         """
         # Define Tasks
 
@@ -196,14 +491,20 @@ class ChatOpsCrew:
             expected_output="Relevant text chunks from documentation with their sources, or a statement that no info was found."
         )
 
+        # Prefetched search results stand in for the Knowledge Specialist's output
+        prefetched_knowledge = ""
+        if knowledge:
+            prefetched_knowledge = "\n\n            Knowledge Specialist output (knowledge base search results):\n" + \
+                "\n\n".join(KnowledgeRetriever.format_results(knowledge))
+
         task_fetch_data = Task(
-            description=f"Check if the question '{user_question}' requires real-time data (metrics, status, volume). If so, query the appropriate tools. If the question is static or does not require real-time data, DO NOT call any tools and simply return 'No data needed'.",
+            description=f"Check if the question '{user_question}' requires real-time data (metrics, status, volume). If so, query the appropriate tools (a single Get Metrics Batch call when more than one metric is needed). If the question is static or does not require real-time data, DO NOT call any tools and simply return 'No data needed'.",
             agent=self.data_agent,
             expected_output="JSON data of requested metrics or a statement that no data was needed."
         )
 
         task_synthesize = Task(
-            description=f"""Combine the information provided by the Knowledge Specialist and Data Analyst to answer the user's question: '{user_question}'.
+            description=f"""Combine the information provided by the Knowledge Specialist and Data Analyst to answer the user's question: '{user_question}'.{prefetched_knowledge}
 
             Context from previous conversation:
             {chat_history}
@@ -216,16 +517,10 @@ class ChatOpsCrew:
             5. If you used information from the Knowledge Base, you MUST cite the source (e.g., 'According to [Source Name]...').
             6. If the information comes from real-time data, mention that it is live system data.""",
             agent=self.responder_agent,
-            context=[task_retrieve_knowledge, task_fetch_data],
+            context=[task_fetch_data] if knowledge else [task_retrieve_knowledge, task_fetch_data],
             expected_output="A final natural language response to the user with clear source citations where applicable."
         )
 
-        crew = Crew(
-            agents=[self.knowledge_agent, self.data_agent, self.responder_agent],
-            tasks=[task_retrieve_knowledge, task_fetch_data, task_synthesize],
-            verbose=True,
-            process=Process.sequential
-        )
-
-        result = crew.kickoff()
-        return result
+        if knowledge:
+            return [task_fetch_data, task_synthesize]
+        return [task_retrieve_knowledge, task_fetch_data, task_synthesize]
@@ -0,0 +1,173 @@
+"""
+Deterministic Fast Path for DATA-intent Queries
+
+Maps recognized data queries straight to dynamic data tool calls:
+1. Keyword/regex matching selects the tools and extracts their arguments
+   (component, time_range)
+2. The selected tools run concurrently
+3. The answer is rendered from a template (no LLM call)
+
+Queries that cannot be fully mapped (including ones naming more than one
+component) return None so the caller can fall back to the agent flow.
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .tools.dynamic_data import (
+    COMPONENTS, get_trade_volume, get_system_status, get_match_count
+)
+
+# Shared by all crews; tool calls are small and I/O bound
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="data-fast-path")
+
+
+class DataFastPath:
+    """Rule-based planner and executor for simple live-data questions"""
+
+    STATUS_KEYWORDS = ["status", "health", "healthy", "degraded", "down", "up and running", "running", "alive"]
+    VOLUME_KEYWORDS = ["trade volume", "trading volume", "volume", "traded"]
+    MATCH_COUNT_KEYWORDS = ["match count", "matched orders", "matched", "matches"]
+
+    # Anything asking for reasoning or metrics without a tool goes to the agent
+    UNSUPPORTED_KEYWORDS = [
+        "why", "compare", "trend", "predict", "forecast", "explain", "should",
+        "latency", "cpu", "memory", "error rate", "throughput", "response time",
+        "capacity", "uptime", "how to", "how do i"
+    ]
+
+    COMPONENT_ALIASES = {
+        "order matching": "OrderMatching",
+        "ordermatching": "OrderMatching",
+        "matching engine": "OrderMatching",
+        "gateway": "Gateway",
+        "risk engine": "RiskEngine",
+        "riskengine": "RiskEngine",
+    }
+
+    TIME_RANGE_PATTERNS = [
+        (re.compile(r"\b(last|past|previous)\s+(1\s+)?hour\b"), "last_hour"),
+        (re.compile(r"\b(last|past)\s+24\s*(h|hours)\b"), "last_24h"),
+        (re.compile(r"\byesterday\b"), "yesterday"),
+        (re.compile(r"\bthis\s+week\b"), "this_week"),
+        (re.compile(r"\btoday\b"), "today"),
+    ]
+
+    def plan(self, query: str) -> Optional[List[Tuple[str, Dict]]]:
+        """
+        Map a query to tool calls
+
+        Args:
+            query: User query string
+
+        Returns:
+            List of (tool key, kwargs) or None if the query is not recognized
+        """
+        query_lower = query.lower()
+
+        if any(kw in query_lower for kw in self.UNSUPPORTED_KEYWORDS):
+            return None
+
+        calls = []
+        if any(kw in query_lower for kw in self.VOLUME_KEYWORDS):
+            calls.append(("trade_volume", {"time_range": self._extract_time_range(query_lower)}))
+        if any(kw in query_lower for kw in self.MATCH_COUNT_KEYWORDS):
+            calls.append(("match_count", {}))
+
+        components = self._extract_components(query_lower)
+        if len(components) > 1:
+            # Ambiguous for a template answer: let the agent decide what was asked
+            return None
+        if any(kw in query_lower for kw in self.STATUS_KEYWORDS) or (components and not calls):
+            # The named component, or the overall status from one "all" call
+            calls.append(("system_status", {"component": components[0] if components else "all"}))
+
+        return calls or None
+
+    def execute(self, calls: List[Tuple[str, Dict]]) -> Dict[str, Dict]:
+        """
+        Run planned tool calls concurrently
+
+        Args:
+            calls: Output of plan()
+
+        Returns:
+            Mapping of tool key to decoded JSON result
+        """
+        tools = {
+            "trade_volume": get_trade_volume,
+            "system_status": get_system_status,
+            "match_count": get_match_count,
+        }
+        futures = {key: _executor.submit(tools[key].run, **kwargs) for key, kwargs in calls}
+        return {key: json.loads(future.result()) for key, future in futures.items()}
+
+    def answer(self, query: str, prefetched_status: Optional[Dict] = None) -> Optional[str]:
+        """
+        Answer a data query without the agent loop
+
+        Args:
+            query: User query string
+            prefetched_status: Optional status of all components fetched ahead of time
+
+        Returns:
+            Formatted answer or None if the query should go to the agent flow
+        """
+        calls = self.plan(query)
+        if calls is None:
+            return None
+
+        results = {}
+        if prefetched_status is not None:
+            # A per-component status query is answered from the "all" result
+            results["system_status"] = prefetched_status
+        pending = [(key, kwargs) for key, kwargs in calls if key not in results]
+        results.update(self.execute(pending))
+        return self.format(calls, results)
+
+    def format(self, calls: List[Tuple[str, Dict]], results: Dict[str, Dict]) -> str:
+        """Render tool results with the answer template"""
+        lines = ["Here is the live system data:", ""]
+
+        for key, kwargs in calls:
+            result = results[key]
+            if "error" in result or result.get("value", 0) is None:
+                lines.append(f"**{key.replace('_', ' ').capitalize()}**: unavailable ({result.get('error', 'no data')})")
+                lines.append("")
+                continue
+            if key == "system_status":
+                component = kwargs.get("component", "all")
+                statuses = result["status"]
+                if component != "all":
+                    statuses = {component: statuses.get(component, "Unknown")}
+                lines.append("**System status**")
+                for name, status in statuses.items():
+                    lines.append(f"- {name}: {status}")
+            elif key == "trade_volume":
+                time_range = result.get("time_range", kwargs.get("time_range")).replace("_", " ")
+                lines.append(f"**Trade volume** ({time_range}): {result['value']:,} {result.get('unit', '')}".rstrip())
+            elif key == "match_count":
+                lines.append(f"**Matched orders today**: {result['value']:,}")
+            lines.append("")
+
+        # Tool results may come from the tool cache; say how old the data is
+        age = max((r.get("cache_age_s", 0) for r in results.values()), default=0)
+        lines.append(f"_Source: live system data (as of {age:.0f}s ago)._" if age >= 1 else "_Source: live system data._")
+        return "\n".join(lines)
+
+    def _extract_components(self, query_lower: str) -> List[str]:
+        found = []
+        for alias, component in self.COMPONENT_ALIASES.items():
+            if alias in query_lower and component not in found:
+                found.append(component)
+        for component in COMPONENTS:
+            if component.lower() in query_lower and component not in found:
+                found.append(component)
+        return found
+
+    def _extract_time_range(self, query_lower: str) -> str:
+        for pattern, time_range in self.TIME_RANGE_PATTERNS:
+            if pattern.search(query_lower):
+                return time_range
+        return "today"
@@ -0,0 +1,53 @@
+"""
+Data-Source Adapters for the Dynamic Data Tools
+
+Backends are configured in settings (DATASOURCE_*). When a backend URL is
+not set, the matching getter returns None and the tools keep using their
+built-in data (the local time-series store / mock status).
+"""
+
+import threading
+from typing import Optional
+from config.settings import settings
+from .base import CircuitBreaker, CircuitOpenError, DataSource, DataSourceError
+from .loop import get_loop, run_async, run_sync
+from .prometheus import PrometheusSource
+from .rest_status import RestStatusSource
+
+_sources = {}
+_lock = threading.Lock()
+
+
+def get_prometheus_source() -> Optional[PrometheusSource]:
+    """Shared metrics backend, or None if DATASOURCE_PROMETHEUS_URL is unset"""
+    if not settings.DATASOURCE_PROMETHEUS_URL:
+        return None
+    with _lock:
+        if "prometheus" not in _sources:
+            _sources["prometheus"] = PrometheusSource("prometheus", settings.DATASOURCE_PROMETHEUS_URL)
+        return _sources["prometheus"]
+
+
+def get_status_source() -> Optional[RestStatusSource]:
+    """Shared status backend, or None if DATASOURCE_STATUS_URL is unset"""
+    if not settings.DATASOURCE_STATUS_URL:
+        return None
+    with _lock:
+        if "status" not in _sources:
+            _sources["status"] = RestStatusSource("status", settings.DATASOURCE_STATUS_URL,
+                                                  path=settings.DATASOURCE_STATUS_PATH)
+        return _sources["status"]
+
+
+def datasource_stats():
+    """Circuit state of the configured backends"""
+    with _lock:
+        return [source.stats() for source in _sources.values()]
+
+
+__all__ = [
+    "CircuitBreaker", "CircuitOpenError", "DataSource", "DataSourceError",
+    "PrometheusSource", "RestStatusSource",
+    "get_loop", "run_async", "run_sync",
+    "get_prometheus_source", "get_status_source", "datasource_stats",
+]
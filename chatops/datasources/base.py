@@ -0,0 +1,183 @@
+"""
+Base Data-Source Adapter
+
+Every backend adapter gets:
+1. A pooled httpx.AsyncClient (keep-alive connections reused across calls)
+2. Bounded concurrency (a semaphore per backend)
+3. A total per-call deadline (queueing + request)
+4. A circuit breaker that fails fast while the backend is down
+
+All adapters live on one background event loop (see loop.py), so
+semaphores and clients are bound to a single loop no matter which thread
+or loop the caller runs in.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+import httpx
+from config.settings import settings
+from ..perf import perf
+
+
+class DataSourceError(RuntimeError):
+    """Raised when a backend call fails or times out"""
+
+
+class CircuitOpenError(DataSourceError):
+    """Raised without calling the backend while its circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed -> open after failure_threshold consecutive failures;
+    open -> half_open after reset_timeout_s, letting one trial call through;
+    half_open -> closed on success, back to open on failure.
+    """
+
+    def __init__(self, failure_threshold: int = None, reset_timeout_s: float = None):
+        self.failure_threshold = failure_threshold or settings.DATASOURCE_BREAKER_FAILURES
+        self.reset_timeout_s = reset_timeout_s or settings.DATASOURCE_BREAKER_RESET_S
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now"""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class DataSource:
+    """HTTP/JSON backend adapter with pooling, concurrency limit, deadline and breaker"""
+
+    def __init__(self, name: str, base_url: str, max_concurrency: int = None, timeout_s: float = None,
+                 breaker: Optional[CircuitBreaker] = None, headers: Optional[Dict] = None):
+        """
+        Initialize DataSource
+
+        Args:
+            name: Backend name (used in errors and perf counters)
+            base_url: Backend base URL
+            max_concurrency: Maximum in-flight calls to this backend
+            timeout_s: Total deadline per call, including waiting for a slot
+            breaker: Circuit breaker (a new one per source by default)
+            headers: Extra headers sent with every request (e.g. auth)
+        """
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency or settings.DATASOURCE_MAX_CONCURRENCY
+        self.timeout_s = timeout_s or settings.DATASOURCE_TIMEOUT_S
+        self.breaker = breaker or CircuitBreaker()
+        self.headers = headers or {}
+        # Created on first use inside the data-source loop
+        self._client = None
+        self._semaphore = None
+
+    def _ensure_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.timeout_s),
+                limits=httpx.Limits(
+                    max_connections=settings.DATASOURCE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.DATASOURCE_MAX_CONNECTIONS
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def get_json(self, path: str, params: Optional[Dict] = None):
+        """
+        GET a JSON document from the backend
+
+        Args:
+            path: Path relative to base_url
+            params: Optional query parameters
+
+        Returns:
+            Decoded JSON
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            DataSourceError: On HTTP errors, invalid JSON or timeout
+        """
+        if not self.breaker.allow():
+            perf.incr(f"datasource.{self.name}.short_circuited")
+            raise CircuitOpenError(f"{self.name}: circuit open, backend recently failing")
+
+        self._ensure_client()
+        started = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(self._request(path, params), self.timeout_s)
+        except asyncio.TimeoutError as e:
+            self._failed()
+            raise DataSourceError(f"{self.name}: timed out after {self.timeout_s:.1f}s") from e
+        except httpx.HTTPStatusError as e:
+            self._failed()
+            raise DataSourceError(f"{self.name}: HTTP {e.response.status_code} from {e.request.url.path}") from e
+        except (httpx.HTTPError, ValueError) as e:
+            self._failed()
+            raise DataSourceError(f"{self.name}: {type(e).__name__}: {e}") from e
+
+        self.breaker.record_success()
+        perf.observe(f"datasource.{self.name}.latency_s", time.perf_counter() - started)
+        return data
+
+    async def _request(self, path: str, params: Optional[Dict]):
+        async with self._semaphore:
+            response = await self._client.get(path, params=params)
+            response.raise_for_status()
+            return response.json()
+
+    def _failed(self):
+        self.breaker.record_failure()
+        perf.incr(f"datasource.{self.name}.failures")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "circuit": self.breaker.state,
+            "max_concurrency": self.max_concurrency,
+        }
@@ -0,0 +1,45 @@
+"""
+Background Event Loop for Data-Source Calls
+
+Tools run synchronously in CrewAI / Streamlit threads. Adapter coroutines
+are submitted to one long-lived loop in a daemon thread instead of spinning
+up a loop per call, which would discard pooled connections every time.
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Optional
+
+_loop = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The shared data-source loop (started on first use)"""
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="datasource-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None):
+    """
+    Run an adapter coroutine from synchronous code
+
+    Args:
+        coro: Coroutine to run on the data-source loop
+        timeout: Optional extra safety timeout in seconds (adapters enforce their own)
+
+    Returns:
+        Coroutine result (exceptions are re-raised in the caller)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+async def run_async(coro: Awaitable):
+    """Await an adapter coroutine from any other event loop"""
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_loop()))
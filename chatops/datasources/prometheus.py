@@ -0,0 +1,63 @@
+"""
+Prometheus-style Query API Adapter
+
+Instant queries against /api/v1/query (Prometheus, Thanos, VictoriaMetrics
+and other compatible backends).
+"""
+
+import math
+from typing import Dict, List, Optional
+from .base import DataSource, DataSourceError
+
+
+class PrometheusSource(DataSource):
+    """Adapter for the Prometheus HTTP query API"""
+
+    async def query(self, promql: str, at: Optional[float] = None) -> List[Dict]:
+        """
+        Run an instant query
+
+        Args:
+            promql: PromQL expression
+            at: Evaluation time (epoch seconds; defaults to now)
+
+        Returns:
+            List of {"labels": {...}, "value": float} samples
+
+        Raises:
+            DataSourceError: On backend errors, a non-vector result or a malformed payload
+        """
+        params = {"query": promql}
+        if at is not None:
+            params["time"] = f"{at:.3f}"
+        payload = await self.get_json("/api/v1/query", params)
+
+        try:
+            if payload.get("status") != "success":
+                raise DataSourceError(f"{self.name}: query failed: {payload.get('error', 'unknown error')}")
+            data = payload.get("data", {})
+            if data.get("resultType") == "scalar":
+                return [{"labels": {}, "value": float(data["result"][1])}]
+            if data.get("resultType") != "vector":
+                raise DataSourceError(f"{self.name}: expected a vector result, got {data.get('resultType')}")
+            return [{"labels": sample.get("metric", {}), "value": float(sample["value"][1])}
+                    for sample in data.get("result", [])]
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            raise DataSourceError(f"{self.name}: unrecognised query payload") from e
+
+    async def query_window(self, template: str, start: float, end: float) -> float:
+        """
+        Evaluate a windowed expression over [start, end)
+
+        Args:
+            template: PromQL with a "{window}" placeholder, e.g.
+                "sum(increase(trade_notional_usd_total[{window}]))"
+            start: Window start (epoch seconds)
+            end: Window end (epoch seconds)
+
+        Returns:
+            Sum of the returned samples (0.0 if the result is empty)
+        """
+        window = f"{max(1, math.ceil(end - start))}s"
+        samples = await self.query(template.format(window=window), at=end)
+        return sum(sample["value"] for sample in samples)
@@ -0,0 +1,51 @@
+"""
+Generic REST Status Endpoint Adapter
+
+Accepts the common shapes of a component health endpoint:
+- {"components": {"Gateway": "Healthy", ...}}
+- {"Gateway": "Healthy", ...}
+- [{"name": "Gateway", "status": "Healthy"}, ...] (optionally under "components")
+"""
+
+from typing import Dict
+from .base import DataSource, DataSourceError
+
+
+class RestStatusSource(DataSource):
+    """Adapter for a JSON component status endpoint"""
+
+    def __init__(self, name: str, base_url: str, path: str = "/status", **kwargs):
+        """
+        Initialize RestStatusSource
+
+        Args:
+            name: Backend name
+            base_url: Backend base URL
+            path: Status endpoint path
+            **kwargs: See DataSource
+        """
+        super().__init__(name, base_url, **kwargs)
+        self.path = path
+
+    async def fetch_statuses(self) -> Dict[str, str]:
+        """
+        Status of every component
+
+        Returns:
+            {component name: status}
+
+        Raises:
+            DataSourceError: On backend errors or an unrecognised payload
+        """
+        payload = await self.get_json(self.path)
+        if isinstance(payload, dict) and "components" in payload:
+            payload = payload["components"]
+
+        if isinstance(payload, list):
+            try:
+                return {str(item["name"]): str(item["status"]) for item in payload}
+            except (KeyError, TypeError) as e:
+                raise DataSourceError(f"{self.name}: unrecognised status payload") from e
+        if isinstance(payload, dict):
+            return {str(name): str(status) for name, status in payload.items()}
+        raise DataSourceError(f"{self.name}: unrecognised status payload")
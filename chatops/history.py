@@ -0,0 +1,134 @@
+"""
+Chat History Manager for ChatOps
+
+Builds a bounded history string for the agents:
+1. The last N turns are kept verbatim
+2. Older turns are folded into a rolling summary stored with the session
+
+The summary is updated incrementally: only messages that newly fall out of
+the verbatim window are sent to the LLM together with the previous summary,
+so it is never regenerated from scratch.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from config.settings import settings
+from config.llm import get_chat_model
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+class HistoryManager:
+    """Token-budgeted chat history with an incrementally updated summary"""
+
+    def __init__(self, token_budget: int = None, keep_last_turns: int = None, llm=None):
+        """
+        Initialize HistoryManager
+
+        Args:
+            token_budget: Maximum estimated tokens of the history string
+            keep_last_turns: Number of recent user/assistant turns kept verbatim
+            llm: Optional LLM instance used to update the summary
+        """
+        self.token_budget = token_budget or settings.HISTORY_TOKEN_BUDGET
+        self.keep_last_turns = keep_last_turns or settings.HISTORY_KEEP_TURNS
+        self._llm = llm
+
+    @property
+    def llm(self):
+        # Created lazily: short sessions never need a summary
+        if self._llm is None:
+            self._llm = self._create_llm()
+        return self._llm
+
+    def build(self, messages: List[Dict], summary: Optional[Dict] = None) -> Tuple[str, Dict]:
+        """
+        Build the history string for the next turn
+
+        Args:
+            messages: Prior messages of the session (oldest first)
+            summary: Summary state stored with the session
+                ({"text": str, "covered": number of messages folded in})
+
+        Returns:
+            (history string, updated summary state to store with the session)
+        """
+        summary = summary or {}
+        summary = {"text": summary.get("text") or "", "covered": int(summary.get("covered") or 0)}
+        if summary["covered"] > len(messages):
+            # Messages were removed/replaced: the old summary no longer applies
+            summary = {"text": "", "covered": 0}
+
+        # Verbatim window: last N turns, shrunk further until within budget
+        window_start = max(summary["covered"], len(messages) - 2 * self.keep_last_turns)
+        while window_start < len(messages) - 1:
+            verbatim_tokens = sum(estimate_tokens(self._format_message(m)) for m in messages[window_start:])
+            if verbatim_tokens + estimate_tokens(summary["text"]) <= self.token_budget:
+                break
+            window_start += 1
+
+        # Fold only the messages that newly left the window
+        if window_start > summary["covered"]:
+            summary = {
+                "text": self._fold(summary["text"], messages[summary["covered"]:window_start]),
+                "covered": window_start,
+            }
+
+        parts = []
+        if summary["text"]:
+            parts.append(f"Summary of earlier conversation:\n{summary['text']}")
+        verbatim = "\n".join(self._format_message(m) for m in messages[window_start:])
+        if verbatim:
+            parts.append(f"Recent messages:\n{verbatim}" if summary["text"] else verbatim)
+
+        return "\n\n".join(parts), summary
+
+    def _fold(self, previous_summary: str, new_messages: List[Dict]) -> str:
+        """
+        Fold messages into the running summary
+
+        Args:
+            previous_summary: Current summary text (may be empty)
+            new_messages: Messages leaving the verbatim window
+
+        Returns:
+            Updated summary text
+        """
+        transcript = "\n".join(self._format_message(m) for m in new_messages)
+        max_words = settings.HISTORY_SUMMARY_MAX_WORDS
+
+        prompt = f"""Update the running summary of an IT operations chat with the new messages below.
+
+Current summary:
+{previous_summary if previous_summary else "(empty)"}
+
+New messages:
+{transcript}
+
+Instructions:
+- Keep facts that matter for follow-up questions: components, incidents, IDs, error codes, decisions, open questions.
+- Drop greetings and repetition.
+- Respond with ONLY the updated summary, at most {max_words} words."""
+
+        try:
+            response = self.llm.invoke(prompt)
+            text = str(response.content).strip() if hasattr(response, 'content') else str(response).strip()
+            if text:
+                return text
+        except Exception:
+            pass
+
+        # Fallback without LLM: append clipped lines and keep the tail within budget
+        lines = [previous_summary] if previous_summary else []
+        lines += [self._format_message(m)[:200] for m in new_messages]
+        return "\n".join(lines)[-max_words * 8:]
+
+    @staticmethod
+    def _format_message(message: Dict) -> str:
+        return f"{message['role']}: {message['content']}"
+
+    def _create_llm(self):
+        """Create LLM instance for summarization"""
+        return get_chat_model(temperature=0)
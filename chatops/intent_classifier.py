@@ -8,9 +8,9 @@ Implements hybrid classification:
 
 from enum import Enum
 from typing import Optional
-from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
 from config.settings import settings
+from config.llm import get_chat_model
+from config.tracing import traced
 
 
 class Intent(Enum):
@@ -54,6 +54,7 @@ class IntentClassifier:
         """
         self.llm = llm or self._create_llm()
 
+    @traced("intent.classify")
     def classify(self, query: str, chat_history: str = "") -> Intent:
         """
         Classify query intent using hybrid approach
@@ -74,6 +75,18 @@ class IntentClassifier:
         # Step 2: Fall back to LLM classification for ambiguous queries
         return self._llm_classify(query, chat_history)
 
+    def needs_llm(self, query: str) -> bool:
+        """
+        Whether classify() will fall back to the (slow) LLM for this query
+
+        Args:
+            query: User query string
+
+        Returns:
+            True if keyword routing is disabled or not confident
+        """
+        return not settings.USE_KEYWORD_ROUTING or self._keyword_classify(query) is None
+
     def _keyword_classify(self, query: str) -> Optional[Intent]:
         """
         Fast keyword-based classification
@@ -113,6 +126,7 @@ class IntentClassifier:
         # Ambiguous - needs LLM classification
         return None
 
+    @traced("intent.llm_classify")
     def _llm_classify(self, query: str, chat_history: str = "") -> Intent:
         """
         LLM-based classification for ambiguous queries
@@ -166,15 +180,5 @@ IMPORTANT: Respond with ONLY the classification name (KNOWLEDGE, DATA, HYBRID, o
 
     def _create_llm(self):
         """Create LLM instance for classification"""
-        if settings.USE_LOCAL_LLM:
-            return ChatOllama(
-                model=settings.OLLAMA_MODEL_NAME,
-                base_url=settings.OLLAMA_BASE_URL,
-                temperature=0  # Low temperature for consistent classification
-            )
-        else:
-            return ChatOpenAI(
-                model=settings.OPENAI_MODEL_NAME,
-                api_key=settings.OPENAI_API_KEY,
-                temperature=0  # Low temperature for consistent classification
-            )
+        # Low temperature for consistent classification
+        return get_chat_model(temperature=0)
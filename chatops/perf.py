@@ -0,0 +1,97 @@
+"""
+Performance Counters for ChatOps
+
+Process-wide counters and latency samples shared by every ChatOpsCrew.
+Crews are recreated per chat message, so measurements live here instead of
+on the crew instance.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+
+class PerfCounters:
+    """Thread-safe counters and bounded latency sample windows"""
+
+    def __init__(self, max_samples: int = 1000):
+        """
+        Initialize PerfCounters
+
+        Args:
+            max_samples: Number of most recent samples kept per metric
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a sample (e.g. a latency in seconds)"""
+        with self._lock:
+            self._samples[name].append(value)
+
+    def count(self, name: str) -> float:
+        """Current value of a counter"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """
+        Percentile of the recorded samples
+
+        Args:
+            name: Metric name
+            q: Percentile in [0, 100]
+
+        Returns:
+            Percentile value or None if no samples were recorded
+        """
+        with self._lock:
+            values = sorted(self._samples.get(name, ()))
+        return percentile(values, q)
+
+    def snapshot(self) -> Dict:
+        """
+        Summary of all counters and samples
+
+        Returns:
+            {"counters": {name: value}, "latencies": {name: {count, mean, p50, p95}}}
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+
+        latencies = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            latencies[name] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+        return {"counters": counters, "latencies": latencies}
+
+    def reset(self) -> None:
+        """Drop all counters and samples"""
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
+
+
+def percentile(sorted_values, q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return None
+    rank = int(round(q / 100 * (len(sorted_values) - 1)))
+    return sorted_values[min(max(rank, 0), len(sorted_values) - 1)]
+
+
+perf = PerfCounters()
@@ -0,0 +1,41 @@
+"""
+Session Storage Backends
+
+- "jsonl": append-only JSONL log per session (default; reads legacy JSON files)
+- "json": one JSON file per session, rewritten on every update
+- "sqlite": SQLite database in WAL mode with indexed metadata
+
+ColdArchiveBackend (compressed segments) holds archived sessions.
+"""
+
+import os
+from .base import SessionBackend
+from .cold_archive import ColdArchiveBackend
+from .json_file import JsonFileBackend
+from .jsonl_log import AppendLogBackend
+from .sqlite import SqliteBackend
+
+BACKENDS = ("jsonl", "json", "sqlite")
+
+
+def create_backend(name: str, storage_path: str) -> SessionBackend:
+    """
+    Build a session backend
+
+    Args:
+        name: Backend name ("jsonl", "json" or "sqlite")
+        storage_path: Sessions directory (the SQLite database is stored in it)
+
+    Returns:
+        SessionBackend instance
+    """
+    if name == "jsonl":
+        return AppendLogBackend(storage_path)
+    if name == "json":
+        return JsonFileBackend(storage_path)
+    if name == "sqlite":
+        return SqliteBackend(os.path.join(storage_path, "sessions.db"))
+    raise ValueError(f"Unknown session backend: {name} (expected one of {', '.join(BACKENDS)})")
+
+
+__all__ = ["BACKENDS", "SessionBackend", "AppendLogBackend", "ColdArchiveBackend", "JsonFileBackend", "SqliteBackend", "create_backend"]
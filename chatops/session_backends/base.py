@@ -0,0 +1,123 @@
+"""
+Session Storage Backend Interface
+
+SessionManager owns the session lifecycle (ids, titles, timestamps) and
+delegates persistence to a backend. Backends store whole session dicts:
+    {"id", "title", "created_at", "last_updated", "messages", "summary"?}
+"""
+
+import abc
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+
+def message_digest(messages: List[Dict], digest=None):
+    """
+    Running hash of a message list
+
+    Backends that append only the new messages of a turn keep the digest of
+    what they stored and compare it with the digest of the same-length
+    prefix of the incoming list, so an edit anywhere before the end is
+    detected without reading the stored messages back.
+
+    Args:
+        messages: Messages to add, in order
+        digest: Hash to continue (default: a new one)
+
+    Returns:
+        The hashlib object (call hexdigest() for the value)
+    """
+    digest = digest or hashlib.blake2b(digest_size=16)
+    for message in messages:
+        digest.update(json.dumps(message, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest
+
+
+class SessionBackend(abc.ABC):
+    """Persistence interface used by SessionManager"""
+
+    @abc.abstractmethod
+    def create(self, session_data: Dict) -> bool:
+        """Store a new session"""
+
+    @abc.abstractmethod
+    def load(self, session_id: str) -> Optional[Dict]:
+        """Full session (with messages) or None if not found"""
+
+    def load_metadata(self, session_id: str) -> Optional[Dict]:
+        """{id, title, created_at, last_updated, message_count} or None if not found"""
+        session_data = self.load(session_id)
+        if session_data is None:
+            return None
+        return {
+            "id": session_data["id"],
+            "title": session_data["title"],
+            "created_at": session_data["created_at"],
+            "last_updated": session_data["last_updated"],
+            "message_count": len(session_data.get("messages", []))
+        }
+
+    def load_messages(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        A slice of a session's messages
+
+        The default implementation loads the whole session; backends
+        override it to read only the requested messages.
+
+        Args:
+            session_id: Session identifier
+            offset: Index of the first message
+            limit: Maximum number of messages (None for all)
+
+        Returns:
+            Messages in order, or None if the session does not exist
+        """
+        session_data = self.load(session_id)
+        if session_data is None:
+            return None
+        end = None if limit is None else offset + limit
+        return session_data.get("messages", [])[offset:end]
+
+    def update(self, session_id: str, messages: List[Dict], fields: Dict) -> bool:
+        """
+        Replace the messages of a session and update metadata fields
+
+        The default implementation rewrites the whole session; backends
+        override it to store only what changed (chat turns append).
+
+        Args:
+            session_id: Session identifier
+            messages: Full message list
+            fields: Metadata to update (last_updated, title, summary)
+
+        Returns:
+            True if successful, False if the session does not exist or the write failed
+        """
+        session_data = self.load(session_id)
+        if not session_data:
+            return False
+        session_data["messages"] = messages
+        session_data.update(fields)
+        return self.create(session_data)
+
+    @abc.abstractmethod
+    def list_metadata(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Metadata of sessions, most recently updated first
+
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return (None for all)
+
+        Returns:
+            List of {id, title, created_at, last_updated, message_count}
+        """
+
+    @abc.abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Delete a session; False if it does not exist"""
+
+    def close(self):
+        """Release resources (connections, threads)"""
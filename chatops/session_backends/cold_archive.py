@@ -0,0 +1,317 @@
+"""
+Compressed Cold Session Archive
+
+Archived sessions (idle or past the retention limit) are rarely reopened,
+so they are stored compactly instead of as one file each: every session is
+compressed into a record appended to a segment file (seg_000001.bin, ...,
+rolled at SEGMENT_MAX_BYTES). The metadata index (index.json/index.log in
+the archive directory) keeps each session's sidebar metadata plus the
+location of its record, so listing archived sessions and reopening one
+read neither the other records nor a directory of files.
+
+Compression uses zstd when the optional zstandard package is installed,
+otherwise zlib. Sessions are small and repetitive (the same JSON keys,
+roles and tool output), so both use a shared dictionary trained from the
+first DICT_SAMPLES archived sessions (dict_<n>.<codec>); records written
+before it exists are compressed without one. Each record names its codec
+and dictionary, so both can change without rewriting old records.
+
+Record layout: codec (1 byte), dictionary id (2), payload length (4),
+payload. Deleting or restoring a session appends a tombstone record (codec
+0, payload = session id) so a rebuild of the index from the segments does
+not bring it back; compact() rewrites segments that are mostly dead.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .base import SessionBackend
+from .index import INDEX_FILE, LOG_FILE, METADATA_KEYS, MetadataIndex, metadata_of
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib with a preset dictionary is used instead
+    zstandard = None
+
+SEGMENT_PREFIX = "seg_"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DICT_SAMPLES = 32
+DICT_SIZE = 32 * 1024  # zlib only uses the last 32 KB of a preset dictionary
+RECORD_HEADER = struct.Struct(">BHI")  # codec, dictionary id, payload length
+CODEC_TOMBSTONE, CODEC_ZLIB, CODEC_ZSTD = 0, 1, 2
+CODEC_NAMES = {CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+LOCATION_KEYS = ("segment", "offset", "length", "raw_size")
+
+
+class ColdArchiveBackend(SessionBackend):
+    """Sessions compressed into append-only segment files"""
+
+    def __init__(self, storage_path: str, codec: str = None):
+        """
+        Initialize ColdArchiveBackend
+
+        Args:
+            storage_path: Archive directory
+            codec: "zstd" or "zlib" (default: zstd if zstandard is installed)
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        codec = codec or ("zstd" if zstandard is not None else "zlib")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("codec 'zstd' requires the zstandard package")
+        self.codec = CODEC_ZSTD if codec == "zstd" else CODEC_ZLIB
+        self._lock = threading.RLock()
+        self._dicts: Dict[int, bytes] = {}
+        self._dict_id = 0
+        self._samples: List[bytes] = []
+        self._load_dictionaries()
+        if any(self.storage_path.glob("sess_*.json")):
+            # Plain JSON archive from an older version: its index has no record locations
+            for name in (INDEX_FILE, LOG_FILE):
+                (self.storage_path / name).unlink(missing_ok=True)
+        self.index = MetadataIndex.open(self.storage_path, self._scan_metadata, METADATA_KEYS + LOCATION_KEYS)
+        self._convert_plain_files()
+
+    # --- SessionBackend ---
+
+    def create(self, session_data: Dict) -> bool:
+        raw = json.dumps(session_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            with self._lock:
+                codec, dict_id, payload = self._compress(raw)
+                segment, offset = self._append(RECORD_HEADER.pack(codec, dict_id, len(payload)) + payload)
+                self.index.put(dict(
+                    metadata_of(session_data), segment=segment, offset=offset,
+                    length=RECORD_HEADER.size + len(payload), raw_size=len(raw)
+                ))
+                self._add_sample(raw)
+            return True
+        except (IOError, OSError, TypeError) as e:
+            print(f"Error archiving session {session_data.get('id')}: {e}")
+            return False
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        for attempt in range(2):
+            entry = self.index.get(session_id)
+            if entry is None:
+                return None
+            try:
+                with open(self.storage_path / entry["segment"], "rb") as f:
+                    f.seek(entry["offset"])
+                    record = f.read(entry["length"])
+            except FileNotFoundError:
+                continue  # moved by compact(): the index has the new location
+            except (IOError, OSError) as e:
+                print(f"Error reading archived session {session_id}: {e}")
+                return None
+            try:
+                codec, dict_id, length = RECORD_HEADER.unpack_from(record)
+                payload = record[RECORD_HEADER.size:RECORD_HEADER.size + length]
+                return json.loads(self._decompress(codec, dict_id, payload))
+            except (ValueError, struct.error, zlib.error) as e:
+                print(f"Unreadable archived session {session_id}: {e}")
+                return None
+        return None
+
+    def load_metadata(self, session_id: str) -> Optional[Dict]:
+        entry = self.index.get(session_id)
+        return {k: entry[k] for k in METADATA_KEYS} if entry else None
+
+    def list_metadata(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return [{k: entry[k] for k in METADATA_KEYS} for entry in self.index.sorted(offset, limit)]
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            entry = self.index.get(session_id)
+            if entry is None:
+                return False
+            tombstone = session_id.encode("utf-8")
+            try:
+                self._append(RECORD_HEADER.pack(CODEC_TOMBSTONE, 0, len(tombstone)) + tombstone)
+            except (IOError, OSError) as e:
+                print(f"Error deleting archived session {session_id}: {e}")
+                return False
+            self.index.remove(session_id)
+            return True
+
+    # --- reporting and maintenance ---
+
+    def stats(self) -> Dict:
+        """Disk footprint of the archive compared to uncompressed JSON"""
+        entries = self.index.sorted()
+        raw_bytes = sum(entry["raw_size"] for entry in entries)
+        live_bytes = sum(entry["length"] for entry in entries)
+        disk_bytes = sum(p.stat().st_size for p in self._segments())
+        disk_bytes += sum(p.stat().st_size for p in self.storage_path.glob("dict_*"))
+        return {
+            "sessions": len(entries),
+            "codec": CODEC_NAMES[self.codec],
+            "dictionary": self._dict_id != 0,
+            "raw_bytes": raw_bytes,
+            "disk_bytes": disk_bytes,
+            "dead_bytes": max(0, sum(p.stat().st_size for p in self._segments()) - live_bytes),
+            "saved_bytes": raw_bytes - disk_bytes,
+            "ratio": round(raw_bytes / disk_bytes, 2) if disk_bytes else None,
+        }
+
+    def compact(self, min_dead_fraction: float = 0.5) -> int:
+        """
+        Rewrite segments that are mostly deleted/restored records
+
+        Live records are copied verbatim (no recompression) to the newest
+        segment. A tombstone is carried forward only while it still shadows
+        something: not from the oldest segment, and not once its session was
+        archived again (the newer live record already wins on a rebuild, and
+        a tombstone appended after it would hide it).
+
+        Returns:
+            Number of segments removed
+        """
+        with self._lock:
+            segments = self._segments()
+            live = {}
+            for entry in self.index.sorted():
+                live.setdefault(entry["segment"], []).append(entry)
+            removed = 0
+            for position, path in enumerate(segments[:-1]):  # never the segment being appended to
+                entries = live.get(path.name, [])
+                size = path.stat().st_size
+                if size and 1 - sum(e["length"] for e in entries) / size < min_dead_fraction:
+                    continue
+                with open(path, "rb") as f:
+                    data = f.read()
+                for entry in entries:
+                    record = data[entry["offset"]:entry["offset"] + entry["length"]]
+                    segment, offset = self._append(record)
+                    self.index.put(dict(entry, segment=segment, offset=offset))
+                if position > 0:
+                    for record in self._iter_records(data):
+                        if record[0] == CODEC_TOMBSTONE and self.index.get(record[2].decode("utf-8")) is None:
+                            self._append(RECORD_HEADER.pack(*record[:2], len(record[2])) + record[2])
+                path.unlink()
+                removed += 1
+            return removed
+
+    # --- compression ---
+
+    def _compress(self, raw: bytes) -> Tuple[int, int, bytes]:
+        dictionary = self._dicts.get(self._dict_id)
+        if self.codec == CODEC_ZSTD:
+            kwargs = {"dict_data": zstandard.ZstdCompressionDict(dictionary)} if dictionary else {}
+            return CODEC_ZSTD, self._dict_id, zstandard.ZstdCompressor(level=10, **kwargs).compress(raw)
+        compressor = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+        return CODEC_ZLIB, self._dict_id, compressor.compress(raw) + compressor.flush()
+
+    def _decompress(self, codec: int, dict_id: int, payload: bytes) -> bytes:
+        dictionary = self._dicts.get(dict_id) if dict_id else None
+        if dict_id and dictionary is None:
+            raise ValueError(f"missing archive dictionary {dict_id}")
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise ValueError("record is zstd-compressed but zstandard is not installed")
+            kwargs = {"dict_data": zstandard.ZstdCompressionDict(dictionary)} if dictionary else {}
+            return zstandard.ZstdDecompressor(**kwargs).decompress(payload)
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(payload) + decompressor.flush()
+
+    def _add_sample(self, raw: bytes):
+        """Collect samples and train the shared dictionary once there are enough"""
+        if self._dict_id != 0:
+            return
+        self._samples.append(raw)
+        if len(self._samples) < DICT_SAMPLES:
+            return
+        if self.codec == CODEC_ZSTD:
+            dictionary = zstandard.train_dictionary(DICT_SIZE, self._samples).as_bytes()
+        else:
+            # zlib has no trainer: use the tail of the concatenated samples
+            # (zlib prefers matches close to the data, so recent content last)
+            dictionary = b"".join(self._samples)[-DICT_SIZE:]
+        dict_id = max(self._dicts, default=0) + 1
+        path = self.storage_path / f"dict_{dict_id}.{CODEC_NAMES[self.codec]}"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(dictionary)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._dicts[dict_id] = dictionary
+        self._dict_id = dict_id
+        self._samples = []
+
+    def _load_dictionaries(self):
+        for path in self.storage_path.glob("dict_*"):
+            if path.name.endswith(".tmp"):
+                continue
+            dict_id = int(path.name.split("_")[1].split(".")[0])
+            self._dicts[dict_id] = path.read_bytes()
+            if path.suffix == f".{CODEC_NAMES[self.codec]}":
+                self._dict_id = max(self._dict_id, dict_id)
+
+    # --- segments ---
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.storage_path.glob(f"{SEGMENT_PREFIX}*.bin"))
+
+    def _append(self, record: bytes) -> Tuple[str, int]:
+        """Append a record to the newest segment; returns (segment name, offset)"""
+        segments = self._segments()
+        path = segments[-1] if segments else None
+        if path is None or path.stat().st_size + len(record) > SEGMENT_MAX_BYTES:
+            number = int(path.stem[len(SEGMENT_PREFIX):]) + 1 if path else 1
+            path = self.storage_path / f"{SEGMENT_PREFIX}{number:06d}.bin"
+        with open(path, "ab") as f:
+            offset = f.tell()
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        return path.name, offset
+
+    @staticmethod
+    def _iter_records(data: bytes):
+        """(codec, dict_id, payload, offset, length) of each complete record"""
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            codec, dict_id, length = RECORD_HEADER.unpack_from(data, offset)
+            end = offset + RECORD_HEADER.size + length
+            if end > len(data):
+                break  # torn final record
+            yield codec, dict_id, data[offset + RECORD_HEADER.size:end], offset, end - offset
+            offset = end
+
+    def _scan_metadata(self) -> List[Dict]:
+        """Replay all segments (used to rebuild the index)"""
+        entries = {}
+        for path in self._segments():
+            with open(path, "rb") as f:
+                data = f.read()
+            for codec, dict_id, payload, offset, length in self._iter_records(data):
+                if codec == CODEC_TOMBSTONE:
+                    entries.pop(payload.decode("utf-8"), None)
+                    continue
+                try:
+                    raw = self._decompress(codec, dict_id, payload)
+                    session_data = json.loads(raw)
+                except (ValueError, zlib.error) as e:
+                    print(f"Unreadable archive record in {path.name} at {offset}: {e}")
+                    continue
+                entries[session_data["id"]] = dict(
+                    metadata_of(session_data), segment=path.name, offset=offset, length=length, raw_size=len(raw)
+                )
+        return list(entries.values())
+
+    def _convert_plain_files(self):
+        """Compress sessions archived as plain JSON files by older versions"""
+        for path in sorted(self.storage_path.glob("sess_*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    session_data = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                print(f"Unreadable archived session {path}, leaving it in place")
+                continue
+            if self.create(session_data):
+                path.unlink()
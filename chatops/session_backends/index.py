@@ -0,0 +1,207 @@
+"""
+Session Metadata Index
+
+The sidebar metadata of every session (id, title, created_at,
+last_updated, message_count), so listing sessions reads the index instead
+of every session file. File backends update it on create/update/delete.
+
+Storage (each backend names its own index, so two file backends sharing
+a sessions directory never see each other's sessions; "index" by default):
+- index.json: snapshot {"version": 1, "sessions": {id: metadata}},
+  rewritten atomically (temp file + rename)
+- index.log: one JSON line per change since the snapshot ({"put": entry}
+  or {"remove": id}); a chat turn appends one short line instead of
+  rewriting the snapshot. Once the log holds COMPACT_AFTER changes it is
+  folded into a new snapshot and truncated. Replaying it is idempotent, so
+  a crash between the two steps is harmless.
+
+The index is shared by every backend instance with the same directory and
+index name in the process and picks up changes written by other processes. If the snapshot
+is missing or unreadable it is rebuilt from the session files.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+INDEX_FILE = "index.json"
+LOG_FILE = "index.log"
+COMPACT_AFTER = 1000
+METADATA_KEYS = ("id", "title", "created_at", "last_updated", "message_count")
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def metadata_of(session_data: Dict) -> Dict:
+    """Index entry of a full session dict"""
+    return {
+        "id": session_data["id"],
+        "title": session_data["title"],
+        "created_at": session_data["created_at"],
+        "last_updated": session_data["last_updated"],
+        "message_count": len(session_data.get("messages", []))
+    }
+
+
+class MetadataIndex:
+    """Persisted {session_id: metadata} map (snapshot + change log)"""
+
+    def __init__(self, directory: Path, rebuild: Callable[[], List[Dict]], keys: Tuple[str, ...] = METADATA_KEYS,
+                 name: str = "index"):
+        """
+        Initialize MetadataIndex (use MetadataIndex.open to share instances)
+
+        Args:
+            directory: Sessions directory holding index.json / index.log
+            rebuild: Returns the metadata of all sessions by scanning storage
+            keys: Keys stored per entry (METADATA_KEYS plus any backend-specific ones)
+            name: Index file name without extension (<name>.json / <name>.log)
+        """
+        self.keys = keys
+        self.path = Path(directory) / f"{name}.json"
+        self.log_path = Path(directory) / f"{name}.log"
+        self._rebuild = rebuild
+        self._lock = threading.RLock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._sorted: Optional[List[Dict]] = None
+        self._snapshot_mtime = None
+        self._log_offset = 0
+        self._log_changes = 0
+
+    @classmethod
+    def open(cls, directory: Path, rebuild: Callable[[], List[Dict]],
+             keys: Tuple[str, ...] = METADATA_KEYS, name: str = "index") -> "MetadataIndex":
+        """Shared index for a sessions directory and index name"""
+        directory = Path(directory).resolve()
+        with _indexes_lock:
+            index = _indexes.get((directory, name))
+            if index is None:
+                index = _indexes[(directory, name)] = cls(directory, rebuild, keys, name)
+            else:
+                index._rebuild = rebuild
+            return index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def sorted(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Entries, most recently updated first (optionally one page)"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._sorted is None:
+                self._sorted = sorted(self._entries.values(), key=lambda e: e["last_updated"], reverse=True)
+            end = None if limit is None else offset + limit
+            return [dict(entry) for entry in self._sorted[offset:end]]
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(session_id)
+            return dict(entry) if entry else None
+
+    def put(self, metadata: Dict):
+        """Insert or replace an entry"""
+        with self._lock:
+            self._ensure_loaded()
+            self._change({"put": {k: metadata[k] for k in self.keys}})
+
+    def update(self, session_id: str, **fields):
+        """Update fields of an existing entry"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return
+            self._change({"put": dict(entry, **{k: v for k, v in fields.items() if k in self.keys})})
+
+    def remove(self, session_id: str):
+        with self._lock:
+            self._ensure_loaded()
+            if session_id in self._entries:
+                self._change({"remove": session_id})
+
+    def rebuild(self):
+        """Re-scan storage and rewrite the snapshot"""
+        with self._lock:
+            self._entries = {m["id"]: {k: m[k] for k in self.keys} for m in self._rebuild()}
+            self._sorted = None
+            self._save_snapshot()
+
+    def _apply(self, change: Dict):
+        self._sorted = None
+        if "put" in change:
+            self._entries[change["put"]["id"]] = change["put"]
+        else:
+            self._entries.pop(change["remove"], None)
+
+    def _change(self, change: Dict):
+        """Apply a change and append it to the log"""
+        self._apply(change)
+        line = (json.dumps(change, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            self._log_offset = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        self._log_changes += 1
+        if self._log_changes >= COMPACT_AFTER:
+            self._save_snapshot()
+
+    def _ensure_loaded(self):
+        try:
+            snapshot_mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            snapshot_mtime = None
+
+        if self._entries is None or snapshot_mtime != self._snapshot_mtime:
+            if snapshot_mtime is None:
+                self.rebuild()
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)["sessions"]
+            except (json.JSONDecodeError, IOError, KeyError):
+                print(f"Unreadable session index {self.path}, rebuilding...")
+                self.rebuild()
+                return
+            self._sorted = None
+            self._snapshot_mtime = snapshot_mtime
+            self._log_offset = 0
+            self._log_changes = 0
+
+        self._replay_log()
+
+    def _replay_log(self):
+        """Apply log lines written since the last read (by any process)"""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # ignore a partially written last line
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+            self._log_changes += 1
+        self._log_offset += end
+
+    def _save_snapshot(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "sessions": self._entries}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        # The log is folded into the snapshot now (replaying it again would be harmless)
+        with open(self.log_path, "wb"):
+            pass
+        self._snapshot_mtime = os.stat(self.path).st_mtime_ns
+        self._log_offset = 0
+        self._log_changes = 0
@@ -0,0 +1,118 @@
+"""
+JSON File Session Backend
+
+One pretty-printed JSON file per session (sess_<...>.json) in the
+sessions directory. Simple and human-readable; every update rewrites the
+file (temp file + rename). Listing reads the metadata index (json_index.json).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from .base import SessionBackend
+from .index import MetadataIndex, metadata_of
+
+
+class JsonFileBackend(SessionBackend):
+    """One JSON file per session"""
+
+    def __init__(self, storage_path: str):
+        """
+        Initialize JsonFileBackend
+
+        Args:
+            storage_path: Directory path to store session files
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.index = MetadataIndex.open(self.storage_path, self._scan_metadata, name="json_index")
+
+    def create(self, session_data: Dict) -> bool:
+        session_file = self._get_session_path(session_data["id"])
+
+        # Write a temp file and rename it over the session, so a crash never leaves a torn file
+        tmp_file = session_file.with_name(session_file.name + ".tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(session_data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, session_file)
+            self.index.put(metadata_of(session_data))
+            return True
+        except (IOError, TypeError) as e:
+            print(f"Error saving session {session_data['id']}: {e}")
+            return False
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        session_file = self._get_session_path(session_id)
+
+        if not session_file.exists():
+            return None
+
+        try:
+            with open(session_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError, KeyError) as e:
+            # Corrupt file - delete it
+            print(f"Corrupted session file {session_file}, removing...")
+            try:
+                session_file.unlink()
+            except:
+                pass
+            return None
+
+    def load_metadata(self, session_id: str) -> Optional[Dict]:
+        return self.index.get(session_id)
+
+    def list_metadata(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return self.index.sorted(offset, limit)
+
+    def _scan_metadata(self) -> List[Dict]:
+        """Metadata of every session file (used to rebuild the index)"""
+        sessions = []
+
+        for session_file in self.storage_path.glob("sess_*.json"):
+            try:
+                with open(session_file, 'r', encoding='utf-8') as f:
+                    session_data = json.load(f)
+
+                # Return only metadata for lighter loading
+                metadata = {
+                    "id": session_data["id"],
+                    "title": session_data["title"],
+                    "created_at": session_data["created_at"],
+                    "last_updated": session_data["last_updated"],
+                    "message_count": len(session_data.get("messages", []))
+                }
+                sessions.append(metadata)
+
+            except (json.JSONDecodeError, IOError, KeyError) as e:
+                # Corrupt file - delete it to prevent future errors
+                print(f"Corrupted session file {session_file}, removing...")
+                try:
+                    session_file.unlink()
+                except:
+                    pass
+                continue
+
+        # Sort by last_updated (most recent first)
+        sessions.sort(key=lambda x: x["last_updated"], reverse=True)
+        return sessions
+
+    def delete(self, session_id: str) -> bool:
+        session_file = self._get_session_path(session_id)
+
+        if not session_file.exists():
+            return False
+
+        try:
+            session_file.unlink()
+            self.index.remove(session_id)
+            return True
+        except IOError as e:
+            print(f"Error deleting session {session_id}: {e}")
+            return False
+
+    def _get_session_path(self, session_id: str) -> Path:
+        """Get the file path for a session"""
+        return self.storage_path / f"{session_id}.json"
@@ -0,0 +1,455 @@
+"""
+Append-only Session Log Backend
+
+Each session is one JSONL file (sess_<...>.jsonl):
+    {"type": "header", "id", "title", "created_at", "last_updated", ...}
+    {"type": "message", "seq": 0, "message": {...}}
+    {"type": "meta", "last_updated": ..., "title"?: ..., "summary"?: ...}
+    {"type": "reset"}    (message list replaced; messages restart at seq 0)
+
+A chat turn appends its new messages plus one meta record in a single
+write instead of rewriting the file, so a turn costs O(new messages).
+Durability follows SESSION_FSYNC ("always", "interval" or "never").
+
+Crash safety: a torn final record (no trailing newline or invalid JSON) is
+ignored on read and cut off before the next append; files are never
+deleted because they fail to parse. Full rewrites (create, compaction) go
+through a temp file + fsync + rename.
+
+Listing reads the metadata index (jsonl_index.json), updated on every write.
+
+Compaction rewrites a session as header + messages in the background once
+it has accumulated SESSION_COMPACT_AFTER meta/reset records. Legacy
+sess_<...>.json files are read transparently and converted on first update.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import settings
+from .base import SessionBackend, message_digest
+from .index import MetadataIndex, metadata_of
+
+FORMAT_VERSION = 1
+FSYNC_POLICIES = ("always", "interval", "never")
+# Message records are written with this prefix and counted without decoding
+MESSAGE_PREFIX = b'{"type": "message"'
+RESET_PREFIX = b'{"type": "reset"'
+
+
+class _Tail:
+    """What the next append needs to know about a session file"""
+
+    __slots__ = ("count", "digest", "size", "overhead")
+
+    def __init__(self, count: int, digest: str, size: int, overhead: int):
+        self.count = count              # live messages
+        self.digest = digest            # message_digest of the live messages
+        self.size = size                # bytes up to the last complete record
+        self.overhead = overhead        # meta/reset records removable by compaction
+
+
+class AppendLogBackend(SessionBackend):
+    """One append-only JSONL log per session"""
+
+    def __init__(self, storage_path: str, fsync: str = None, fsync_interval_s: float = None,
+                 compact_after: int = None):
+        """
+        Initialize AppendLogBackend
+
+        Args:
+            storage_path: Directory path to store session logs
+            fsync: "always" (fsync every append), "interval" (background fsync
+                every fsync_interval_s) or "never" (leave it to the OS)
+            fsync_interval_s: Interval of the background fsync
+            compact_after: Meta/reset records after which a session is compacted
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync or settings.SESSION_FSYNC
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.fsync} (expected one of {', '.join(FSYNC_POLICIES)})")
+        self.fsync_interval_s = fsync_interval_s or settings.SESSION_FSYNC_INTERVAL_S
+        self.compact_after = compact_after or settings.SESSION_COMPACT_AFTER
+
+        self._locks = defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+        self._tails: Dict[str, _Tail] = {}
+        self._unsynced = set()
+        self._unsynced_lock = threading.Lock()
+        self._compacting = set()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-compact")
+        self._stop = threading.Event()
+        self.index = MetadataIndex.open(self.storage_path, self._scan_metadata, name="jsonl_index")
+        if self.fsync == "interval":
+            threading.Thread(target=self._sync_loop, name="session-fsync", daemon=True).start()
+
+    # --- SessionBackend ---
+
+    def create(self, session_data: Dict) -> bool:
+        with self._lock(session_data["id"]):
+            if not self._rewrite(session_data):
+                return False
+            self.index.put(metadata_of(session_data))
+            return True
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        with self._lock(session_id):
+            return self._read(session_id)
+
+    def load_metadata(self, session_id: str) -> Optional[Dict]:
+        metadata = self.index.get(session_id)
+        if metadata is None:
+            with self._lock(session_id):
+                metadata = self._read_metadata(session_id)
+        return metadata
+
+    def load_messages(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        with self._lock(session_id):
+            end = None if limit is None else offset + limit
+            path = self._get_session_path(session_id)
+            if not path.exists():
+                session_data = self._read(session_id)
+                return session_data["messages"][offset:end] if session_data else None
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except IOError as e:
+                print(f"Error reading session {session_id}: {e}")
+                return None
+
+            # Live messages are the message records after the last reset;
+            # only the requested ones are decoded
+            lines = data[:data.rfind(b"\n") + 1].splitlines()
+            message_lines = []
+            for line in lines:
+                if line.startswith(MESSAGE_PREFIX):
+                    message_lines.append(line)
+                elif line.startswith(RESET_PREFIX):
+                    message_lines = []
+            records, skipped = self._decode_records(message_lines[offset:end])
+            if skipped or any(r.get("seq") != offset + i for i, r in enumerate(records)):
+                # Damaged records: fall back to a full replay
+                session_data = self._read(session_id)
+                return session_data["messages"][offset:end] if session_data else None
+            return [r["message"] for r in records]
+
+    def update(self, session_id: str, messages: List[Dict], fields: Dict) -> bool:
+        with self._lock(session_id):
+            path = self._get_session_path(session_id)
+            tail = self._tails.get(session_id)
+            if tail is None or not path.exists() or path.stat().st_size != tail.size:
+                session_data = self._read(session_id)
+                if session_data is None:
+                    return False
+                if not path.exists():
+                    # Legacy JSON session: convert on first update
+                    session_data.update(fields)
+                    session_data["messages"] = messages
+                    if not self._rewrite(session_data):
+                        return False
+                    self._get_legacy_path(session_id).unlink(missing_ok=True)
+                    self.index.put(metadata_of(session_data))
+                    return True
+                tail = self._tails[session_id]
+
+            records = []
+            digest = message_digest(messages[:tail.count])
+            if tail.count == 0:
+                start = 0
+            elif tail.count <= len(messages) and digest.hexdigest() == tail.digest:
+                start = tail.count
+            else:
+                # Not an extension of the stored list (edit/truncation)
+                records.append({"type": "reset"})
+                start = 0
+                digest = message_digest([])
+            message_digest(messages[start:], digest)
+            records += [{"type": "message", "seq": seq, "message": messages[seq]}
+                        for seq in range(start, len(messages))]
+            records.append({"type": "meta", **fields})
+
+            try:
+                self._append(session_id, path, tail, records)
+            except (IOError, OSError, TypeError) as e:
+                print(f"Error saving session {session_id}: {e}")
+                self._tails.pop(session_id, None)
+                return False
+
+            tail.count = len(messages)
+            tail.digest = digest.hexdigest()
+            tail.overhead += len(records) - (len(messages) - start)
+            if self.index.get(session_id) is not None:
+                self.index.update(session_id, message_count=len(messages), **fields)
+            else:
+                metadata = self._read_metadata(session_id)
+                if metadata is not None:
+                    self.index.put(metadata)
+            if tail.overhead >= self.compact_after:
+                self._schedule_compaction(session_id)
+            return True
+
+    def list_metadata(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return self.index.sorted(offset, limit)
+
+    def _scan_metadata(self) -> List[Dict]:
+        """Metadata of every session log (used to rebuild the index)"""
+        session_ids = {p.stem for p in self.storage_path.glob("sess_*.jsonl")}
+        session_ids |= {p.stem for p in self.storage_path.glob("sess_*.json")}
+
+        sessions = []
+        for session_id in session_ids:
+            metadata = self._read_metadata(session_id)
+            if metadata is not None:
+                sessions.append(metadata)
+
+        sessions.sort(key=lambda x: x["last_updated"], reverse=True)
+        return sessions
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock(session_id):
+            self._tails.pop(session_id, None)
+            deleted = False
+            for path in (self._get_session_path(session_id), self._get_legacy_path(session_id)):
+                try:
+                    path.unlink()
+                    deleted = True
+                except FileNotFoundError:
+                    pass
+                except IOError as e:
+                    print(f"Error deleting session {session_id}: {e}")
+            self.index.remove(session_id)
+            return deleted
+
+    def close(self):
+        self._stop.set()
+        self._compactor.shutdown(wait=True)
+        self._sync_pending()
+
+    # --- reading ---
+
+    def _read(self, session_id: str) -> Optional[Dict]:
+        """Replay a session log (caller holds the session lock)"""
+        path = self._get_session_path(session_id)
+        if not path.exists():
+            return self._read_legacy(session_id)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except IOError as e:
+            print(f"Error reading session {session_id}: {e}")
+            return None
+
+        # Anything after the last newline is a torn write: ignore it
+        valid_end = data.rfind(b"\n") + 1
+        records, overhead = self._decode_records(data[:valid_end].splitlines())
+        header, messages = None, []
+        for record in records:
+            kind = record.pop("type", None)
+            if kind == "header":
+                header = record
+            elif header is None:
+                continue
+            elif kind == "message":
+                if record.get("seq") == len(messages):
+                    messages.append(record["message"])
+            elif kind == "meta":
+                header.update(record)
+                overhead += 1
+            elif kind == "reset":
+                messages = []
+                overhead += 1
+
+        if header is None:
+            # Keep the file for inspection instead of deleting the session
+            print(f"Unreadable session log {path}, leaving it in place")
+            return None
+
+        header.pop("format", None)
+        session_data = dict(header, messages=messages)
+        self._tails[session_id] = _Tail(len(messages), message_digest(messages).hexdigest(), valid_end, overhead)
+        return session_data
+
+    @staticmethod
+    def _decode_records(lines: List[bytes]):
+        """Decode JSONL records; returns (records, number of undecodable lines)"""
+        lines = [line for line in lines if line.strip()]
+        try:
+            # One decoder call for the whole file is much faster than one per line
+            return json.loads(b"[" + b",".join(lines) + b"]"), 0
+        except json.JSONDecodeError:
+            pass
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return records, len(lines) - len(records)
+
+    def _read_metadata(self, session_id: str) -> Optional[Dict]:
+        """Session metadata without decoding message records"""
+        path = self._get_session_path(session_id)
+        if not path.exists():
+            session_data = self._read_legacy(session_id)
+            if session_data is None:
+                return None
+            return self._metadata(session_data, len(session_data.get("messages", [])))
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except IOError:
+            return None
+
+        header, count = None, 0
+        for line in data[:data.rfind(b"\n") + 1].splitlines():
+            if line.startswith(MESSAGE_PREFIX):
+                count += 1
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = record.pop("type", None)
+            if kind == "header":
+                header = record
+            elif header is not None and kind == "meta":
+                header.update(record)
+            elif kind == "reset":
+                count = 0
+        return self._metadata(header, count) if header else None
+
+    @staticmethod
+    def _metadata(session_data: Dict, message_count: int) -> Dict:
+        return {
+            "id": session_data["id"],
+            "title": session_data["title"],
+            "created_at": session_data["created_at"],
+            "last_updated": session_data["last_updated"],
+            "message_count": message_count
+        }
+
+    def _read_legacy(self, session_id: str) -> Optional[Dict]:
+        path = self._get_legacy_path(session_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Unreadable session file {path}, leaving it in place")
+            return None
+
+    # --- writing ---
+
+    def _rewrite(self, session_data: Dict) -> bool:
+        """Atomically replace a session log with header + messages (caller holds the lock)"""
+        session_id = session_data["id"]
+        messages = session_data.get("messages", [])
+        header = {k: v for k, v in session_data.items() if k != "messages"}
+        lines = [json.dumps({"type": "header", "format": FORMAT_VERSION, **header}, ensure_ascii=False)]
+        lines += [json.dumps({"type": "message", "seq": i, "message": m}, ensure_ascii=False)
+                  for i, m in enumerate(messages)]
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        path = self._get_session_path(session_id)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                if self.fsync != "never":
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            if self.fsync != "never":
+                self._fsync_dir()
+        except (IOError, OSError, TypeError) as e:
+            print(f"Error saving session {session_id}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+        self._tails[session_id] = _Tail(len(messages), message_digest(messages).hexdigest(), len(data), 0)
+        return True
+
+    def _append(self, session_id: str, path: Path, tail: _Tail, records: List[Dict]):
+        """Append records in one write (caller holds the lock)"""
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        try:
+            if os.fstat(fd).st_size != tail.size:
+                # Cut off a torn record left by an earlier crash
+                os.ftruncate(fd, tail.size)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if self.fsync == "always":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        tail.size += len(data)
+        if self.fsync == "interval":
+            with self._unsynced_lock:
+                self._unsynced.add(path)
+
+    def _schedule_compaction(self, session_id: str):
+        if session_id in self._compacting:
+            return
+        self._compacting.add(session_id)
+        self._compactor.submit(self._compact, session_id)
+
+    def _compact(self, session_id: str):
+        try:
+            with self._lock(session_id):
+                session_data = self._read(session_id)
+                if session_data is not None and self._get_session_path(session_id).exists():
+                    self._rewrite(session_data)
+        finally:
+            self._compacting.discard(session_id)
+
+    def _sync_loop(self):
+        while not self._stop.wait(self.fsync_interval_s):
+            self._sync_pending()
+
+    def _sync_pending(self):
+        with self._unsynced_lock:
+            paths, self._unsynced = self._unsynced, set()
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except FileNotFoundError:
+                continue
+
+    def _fsync_dir(self):
+        # Make the rename itself durable (POSIX)
+        if os.name != "posix":
+            return
+        fd = os.open(self.storage_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # --- helpers ---
+
+    def _lock(self, session_id: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks[session_id]
+
+    def _get_session_path(self, session_id: str) -> Path:
+        return self.storage_path / f"{session_id}.jsonl"
+
+    def _get_legacy_path(self, session_id: str) -> Path:
+        return self.storage_path / f"{session_id}.json"
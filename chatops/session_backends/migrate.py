@@ -0,0 +1,96 @@
+"""
+Copy sessions between storage backends
+
+Usage:
+    python -m chatops.session_backends.migrate [--from json] [--to sqlite] [--path sessions/] [--overwrite] [--dry-run]
+
+Source sessions are never modified; unreadable source files are reported
+and skipped. Switch SESSION_BACKEND once the copy looks right.
+"""
+
+import argparse
+import json
+from typing import Dict, Iterator, Tuple
+from config.settings import settings
+from . import BACKENDS, create_backend
+from .json_file import JsonFileBackend
+
+
+def _iter_sessions(backend) -> Iterator[Tuple[str, Dict]]:
+    """(source name, session data or None if unreadable) for every stored session"""
+    if isinstance(backend, JsonFileBackend):
+        # Read files directly: JsonFileBackend.load() deletes corrupt files
+        for session_file in sorted(backend.storage_path.glob("sess_*.json")):
+            try:
+                with open(session_file, "r", encoding="utf-8") as f:
+                    yield session_file.name, json.load(f)
+            except (json.JSONDecodeError, IOError):
+                yield session_file.name, None
+        return
+
+    for metadata in backend.list_metadata():
+        yield metadata["id"], backend.load(metadata["id"])
+
+
+def migrate(storage_path: str, source: str = "json", target: str = "sqlite",
+            overwrite: bool = False, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Copy every session from one backend to another
+
+    Args:
+        storage_path: Sessions directory
+        source: Source backend name
+        target: Target backend name
+        overwrite: Replace sessions that already exist in the target
+        dry_run: Only count what would be copied
+
+    Returns:
+        Counts of copied, skipped (already present) and failed sessions
+    """
+    if source == target:
+        raise ValueError("Source and target backends must differ")
+    source_backend = create_backend(source, storage_path)
+    target_backend = create_backend(target, storage_path)
+    existing = {m["id"] for m in target_backend.list_metadata()}
+
+    counts = {"copied": 0, "skipped": 0, "failed": 0}
+    for name, session_data in _iter_sessions(source_backend):
+        if session_data is None or "id" not in session_data:
+            print(f"Unreadable session {name}, skipped")
+            counts["failed"] += 1
+            continue
+        if session_data["id"] in existing and not overwrite:
+            counts["skipped"] += 1
+            continue
+
+        session_data.setdefault("title", "New Chat")
+        session_data.setdefault("created_at", session_data.get("last_updated", ""))
+        session_data.setdefault("last_updated", session_data["created_at"])
+        session_data.setdefault("messages", [])
+        if dry_run or target_backend.create(session_data):
+            counts["copied"] += 1
+        else:
+            counts["failed"] += 1
+
+    target_backend.close()
+    source_backend.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="source", choices=BACKENDS, default="json")
+    parser.add_argument("--to", dest="target", choices=BACKENDS, default="sqlite")
+    parser.add_argument("--path", default=settings.SESSIONS_DIR, help="Sessions directory")
+    parser.add_argument("--overwrite", action="store_true", help="Replace sessions already in the target")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    counts = migrate(args.path, args.source, args.target, overwrite=args.overwrite, dry_run=args.dry_run)
+    print(f"{'Would copy' if args.dry_run else 'Copied'} {counts['copied']} sessions "
+          f"({counts['skipped']} already present, {counts['failed']} failed) "
+          f"from {args.source} to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+SQLite Session Backend
+
+Sessions live in one SQLite database in WAL mode (readers never block the
+writer):
+- sessions: one row of metadata per session, indexed on last_updated and
+  title, so the sidebar listing never touches messages
+- messages: one row per message keyed by (session_id, seq)
+
+A chat turn only inserts the new messages instead of rewriting the session
+(when the digest of the stored messages matches the same prefix of the new
+list; anything else replaces them).
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from .base import SessionBackend, message_digest
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    summary TEXT,
+    messages_digest TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_updated ON sessions (last_updated DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_title ON sessions (title COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+METADATA_COLUMNS = "id, title, created_at, last_updated, message_count"
+
+
+class SqliteBackend(SessionBackend):
+    """Sessions and messages in an SQLite database (WAL mode)"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize SqliteBackend
+
+        Args:
+            db_path: Path of the database file (created if missing)
+        """
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread (Streamlit serves each browser session in its own thread)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if "messages_digest" not in columns:
+                # Databases from before the digest: filled in on the next update of each session
+                conn.execute("ALTER TABLE sessions ADD COLUMN messages_digest TEXT")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def create(self, session_data: Dict) -> bool:
+        messages = session_data.get("messages", [])
+        try:
+            with self._write_lock, self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions "
+                    "(id, title, created_at, last_updated, message_count, summary, messages_digest) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (session_data["id"], session_data["title"], session_data["created_at"],
+                     session_data["last_updated"], len(messages), self._dump_summary(session_data.get("summary")),
+                     message_digest(messages).hexdigest())
+                )
+                conn.execute("DELETE FROM messages WHERE session_id = ?", (session_data["id"],))
+                self._insert_messages(conn, session_data["id"], messages, 0)
+            return True
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Error saving session {session_data.get('id')}: {e}")
+            return False
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        conn = self._connection()
+        row = conn.execute(
+            f"SELECT {METADATA_COLUMNS}, summary FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        session_data = {
+            "id": row["id"],
+            "title": row["title"],
+            "created_at": row["created_at"],
+            "last_updated": row["last_updated"],
+            "messages": self._load_messages(conn, session_id),
+        }
+        if row["summary"] is not None:
+            session_data["summary"] = json.loads(row["summary"])
+        return session_data
+
+    def load_metadata(self, session_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            f"SELECT {METADATA_COLUMNS} FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def load_messages(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is None:
+            return None
+        rows = conn.execute(
+            "SELECT role, content, extra FROM messages WHERE session_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+            (session_id, offset, -1 if limit is None else limit)
+        ).fetchall()
+        return [self._row_to_message(row) for row in rows]
+
+    def update(self, session_id: str, messages: List[Dict], fields: Dict) -> bool:
+        try:
+            with self._write_lock, self._connection() as conn:
+                row = conn.execute(
+                    "SELECT message_count, messages_digest FROM sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+                if row is None:
+                    return False
+                stored = row["message_count"]
+                stored_digest = row["messages_digest"]
+                if stored_digest is None and stored:
+                    stored_digest = message_digest(self._load_messages(conn, session_id)).hexdigest()
+
+                # Chat turns extend the list: insert only the new messages.
+                # Anything else (edits, truncation) replaces the stored list.
+                digest = message_digest(messages[:stored])
+                if 0 < stored <= len(messages) and digest.hexdigest() == stored_digest:
+                    self._insert_messages(conn, session_id, messages[stored:], stored)
+                    message_digest(messages[stored:], digest)
+                else:
+                    if stored != 0 or messages:
+                        conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                        self._insert_messages(conn, session_id, messages, 0)
+                    digest = message_digest(messages)
+
+                assignments = {"message_count": len(messages), "messages_digest": digest.hexdigest()}
+                for key in ("title", "last_updated"):
+                    if key in fields:
+                        assignments[key] = fields[key]
+                if "summary" in fields:
+                    assignments["summary"] = self._dump_summary(fields["summary"])
+                conn.execute(
+                    f"UPDATE sessions SET {', '.join(f'{k} = ?' for k in assignments)} WHERE id = ?",
+                    (*assignments.values(), session_id)
+                )
+            return True
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Error saving session {session_id}: {e}")
+            return False
+
+    def list_metadata(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        rows = self._connection().execute(
+            f"SELECT {METADATA_COLUMNS} FROM sessions ORDER BY last_updated DESC LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, session_id: str) -> bool:
+        with self._write_lock, self._connection() as conn:
+            return conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _insert_messages(conn: sqlite3.Connection, session_id: str, messages: List[Dict], first_seq: int):
+        conn.executemany(
+            "INSERT INTO messages (session_id, seq, role, content, extra) VALUES (?, ?, ?, ?, ?)",
+            [
+                (session_id, first_seq + i, m["role"], m["content"], SqliteBackend._dump_extra(m))
+                for i, m in enumerate(messages)
+            ]
+        )
+
+    @staticmethod
+    def _load_messages(conn: sqlite3.Connection, session_id: str) -> List[Dict]:
+        rows = conn.execute(
+            "SELECT role, content, extra FROM messages WHERE session_id = ? ORDER BY seq", (session_id,)
+        ).fetchall()
+        return [SqliteBackend._row_to_message(row) for row in rows]
+
+    @staticmethod
+    def _row_to_message(row) -> Dict:
+        message = {"role": row["role"], "content": row["content"]}
+        if row["extra"]:
+            message.update(json.loads(row["extra"]))
+        return message
+
+    @staticmethod
+    def _dump_extra(message: Dict) -> Optional[str]:
+        # Keys besides role/content (e.g. timings) are kept as JSON
+        extra = {k: v for k, v in message.items() if k not in ("role", "content")}
+        return json.dumps(extra, ensure_ascii=False) if extra else None
+
+    @staticmethod
+    def _dump_summary(summary: Optional[Dict]) -> Optional[str]:
+        return json.dumps(summary, ensure_ascii=False) if summary is not None else None
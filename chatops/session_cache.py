@@ -0,0 +1,235 @@
+"""
+Write-Back Session Cache
+
+Every Streamlit rerun reads the current session and every chat turn writes
+it. Hot sessions are kept in memory (LRU, SESSION_CACHE_SIZE entries):
+reads are served from memory and updates only mark the session dirty.
+Dirty sessions are written to the backend in one batch every
+SESSION_FLUSH_INTERVAL_S, when they are evicted, and at interpreter exit,
+so a burst of updates to one session becomes one write.
+
+The cache is thread-safe and meant to be shared by every Streamlit session
+in the process (see session_manager.get_session_manager). A crash loses
+at most the last flush interval of updates; the backends write files
+atomically (temp file + rename, or append-only logs), so nothing already
+flushed is corrupted.
+"""
+
+import atexit
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from .perf import perf
+
+
+class _Entry:
+    __slots__ = ("session", "dirty_fields", "dirty")
+
+    def __init__(self, session: Dict):
+        self.session = session
+        self.dirty_fields: Dict = {}
+        self.dirty = False
+
+
+class SessionCache:
+    """LRU cache of full sessions with batched write-back"""
+
+    def __init__(self, capacity: int, flush_interval_s: float,
+                 write: Callable[[str, List[Dict], Dict], bool]):
+        """
+        Initialize SessionCache
+
+        Args:
+            capacity: Maximum number of cached sessions
+            flush_interval_s: Seconds between background flushes
+            write: Persists one session: write(session_id, messages, fields) -> success
+        """
+        self.capacity = capacity
+        self.flush_interval_s = flush_interval_s
+        self._write = write
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._evicting: Dict[str, _Entry] = {}  # evicted, flush in progress
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="session-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Copy of a cached session (messages list copied) or None"""
+        with self._lock:
+            entry = self._lookup(session_id)
+            if entry is None:
+                perf.incr("session_cache.misses")
+                return None
+            perf.incr("session_cache.hits")
+            return self._copy(entry.session)
+
+    def get_messages(self, session_id: str, offset: int, limit: Optional[int]) -> Optional[List[Dict]]:
+        """Slice of a cached session's messages (negative offset counts from the end) or None"""
+        with self._lock:
+            entry = self._lookup(session_id)
+            if entry is None:
+                return None
+            messages = entry.session.get("messages", [])
+            start = max(0, len(messages) + offset) if offset < 0 else offset
+            return messages[start:None if limit is None else start + limit]
+
+    def get_metadata(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._lookup(session_id)
+            return self._metadata(entry.session) if entry is not None else None
+
+    def put(self, session: Dict):
+        """Cache a session as loaded from the backend (clean)"""
+        with self._lock:
+            if session["id"] in self._entries or session["id"] in self._evicting:
+                return
+            self._entries[session["id"]] = _Entry(self._copy(session))
+            evicted = self._evict()
+        self._flush_entries(evicted)
+
+    def update(self, session_id: str, messages: List[Dict], fields: Dict) -> bool:
+        """
+        Apply an update to a cached session and mark it dirty
+
+        Returns:
+            False if the session is not cached (the caller writes through)
+        """
+        with self._lock:
+            entry = self._lookup(session_id)
+            if entry is None:
+                return False
+            entry.session["messages"] = list(messages)
+            entry.session.update(fields)
+            entry.dirty_fields.update(fields)
+            entry.dirty = True
+            return True
+
+    def dirty_metadata(self) -> List[Dict]:
+        """Metadata of sessions with unflushed updates"""
+        with self._lock:
+            return [self._metadata(entry.session) for entry in self._entries.values() if entry.dirty]
+
+    def is_cached(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._entries or session_id in self._evicting
+
+    def is_dirty(self, session_id: str) -> bool:
+        """True if the session has updates not yet written to the backend"""
+        with self._lock:
+            entry = self._entries.get(session_id) or self._evicting.get(session_id)
+            return entry is not None and entry.dirty
+
+    def discard(self, session_id: str):
+        """Drop a session without writing it (waits for a flush in progress)"""
+        with self._flush_lock, self._lock:
+            for entries in (self._entries, self._evicting):
+                entry = entries.pop(session_id, None)
+                if entry is not None:
+                    entry.dirty = False
+
+    def flush(self, session_id: str = None) -> int:
+        """
+        Write dirty sessions to the backend
+
+        Args:
+            session_id: Only flush this session (default: all)
+
+        Returns:
+            Number of sessions written
+        """
+        with self._lock:
+            ids = [session_id] if session_id is not None else list(self._entries)
+            batch = [(sid, self._entries[sid]) for sid in ids if sid in self._entries and self._entries[sid].dirty]
+        return self._flush_entries(batch)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "cached": len(self._entries),
+                "dirty": sum(1 for entry in self._entries.values() if entry.dirty),
+                "capacity": self.capacity,
+            }
+
+    def close(self):
+        """Stop the flusher and write everything that is dirty"""
+        self._stop.set()
+        self.flush()
+
+    def _flush_entries(self, batch) -> int:
+        written = 0
+        with self._flush_lock:
+            for session_id, entry in batch:
+                with self._lock:
+                    if not entry.dirty:
+                        continue
+                    messages = list(entry.session.get("messages", []))
+                    fields = entry.dirty_fields
+                    entry.dirty_fields = {}
+                    entry.dirty = False
+                try:
+                    ok = self._write(session_id, messages, fields)
+                except Exception as e:
+                    print(f"Error flushing session {session_id}: {e}")
+                    ok = False
+                if ok:
+                    written += 1
+                    continue
+                with self._lock:
+                    # Keep it dirty for the next flush (newer fields win)
+                    entry.dirty_fields = {**fields, **entry.dirty_fields}
+                    entry.dirty = True
+                    if self._evicting.pop(session_id, None) is not None:
+                        self._entries[session_id] = entry
+            with self._lock:
+                for session_id, entry in batch:
+                    if self._evicting.get(session_id) is entry:
+                        del self._evicting[session_id]
+        if written:
+            perf.incr("session_cache.flushed", written)
+        return written
+
+    def _evict(self) -> list:
+        """Pop least recently used entries beyond capacity (called with the lock held)"""
+        evicted = []
+        while len(self._entries) > self.capacity:
+            session_id, entry = self._entries.popitem(last=False)
+            if entry.dirty:
+                self._evicting[session_id] = entry
+                evicted.append((session_id, entry))
+        return evicted
+
+    def _lookup(self, session_id: str) -> Optional[_Entry]:
+        """Entry for a session, marking it most recently used (called with the lock held)"""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            # Evicted but not flushed yet: take it back so no update is lost
+            entry = self._evicting.pop(session_id, None)
+            if entry is None:
+                return None
+            self._entries[session_id] = entry
+        self._entries.move_to_end(session_id)
+        return entry
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval_s):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Session flush failed: {e}")
+
+    @staticmethod
+    def _metadata(session: Dict) -> Dict:
+        return {
+            "id": session["id"],
+            "title": session["title"],
+            "created_at": session["created_at"],
+            "last_updated": session["last_updated"],
+            "message_count": len(session.get("messages", []))
+        }
+
+    @staticmethod
+    def _copy(session: Dict) -> Dict:
+        return dict(session, messages=list(session.get("messages", [])))
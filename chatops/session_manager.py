@@ -1,30 +1,96 @@
 """
 Session Manager for ChatOps
 
-Manages multiple chat sessions with JSON-based persistence.
-Each session is stored as a separate JSON file in the sessions directory.
+Manages multiple chat sessions. Persistence is delegated to a storage
+backend (see chatops/session_backends), selected with SESSION_BACKEND:
+- "jsonl": append-only log per session; a chat turn appends its messages
+- "json": one JSON file per session in the sessions directory
+- "sqlite": SQLite database (WAL) with indexed session metadata
+
+Listing reads a metadata index (one per file backend, e.g. jsonl_index.json; the
+sessions table for SQLite), never the session files themselves.
+
+Retention: after a session is created, sessions beyond MAX_SESSIONS (oldest
+last_updated first) are archived or deleted in the background, depending
+on SESSION_RETENTION_POLICY ("archive", "evict", "off"). Sessions idle for
+more than SESSION_ARCHIVE_IDLE_DAYS are archived as well. The archive
+(sessions/archive/, see cold_archive) stores sessions compressed in
+segment files; archived sessions are restored transparently when opened.
+
+Search: a full-text index of titles and messages (see session_search) is
+updated in the background after every create/update, so search_sessions
+finds sessions by content without loading them.
+
+Caching: hot sessions are kept in a write-back LRU cache (see
+session_cache); updates are flushed to the backend in batches. Use
+get_session_manager() so every Streamlit session in the process shares
+one manager and cache.
 """
 
-import json
-import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from pathlib import Path
+import threading
+import time
 import uuid
+from config.settings import settings
+from .session_backends import ColdArchiveBackend, create_backend
+from .session_cache import SessionCache
+from .session_search import SessionSearchIndex, fts5_available
+
+ARCHIVE_DIR = "archive"
+IDLE_CHECK_INTERVAL_S = 3600
+SEARCH_DB = "search.db"
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_session_manager(storage_path: str = None) -> "SessionManager":
+    """Process-wide SessionManager for a sessions directory (shared cache)"""
+    path = Path(storage_path or settings.SESSIONS_DIR).resolve()
+    with _managers_lock:
+        manager = _managers.get(path)
+        if manager is None:
+            manager = _managers[path] = SessionManager(str(path))
+        return manager
 
 
 class SessionManager:
     """Manages chat session lifecycle and persistence"""
 
-    def __init__(self, storage_path: str):
+    def __init__(self, storage_path: str, backend: str = None, cache_size: int = None):
         """
         Initialize SessionManager
 
         Args:
-            storage_path: Directory path to store session files
+            storage_path: Directory path to store sessions
+            backend: Storage backend name (defaults to settings.SESSION_BACKEND)
+            cache_size: Sessions kept in the write-back cache (defaults to
+                settings.SESSION_CACHE_SIZE; 0 writes through)
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.backend = create_backend(backend or settings.SESSION_BACKEND, str(self.storage_path))
+        self.archive = ColdArchiveBackend(str(self.storage_path / ARCHIVE_DIR), settings.SESSION_ARCHIVE_CODEC or None)
+        self._last_idle_check = None
+        self._retention_lock = threading.Lock()
+        # Retention and search indexing run off the request path, in order
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-maintenance")
+
+        # Both attributes exist before the first background job or cache flush can read them
+        self.search = None
+        cache_size = settings.SESSION_CACHE_SIZE if cache_size is None else cache_size
+        self.cache = None
+        if cache_size > 0:
+            self.cache = SessionCache(cache_size, settings.SESSION_FLUSH_INTERVAL_S, self._write_back)
+
+        if settings.SESSION_SEARCH_ENABLED and fts5_available():
+            self.search = SessionSearchIndex(str(self.storage_path / SEARCH_DB))
+            # Catch up with sessions written while the index was not maintained
+            self._background.submit(self._sync_search)
+        self._schedule_maintenance()
 
     def create_session(self, title: str = "New Chat", first_message: str = "") -> str:
         """
@@ -51,12 +117,15 @@ class SessionManager:
             "messages": []
         }
 
-        self._save_session(session_id, session_data)
+        self.backend.create(session_data)
+        if self.search is not None:
+            self._background.submit(self._index_for_search, session_id, title, [])
+        self._schedule_maintenance()
         return session_id
 
     def get_session(self, session_id: str) -> Optional[Dict]:
         """
-        Load a session from disk
+        Load a session (restoring it from the archive if it was archived)
 
         Args:
             session_id: Session identifier
@@ -64,24 +133,66 @@ class SessionManager:
         Returns:
             Session data dictionary or None if not found
         """
-        session_file = self._get_session_path(session_id)
+        if self.cache is not None:
+            session_data = self.cache.get(session_id)
+            if session_data is not None:
+                return session_data
+
+        session_data = self.backend.load(session_id)
+        if session_data is None and self.restore_session(session_id):
+            session_data = self.backend.load(session_id)
+        if session_data is not None and self.cache is not None:
+            self.cache.put(session_data)
+        return session_data
+
+    def get_session_metadata(self, session_id: str) -> Optional[Dict]:
+        """
+        Session metadata without loading messages
 
-        if not session_file.exists():
-            return None
+        Returns:
+            {id, title, created_at, last_updated, message_count} or None if not found
+        """
+        if self.cache is not None:
+            metadata = self.cache.get_metadata(session_id)
+            if metadata is not None:
+                return metadata
 
-        try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError, KeyError) as e:
-            # Corrupt file - delete it
-            print(f"Corrupted session file {session_file}, removing...")
-            try:
-                session_file.unlink()
-            except:
-                pass
-            return None
-
-    def update_session(self, session_id: str, messages: List[Dict], title: str = None) -> bool:
+        metadata = self.backend.load_metadata(session_id)
+        if metadata is None and self.restore_session(session_id):
+            metadata = self.backend.load_metadata(session_id)
+        return metadata
+
+    def get_messages(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Read a slice of a session's messages without loading the whole session
+
+        Args:
+            session_id: Session identifier
+            offset: Index of the first message; negative counts from the end
+                (get_messages(sid, -20) returns the last 20 messages)
+            limit: Maximum number of messages (None for all)
+
+        Returns:
+            Messages in order (empty if the session does not exist)
+        """
+        if self.cache is not None:
+            messages = self.cache.get_messages(session_id, offset, limit)
+            if messages is not None:
+                return messages
+
+        if offset < 0:
+            metadata = self.get_session_metadata(session_id)
+            if metadata is None:
+                return []
+            offset = max(0, metadata["message_count"] + offset)
+
+        messages = self.backend.load_messages(session_id, offset, limit)
+        if messages is None and self.restore_session(session_id):
+            messages = self.backend.load_messages(session_id, offset, limit)
+        return messages or []
+
+    def update_session(self, session_id: str, messages: List[Dict], title: str = None,
+                       summary: Dict = None) -> bool:
         """
         Update an existing session
 
@@ -89,64 +200,65 @@ class SessionManager:
             session_id: Session identifier
             messages: List of message dictionaries
             title: Optional new title
+            summary: Optional rolling history summary (see HistoryManager)
 
         Returns:
             True if successful, False otherwise
         """
-        session_data = self.get_session(session_id)
-
-        if not session_data:
-            return False
-
-        # Update fields
-        session_data["messages"] = messages
-        session_data["last_updated"] = datetime.now().isoformat()
+        fields = {"last_updated": datetime.now().isoformat()}
 
         if title is not None:
-            session_data["title"] = title
+            fields["title"] = title
 
-        return self._save_session(session_id, session_data)
+        if summary is not None:
+            fields["summary"] = summary
 
-    def list_sessions(self) -> List[Dict]:
+        if self.cache is None:
+            updated = self._write_through(session_id, messages, fields)
+        else:
+            # Written to the backend by the next flush
+            updated = self.cache.update(session_id, messages, fields) or (
+                self.get_session(session_id) is not None and self.cache.update(session_id, messages, fields)
+            )
+        if updated and self.search is not None:
+            self._background.submit(self._index_for_search, session_id, title, list(messages))
+        return updated
+
+    def list_sessions(self, offset: int = 0, limit: Optional[int] = None,
+                      include_archived: bool = False) -> List[Dict]:
         """
-        List all sessions with metadata
+        List sessions with metadata
 
-        Returns:
-            List of session metadata (id, title, created_at, last_updated, message_count)
-        """
-        sessions = []
-
-        for session_file in self.storage_path.glob("sess_*.json"):
-            try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    session_data = json.load(f)
-
-                # Return only metadata for lighter loading
-                metadata = {
-                    "id": session_data["id"],
-                    "title": session_data["title"],
-                    "created_at": session_data["created_at"],
-                    "last_updated": session_data["last_updated"],
-                    "message_count": len(session_data.get("messages", []))
-                }
-                sessions.append(metadata)
-
-            except (json.JSONDecodeError, IOError, KeyError) as e:
-                # Corrupt file - delete it to prevent future errors
-                print(f"Corrupted session file {session_file}, removing...")
-                try:
-                    session_file.unlink()
-                except:
-                    pass
-                continue
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return (None for all)
+            include_archived: Also list archived sessions (marked "archived": True)
 
-        # Sort by last_updated (most recent first)
-        sessions.sort(key=lambda x: x["last_updated"], reverse=True)
+        Returns:
+            List of session metadata (id, title, created_at, last_updated, message_count),
+            most recently updated first
+        """
+        if not include_archived:
+            sessions = self.backend.list_metadata(offset, limit)
+        else:
+            archived = [dict(m, archived=True) for m in self.archive.list_metadata()]
+            sessions = self.backend.list_metadata() + archived
+            sessions.sort(key=lambda x: x["last_updated"], reverse=True)
+            end = None if limit is None else offset + limit
+            sessions = sessions[offset:end]
+
+        dirty = {m["id"]: m for m in self.cache.dirty_metadata()} if self.cache is not None else {}
+        if dirty:
+            # Not flushed yet: the index has their previous metadata
+            sessions = [dirty.pop(s["id"], s) for s in sessions]
+            if offset == 0:
+                sessions = sorted(sessions + list(dirty.values()), key=lambda x: x["last_updated"], reverse=True)
+                sessions = sessions[:limit]
         return sessions
 
     def delete_session(self, session_id: str) -> bool:
         """
-        Delete a session
+        Delete a session (live or archived)
 
         Args:
             session_id: Session identifier
@@ -154,17 +266,190 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        session_file = self._get_session_path(session_id)
+        if self.cache is not None:
+            self.cache.discard(session_id)
+        deleted = self.backend.delete(session_id)
+        deleted = self.archive.delete(session_id) or deleted
+        if self.search is not None:
+            self._background.submit(self.search.remove, session_id)
+        return deleted
+
+    def search_sessions(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Full-text search over session titles and messages
+
+        Falls back to a title filter when the search index is disabled.
+
+        Args:
+            query: Free text; every term must match, the last one as a prefix
+            limit: Maximum number of sessions
+
+        Returns:
+            List of {"id", "title", "snippet", "seq", "score"}, best match first;
+            snippet marks matched terms with **bold**
+        """
+        if self.search is None:
+            needle = query.lower()
+            return [
+                {"id": s["id"], "title": s["title"], "snippet": "", "seq": -1, "score": 0.0}
+                for s in self.list_sessions(include_archived=True) if needle in s["title"].lower()
+            ][:limit]
+        return self.search.search(query, limit)
+
+    def archive_session(self, session_id: str) -> bool:
+        """
+        Move a session to the compressed archive (sessions/archive/)
 
-        if not session_file.exists():
+        Returns:
+            True if the session was archived
+        """
+        if self.cache is not None:
+            self.cache.flush(session_id)
+            self.cache.discard(session_id)
+        session_data = self.backend.load(session_id)
+        if session_data is None or not self.archive.create(session_data):
             return False
+        return self.backend.delete(session_id)
 
-        try:
-            session_file.unlink()
-            return True
-        except IOError as e:
-            print(f"Error deleting session {session_id}: {e}")
+    def restore_session(self, session_id: str) -> bool:
+        """
+        Move an archived session back to live storage
+
+        Returns:
+            True if the session was restored
+        """
+        session_data = self.archive.load(session_id)
+        if session_data is None or not self.backend.create(session_data):
             return False
+        return self.archive.delete(session_id)
+
+    def enforce_retention(self, max_sessions: int = None, policy: str = None) -> int:
+        """
+        Archive or delete the oldest sessions beyond the limit
+
+        Runs in the background after create_session; the most recently
+        updated sessions are kept.
+
+        Args:
+            max_sessions: Number of live sessions to keep (defaults to settings.MAX_SESSIONS)
+            policy: "archive", "evict" or "off" (defaults to settings.SESSION_RETENTION_POLICY)
+
+        Returns:
+            Number of sessions archived or deleted
+        """
+        max_sessions = settings.MAX_SESSIONS if max_sessions is None else max_sessions
+        policy = policy or settings.SESSION_RETENTION_POLICY
+        if policy == "off" or max_sessions <= 0:
+            return 0
+
+        with self._retention_lock:
+            # Flush first so the backend's last_updated order includes cached updates
+            self.flush()
+            removed = 0
+            for metadata in self.backend.list_metadata(offset=max_sessions):
+                if self.cache is not None and self.cache.is_dirty(metadata["id"]):
+                    continue  # updated since the flush (or the flush failed)
+                try:
+                    if policy == "evict":
+                        if self.cache is not None:
+                            self.cache.discard(metadata["id"])
+                        ok = self.backend.delete(metadata["id"])
+                        if ok and self.search is not None:
+                            self.search.remove(metadata["id"])
+                    else:
+                        ok = self.archive_session(metadata["id"])
+                except Exception as e:
+                    print(f"Error applying retention to session {metadata['id']}: {e}")
+                    ok = False
+                removed += ok
+            return removed
+
+    def archive_idle_sessions(self, max_idle_days: float = None) -> int:
+        """
+        Move sessions not updated for max_idle_days to the archive
+
+        Runs in the background (at start-up and at most hourly after
+        create_session); sessions in the cache are in use and skipped.
+
+        Args:
+            max_idle_days: Idle age (defaults to settings.SESSION_ARCHIVE_IDLE_DAYS; 0 disables)
+
+        Returns:
+            Number of sessions archived
+        """
+        max_idle_days = settings.SESSION_ARCHIVE_IDLE_DAYS if max_idle_days is None else max_idle_days
+        if max_idle_days <= 0:
+            return 0
+
+        cutoff = (datetime.now() - timedelta(days=max_idle_days)).isoformat()
+        archived = 0
+        with self._retention_lock:
+            for metadata in self.backend.list_metadata():
+                if metadata["last_updated"] >= cutoff:
+                    continue
+                if self.cache is not None and self.cache.is_cached(metadata["id"]):
+                    continue
+                try:
+                    archived += self.archive_session(metadata["id"])
+                except Exception as e:
+                    print(f"Error archiving idle session {metadata['id']}: {e}")
+            self.archive.compact()
+        return archived
+
+    def archive_stats(self) -> Dict:
+        """Archive size and disk savings (see ColdArchiveBackend.stats)"""
+        return self.archive.stats()
+
+    def flush(self) -> int:
+        """Write all cached updates to the backend (also runs on a timer and at exit)"""
+        return self.cache.flush() if self.cache is not None else 0
+
+    def _write_through(self, session_id: str, messages: List[Dict], fields: Dict) -> bool:
+        """Persist an update to the backend"""
+        if self.backend.update(session_id, messages, fields):
+            return True
+        # Archived while open: bring it back and retry
+        return self.restore_session(session_id) and self.backend.update(session_id, messages, fields)
+
+    def _write_back(self, session_id: str, messages: List[Dict], fields: Dict) -> bool:
+        """Cache flush: False keeps the update dirty for the next flush"""
+        if self._write_through(session_id, messages, fields):
+            return True
+        if self.backend.load(session_id) is None:
+            print(f"Dropping update of deleted session {session_id}")
+            return True
+        return False
+
+    def _schedule_maintenance(self):
+        """Queue retention and (at most hourly) idle archiving on the background worker"""
+        if settings.SESSION_RETENTION_POLICY != "off":
+            self._background.submit(self.enforce_retention)
+        now = time.monotonic()
+        if settings.SESSION_ARCHIVE_IDLE_DAYS > 0 and (
+                self._last_idle_check is None or now - self._last_idle_check >= IDLE_CHECK_INTERVAL_S):
+            self._last_idle_check = now
+            self._background.submit(self.archive_idle_sessions)
+
+    def _index_for_search(self, session_id: str, title: Optional[str], messages: List[Dict]):
+        try:
+            if title is None and messages:
+                # First time this session is seen by the index (e.g. after enabling search)
+                if session_id not in self.search.indexed_counts():
+                    session_data = self._load_any(session_id)
+                    title = session_data["title"] if session_data else None
+            self.search.index_session(session_id, title, messages)
+        except Exception as e:
+            print(f"Error indexing session {session_id} for search: {e}")
+
+    def _sync_search(self):
+        try:
+            self.search.sync(self.list_sessions(include_archived=True), self._load_any)
+        except Exception as e:
+            print(f"Error syncing session search index: {e}")
+
+    def _load_any(self, session_id: str) -> Optional[Dict]:
+        """Load a live or archived session without restoring it"""
+        return self.backend.load(session_id) or self.archive.load(session_id)
 
     def generate_title(self, first_message: str) -> str:
         """
@@ -195,28 +480,3 @@ class SessionManager:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         unique_suffix = str(uuid.uuid4())[:8]
         return f"sess_{timestamp}_{unique_suffix}"
-
-    def _get_session_path(self, session_id: str) -> Path:
-        """Get the file path for a session"""
-        return self.storage_path / f"{session_id}.json"
-
-    def _save_session(self, session_id: str, session_data: Dict) -> bool:
-        """
-        Save session data to disk
-
-        Args:
-            session_id: Session identifier
-            session_data: Session data dictionary
-
-        Returns:
-            True if successful, False otherwise
-        """
-        session_file = self._get_session_path(session_id)
-
-        try:
-            with open(session_file, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
-            return True
-        except (IOError, TypeError) as e:
-            print(f"Error saving session {session_id}: {e}")
-            return False
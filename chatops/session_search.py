@@ -0,0 +1,253 @@
+"""
+Full-Text Session Search
+
+An inverted index over session titles and messages, stored in SQLite FTS5
+(sessions/search.db), so the sidebar can find past incident conversations
+by content ("ORA-12541", "Deployment #1234") without loading sessions.
+
+- docs: one row per indexed title/message (session_id, seq; seq -1 is the
+  title), its rowid is the FTS row, so a session's rows are deleted via an
+  ordinary index instead of scanning the FTS table
+- indexed: per session, the indexed title, message count and a hash of the
+  last indexed message; a chat turn that extends the list only indexes the
+  new messages
+
+Results are ranked with BM25 (title matches weigh more), one hit per
+session, with the matched terms highlighted in a snippet. Scoring visits
+every matching row, so a query matching more than MAX_RANKED_MATCHES
+messages (a term that is in most conversations) returns the most recent
+matches instead.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    rowid INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_session ON docs (session_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5 (title, content, tokenize = 'unicode61');
+CREATE TABLE IF NOT EXISTS indexed (
+    session_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    last_hash TEXT
+);
+"""
+
+TITLE_WEIGHT = 5.0
+SNIPPET_TOKENS = 12
+MAX_RANKED_MATCHES = 20000
+HIGHLIGHT = ("**", "**")
+
+
+def fts5_available() -> bool:
+    """Whether the sqlite3 module was built with FTS5"""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5 (x)")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def build_query(text: str) -> Optional[str]:
+    """
+    FTS5 query for free text: every whitespace-separated term must match
+
+    Terms are quoted, so punctuation is matched as a phrase ("ORA-12541"
+    matches the tokens "ora" "12541" next to each other) instead of being
+    parsed as query syntax. The last term also matches as a prefix, so
+    results appear while typing.
+    """
+    terms = [t for t in text.split() if re.search(r"\w", t)]
+    if not terms:
+        return None
+    quoted = ['"' + t.replace('"', '""') + '"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _message_hash(message: Dict) -> str:
+    return hashlib.sha1(f"{message.get('role')}\0{message.get('content')}".encode("utf-8")).hexdigest()
+
+
+class SessionSearchIndex:
+    """Incrementally updated full-text index of sessions"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize SessionSearchIndex
+
+        Args:
+            db_path: Path of the index database (created if missing)
+        """
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def index_session(self, session_id: str, title: Optional[str], messages: List[Dict]):
+        """
+        Bring the index of one session up to date
+
+        Args:
+            session_id: Session identifier
+            title: Current title (None keeps the indexed title)
+            messages: Full message list
+        """
+        with self._write_lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT title, message_count, last_hash FROM indexed WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None and title is None:
+                return
+            indexed_title, count, last_hash = row if row else (None, 0, None)
+
+            if row is not None and 0 < count <= len(messages) and _message_hash(messages[count - 1]) == last_hash:
+                start = count
+            elif row is not None and count == 0:
+                start = 0
+            else:
+                self._delete_docs(conn, session_id, messages_only=True)
+                start = 0
+            self._insert_docs(conn, session_id, [(seq, "", messages[seq].get("content") or "")
+                                                 for seq in range(start, len(messages))])
+
+            title = indexed_title if title is None else title
+            if title != indexed_title:
+                conn.execute(
+                    "DELETE FROM docs_fts WHERE rowid IN (SELECT rowid FROM docs WHERE session_id = ? AND seq = -1)",
+                    (session_id,)
+                )
+                conn.execute("DELETE FROM docs WHERE session_id = ? AND seq = -1", (session_id,))
+                self._insert_docs(conn, session_id, [(-1, title, "")])
+
+            conn.execute(
+                "INSERT OR REPLACE INTO indexed (session_id, title, message_count, last_hash) VALUES (?, ?, ?, ?)",
+                (session_id, title, len(messages), _message_hash(messages[-1]) if messages else None)
+            )
+
+    def remove(self, session_id: str):
+        """Drop a session from the index"""
+        with self._write_lock, self._connection() as conn:
+            self._delete_docs(conn, session_id)
+            conn.execute("DELETE FROM indexed WHERE session_id = ?", (session_id,))
+
+    def indexed_counts(self) -> Dict[str, int]:
+        """{session_id: indexed message count}"""
+        return dict(self._connection().execute("SELECT session_id, message_count FROM indexed").fetchall())
+
+    def sync(self, sessions: Iterable[Dict], load: Callable[[str], Optional[Dict]]) -> int:
+        """
+        Index sessions that are missing or stale and drop deleted ones
+
+        Args:
+            sessions: Metadata of every session (id, title, message_count)
+            load: Loads a full session by id
+
+        Returns:
+            Number of sessions (re)indexed
+        """
+        indexed = self.indexed_counts()
+        seen = set()
+        changed = 0
+        for metadata in sessions:
+            seen.add(metadata["id"])
+            if indexed.get(metadata["id"]) == metadata["message_count"]:
+                continue
+            session_data = load(metadata["id"])
+            if session_data is not None:
+                self.index_session(session_data["id"], session_data["title"], session_data.get("messages", []))
+                changed += 1
+        for session_id in indexed.keys() - seen:
+            self.remove(session_id)
+        return changed
+
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """
+        Sessions matching every term of the query, best first
+
+        Args:
+            text: Free-text query
+            limit: Maximum number of sessions
+
+        Returns:
+            List of {"id", "title", "snippet", "seq", "score"}; seq is the
+            matched message index (-1 for a title match)
+        """
+        query = build_query(text)
+        if query is None:
+            return []
+
+        conn = self._connection()
+        try:
+            matches = conn.execute(
+                "SELECT count(*) FROM docs_fts WHERE docs_fts MATCH ?", (query,)
+            ).fetchone()[0]
+            order = "score" if matches <= MAX_RANKED_MATCHES else "docs_fts.rowid DESC"
+            # Streamed: stops once `limit` distinct sessions have been seen
+            rows = conn.execute(
+                "SELECT d.session_id, d.seq, "
+                "highlight(docs_fts, 0, ?, ?), snippet(docs_fts, 1, ?, ?, '…', ?), "
+                "bm25(docs_fts, ?, 1.0) AS score "
+                "FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid "
+                f"WHERE docs_fts MATCH ? ORDER BY {order}",
+                (*HIGHLIGHT, *HIGHLIGHT, SNIPPET_TOKENS, TITLE_WEIGHT, query)
+            )
+            results = {}
+            for session_id, seq, title_hit, snippet, score in rows:
+                if session_id in results:
+                    continue
+                results[session_id] = {"id": session_id, "snippet": title_hit if seq == -1 else snippet,
+                                       "seq": seq, "score": -score}
+                if len(results) == limit:
+                    break
+        except sqlite3.OperationalError:
+            return []
+
+        if results:
+            placeholders = ", ".join("?" * len(results))
+            titles = dict(conn.execute(
+                f"SELECT session_id, title FROM indexed WHERE session_id IN ({placeholders})", tuple(results)
+            ).fetchall())
+            for result in results.values():
+                result["title"] = titles.get(result["id"], "")
+        return list(results.values())
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _insert_docs(conn: sqlite3.Connection, session_id: str, docs: List[tuple]):
+        for seq, title, content in docs:
+            rowid = conn.execute("INSERT INTO docs (session_id, seq) VALUES (?, ?)", (session_id, seq)).lastrowid
+            conn.execute("INSERT INTO docs_fts (rowid, title, content) VALUES (?, ?, ?)", (rowid, title, content))
+
+    @staticmethod
+    def _delete_docs(conn: sqlite3.Connection, session_id: str, messages_only: bool = False):
+        condition = "session_id = ?" + (" AND seq >= 0" if messages_only else "")
+        conn.execute(
+            f"DELETE FROM docs_fts WHERE rowid IN (SELECT rowid FROM docs WHERE {condition})", (session_id,)
+        )
+        conn.execute(f"DELETE FROM docs WHERE {condition}", (session_id,))
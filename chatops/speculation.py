@@ -0,0 +1,95 @@
+"""
+Speculative Prefetch for ChatOps Routing
+
+While the intent classifier waits on the LLM, the knowledge base search
+(and optionally a cheap system-status call) run in the background. Flows
+that need the results consume them; the rest are cancelled or discarded.
+"""
+
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from knowledge_base.retriever import get_retriever
+from .tools.dynamic_data import get_system_status
+from .perf import perf
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculation")
+
+
+class Speculation:
+    """Background knowledge search / status prefetch for one query"""
+
+    def __init__(self, query: str, prefetch_status: bool = True):
+        """
+        Start speculative work for a query
+
+        Args:
+            query: User query string
+            prefetch_status: Also fetch system status for all components
+        """
+        self.started_at = time.perf_counter()
+        self._knowledge = _executor.submit(self._timed, self._search, query)
+        self._status = _executor.submit(self._timed, self._fetch_status) if prefetch_status else None
+        perf.incr("speculation.started")
+
+    def knowledge(self) -> Optional[List]:
+        """
+        Consume the speculative knowledge search
+
+        Returns:
+            Retrieved documents, or None if the search failed
+        """
+        return self._consume(self._knowledge, "knowledge")
+
+    def system_status(self) -> Optional[Dict]:
+        """
+        Consume the speculative system status prefetch
+
+        Returns:
+            Status of all components, or None if not prefetched or failed
+        """
+        if self._status is None:
+            return None
+        return self._consume(self._status, "status")
+
+    def discard(self) -> None:
+        """Cancel or drop any speculative work that was not consumed"""
+        for name, future in (("knowledge", self._knowledge), ("status", self._status)):
+            if future is None:
+                continue
+            future.cancel()
+            perf.incr(f"speculation.{name}_discarded")
+        self._knowledge = self._status = None
+
+    def _consume(self, future: Future, name: str):
+        consumed_at = time.perf_counter()
+        try:
+            result, started, finished = future.result()
+        except Exception:
+            perf.incr(f"speculation.{name}_failed")
+            return None
+        finally:
+            if name == "knowledge":
+                self._knowledge = None
+            else:
+                self._status = None
+
+        # Work already done before the flow asked for it is latency saved
+        perf.incr(f"speculation.{name}_used")
+        perf.observe(f"speculation.{name}_saved_s", max(0.0, min(finished, consumed_at) - started))
+        return result
+
+    @staticmethod
+    def _timed(fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, started, time.perf_counter()
+
+    @staticmethod
+    def _search(query: str) -> List:
+        return get_retriever().search_documents(query)
+
+    @staticmethod
+    def _fetch_status() -> Dict:
+        return json.loads(get_system_status.run(component="all"))
@@ -0,0 +1,485 @@
+"""
+In-process Time-Series Store for the Dynamic Data Tools
+
+Each metric keeps:
+1. A NumPy ring buffer of recent raw points (timestamp, value)
+2. Pre-aggregated rollups at 1 s / 1 m / 1 h (sum, count, min, max per bucket)
+
+Window queries are answered from the rollups: the coarsest buckets that fit
+inside the window are used, and only the edges fall back to finer levels,
+so "last_hour" or "today" costs O(buckets) instead of a scan of every raw
+point. Windows are resolved to whole seconds; edges older than a level's
+retention (2 h at 1 s, 48 h at 1 m) are snapped to the next coarser bucket.
+
+Points are fed by an ingestion adapter (see IngestionAdapter) polled in a
+background thread; the adapter class is configurable (TIMESERIES_ADAPTER).
+"""
+
+import abc
+import importlib
+import math
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config.settings import settings
+
+# (bucket width in seconds, number of buckets kept), coarsest first
+DEFAULT_LEVELS = ((3600, 24 * 35), (60, 60 * 48), (1, 3600 * 2))
+
+_RELATIVE_RANGE = re.compile(r"^last_(\d+)\s*(s|m|h|d)$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def resolve_time_range(time_range: str, now: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Map a named time range to a [start, end) window of epoch seconds
+
+    Args:
+        time_range: "last_hour", "last_24h", "today", "yesterday", "this_week"
+            or "last_<n><s|m|h|d>" (e.g. "last_15m")
+        now: Reference time (defaults to the current time)
+
+    Returns:
+        (start, end) epoch seconds
+
+    Raises:
+        ValueError: If the time range is not recognised
+    """
+    now = time.time() if now is None else now
+    key = (time_range or "today").strip().lower()
+    midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if key == "last_hour":
+        return now - 3600, now
+    if key == "last_24h":
+        return now - 86400, now
+    if key == "today":
+        return midnight.timestamp(), now
+    if key == "yesterday":
+        return (midnight - timedelta(days=1)).timestamp(), midnight.timestamp()
+    if key == "this_week":
+        return (midnight - timedelta(days=midnight.weekday())).timestamp(), now
+
+    match = _RELATIVE_RANGE.match(key)
+    if match:
+        return now - int(match.group(1)) * _UNIT_SECONDS[match.group(2)], now
+    raise ValueError(f"Unknown time range: {time_range}")
+
+
+class Aggregate:
+    """Combinable sum/count/min/max of a window"""
+
+    __slots__ = ("sum", "count", "min", "max")
+
+    def __init__(self, sum_: float = 0.0, count: int = 0, min_: float = math.inf, max_: float = -math.inf):
+        self.sum = sum_
+        self.count = count
+        self.min = min_
+        self.max = max_
+
+    def merge(self, other: "Aggregate") -> "Aggregate":
+        self.sum += other.sum
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_dict(self) -> Dict:
+        empty = self.count == 0
+        return {
+            "sum": self.sum,
+            "count": self.count,
+            "min": None if empty else self.min,
+            "max": None if empty else self.max,
+            "mean": None if empty else self.sum / self.count,
+        }
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of recent (timestamp, value) points"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.head = 0   # next write position
+        self.size = 0
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray):
+        if len(timestamps) >= self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+        n = len(timestamps)
+        first = min(n, self.capacity - self.head)
+        self.timestamps[self.head:self.head + first] = timestamps[:first]
+        self.values[self.head:self.head + first] = values[:first]
+        self.timestamps[:n - first] = timestamps[first:]
+        self.values[:n - first] = values[first:]
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def append(self, timestamp: float, value: float):
+        self.timestamps[self.head] = timestamp
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All buffered points, oldest first"""
+        start = (self.head - self.size) % self.capacity
+        order = (np.arange(self.size) + start) % self.capacity
+        return self.timestamps[order], self.values[order]
+
+
+class Rollup:
+    """
+    Direct-mapped ring of fixed-width buckets
+
+    Bucket k (t // width) lives in slot k % capacity; the slot remembers
+    which bucket it holds, so buckets older than the retention are
+    overwritten and ignored by queries.
+    """
+
+    def __init__(self, width: int, capacity: int):
+        self.width = width
+        self.capacity = capacity
+        self.bucket = np.full(capacity, -1, dtype=np.int64)
+        self.sum = np.zeros(capacity, dtype=np.float64)
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.min = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+        self.latest = -1  # newest bucket seen
+
+    def retains(self, timestamp: float) -> bool:
+        """Whether the bucket holding this timestamp is still within retention"""
+        return timestamp // self.width > self.latest - self.capacity
+
+    def add(self, timestamps: np.ndarray, values: np.ndarray):
+        buckets = (timestamps // self.width).astype(np.int64)
+        # Drop points for buckets already evicted (too late to keep)
+        keep = buckets > buckets.max() - self.capacity
+        keep &= buckets >= self.bucket[buckets % self.capacity]
+        buckets, values = buckets[keep], values[keep]
+        if not len(buckets):
+            return
+
+        self.latest = max(self.latest, int(buckets.max()))
+        slots = buckets % self.capacity
+        # Reset slots that now start a newer bucket (latest bucket per slot wins)
+        touched, inverse = np.unique(slots, return_inverse=True)
+        newest = np.full(len(touched), -1, dtype=np.int64)
+        np.maximum.at(newest, inverse, buckets)
+        newer = newest > self.bucket[touched]
+        stale = touched[newer]
+        self.bucket[stale] = newest[newer]
+        self.sum[stale] = 0.0
+        self.count[stale] = 0
+        self.min[stale] = np.inf
+        self.max[stale] = -np.inf
+
+        current = buckets == self.bucket[slots]
+        slots, values = slots[current], values[current]
+        np.add.at(self.sum, slots, values)
+        np.add.at(self.count, slots, 1)
+        np.minimum.at(self.min, slots, values)
+        np.maximum.at(self.max, slots, values)
+
+    def add_point(self, timestamp: float, value: float):
+        """Scalar version of add() (avoids array overhead for single points)"""
+        bucket = int(timestamp // self.width)
+        if bucket <= self.latest - self.capacity:
+            return
+        slot = bucket % self.capacity
+        held = self.bucket[slot]
+        if bucket < held:
+            return
+        if bucket > held:
+            self.bucket[slot] = bucket
+            self.sum[slot] = 0.0
+            self.count[slot] = 0
+            self.min[slot] = value
+            self.max[slot] = value
+        self.latest = max(self.latest, bucket)
+        self.sum[slot] += value
+        self.count[slot] += 1
+        if value < self.min[slot]:
+            self.min[slot] = value
+        if value > self.max[slot]:
+            self.max[slot] = value
+
+    def aggregate(self, first_bucket: int, last_bucket: int) -> Aggregate:
+        """Aggregate of buckets [first_bucket, last_bucket)"""
+        if last_bucket <= first_bucket:
+            return Aggregate()
+        buckets = np.arange(max(first_bucket, last_bucket - self.capacity), last_bucket, dtype=np.int64)
+        slots = buckets % self.capacity
+        held = self.bucket[slots] == buckets
+        if not held.any():
+            return Aggregate()
+        slots = slots[held]
+        return Aggregate(float(self.sum[slots].sum()), int(self.count[slots].sum()),
+                         float(self.min[slots].min()), float(self.max[slots].max()))
+
+
+class _Series:
+    def __init__(self, raw_capacity: int, levels):
+        self.raw = RingBuffer(raw_capacity)
+        self.rollups = [Rollup(width, capacity) for width, capacity in levels]
+        self.last_ts = None
+
+
+class TimeSeriesStore:
+    """Thread-safe metric store with raw ring buffers and rollups"""
+
+    def __init__(self, raw_capacity: int = None, levels=DEFAULT_LEVELS):
+        """
+        Initialize TimeSeriesStore
+
+        Args:
+            raw_capacity: Raw points kept per metric
+            levels: (bucket width s, buckets kept) per rollup level, coarsest
+                first; the finest width must divide all coarser widths
+        """
+        self.raw_capacity = raw_capacity or settings.TIMESERIES_RAW_CAPACITY
+        self.levels = tuple(sorted(levels, reverse=True))
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.RLock()
+        self.points_ingested = 0
+
+    def ingest(self, metric: str, timestamp: float, value: float):
+        """Add a single point"""
+        timestamp, value = float(timestamp), float(value)
+        with self._lock:
+            series = self._get_series(metric)
+            series.raw.append(timestamp, value)
+            for rollup in series.rollups:
+                rollup.add_point(timestamp, value)
+            series.last_ts = max(series.last_ts or 0.0, timestamp)
+            self.points_ingested += 1
+
+    def ingest_many(self, metric: str, timestamps, values):
+        """
+        Add a batch of points (vectorized; preferred for high-rate feeds)
+
+        Args:
+            metric: Metric name (e.g. "trade_volume")
+            timestamps: Epoch seconds, ideally in time order
+            values: Point values
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if not len(timestamps):
+            return
+        with self._lock:
+            series = self._get_series(metric)
+            series.raw.extend(timestamps, values)
+            for rollup in series.rollups:
+                rollup.add(timestamps, values)
+            series.last_ts = max(series.last_ts or 0.0, float(timestamps.max()))
+            self.points_ingested += len(timestamps)
+
+    def _get_series(self, metric: str) -> _Series:
+        series = self._series.get(metric)
+        if series is None:
+            series = self._series[metric] = _Series(self.raw_capacity, self.levels)
+        return series
+
+    def aggregate(self, metric: str, start: float, end: float) -> Dict:
+        """
+        Aggregate a metric over [start, end)
+
+        Args:
+            metric: Metric name
+            start: Window start (epoch seconds, floored to the finest bucket)
+            end: Window end (epoch seconds, ceiled to the finest bucket)
+
+        Returns:
+            {"sum", "count", "min", "max", "mean"} (min/max/mean None if empty)
+        """
+        with self._lock:
+            series = self._series.get(metric)
+            if series is None:
+                return Aggregate().to_dict()
+            finest = self.levels[-1][0]
+            first = int(start // finest) * finest
+            last = int(math.ceil(end / finest)) * finest
+            return self._aggregate(series, first, last, 0).to_dict()
+
+    def _aggregate(self, series: _Series, start: int, end: int, level: int) -> Aggregate:
+        """Cover [start, end) with whole buckets of this level; edges go one level finer"""
+        if end <= start:
+            return Aggregate()
+        rollup = series.rollups[level]
+        if level == len(series.rollups) - 1:
+            return rollup.aggregate(start // rollup.width, end // rollup.width)
+
+        first = -(-start // rollup.width)  # ceil
+        last = end // rollup.width
+        if first >= last:
+            return self._aggregate(series, start, end, level + 1)
+        result = rollup.aggregate(first, last)
+        result.merge(self._edge(series, start, first * rollup.width, level, first - 1))
+        result.merge(self._edge(series, last * rollup.width, end, level, last))
+        return result
+
+    def _edge(self, series: _Series, start: int, end: int, level: int, bucket: int) -> Aggregate:
+        """
+        Partial bucket at a window edge
+
+        Answered one level finer while that level still retains it; older
+        edges are snapped to the nearest bucket boundary of this level.
+        """
+        if end <= start:
+            return Aggregate()
+        if series.rollups[level + 1].retains(start):
+            return self._aggregate(series, start, end, level + 1)
+        rollup = series.rollups[level]
+        if end - start >= rollup.width / 2:
+            return rollup.aggregate(bucket, bucket + 1)
+        return Aggregate()
+
+    def query(self, metric: str, time_range: str, now: Optional[float] = None) -> Dict:
+        """
+        Aggregate a metric over a named time range
+
+        Args:
+            metric: Metric name
+            time_range: Named range (see resolve_time_range)
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Aggregate dict plus the resolved "start"/"end"
+        """
+        start, end = resolve_time_range(time_range, now)
+        result = self.aggregate(metric, start, end)
+        result.update({"start": start, "end": end})
+        return result
+
+    def raw_points(self, metric: str, since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Buffered raw points of a metric (optionally only those at/after since)"""
+        with self._lock:
+            series = self._series.get(metric)
+            if series is None:
+                return np.empty(0), np.empty(0)
+            timestamps, values = series.raw.points()
+        if since is not None:
+            mask = timestamps >= since
+            timestamps, values = timestamps[mask], values[mask]
+        return timestamps, values
+
+    def metrics(self) -> List[str]:
+        with self._lock:
+            return sorted(self._series)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "metrics": len(self._series),
+                "points_ingested": self.points_ingested,
+                "last_point": {m: s.last_ts for m, s in self._series.items()},
+            }
+
+
+class IngestionAdapter(abc.ABC):
+    """
+    Source of metric points for the store
+
+    Subclasses implement poll(); it is called every poll interval from the
+    ingestion thread and returns the points that arrived since the last call.
+    """
+
+    def backfill(self, now: float) -> Iterable[Tuple[str, np.ndarray, np.ndarray]]:
+        """Historical points loaded once at startup"""
+        return []
+
+    @abc.abstractmethod
+    def poll(self, now: float) -> Iterable[Tuple[str, np.ndarray, np.ndarray]]:
+        """
+        New points since the previous poll
+
+        Returns:
+            Iterable of (metric, timestamps, values) batches
+        """
+
+
+class SimulatedTradeFeed(IngestionAdapter):
+    """Synthetic trade ticks (notional in USD) until a real feed is wired in"""
+
+    def __init__(self, trades_per_s: float = 5.0, backfill_s: float = 86400, seed: Optional[int] = None):
+        self.trades_per_s = trades_per_s
+        self.backfill_s = backfill_s
+        self.rng = np.random.default_rng(seed)
+        self.last_poll = None
+
+    def _ticks(self, start: float, end: float):
+        n = self.rng.poisson(max(end - start, 0) * self.trades_per_s)
+        timestamps = np.sort(self.rng.uniform(start, end, n))
+        notional = np.round(self.rng.lognormal(mean=6.0, sigma=1.0, size=n), 2)
+        return [("trade_volume", timestamps, notional)]
+
+    def backfill(self, now: float):
+        self.last_poll = now
+        return self._ticks(now - self.backfill_s, now)
+
+    def poll(self, now: float):
+        start, self.last_poll = self.last_poll or now, now
+        return self._ticks(start, now)
+
+
+class IngestionWorker:
+    """Polls an adapter in a daemon thread and writes into a store"""
+
+    def __init__(self, store: TimeSeriesStore, adapter: IngestionAdapter, interval_s: float = None):
+        self.store = store
+        self.adapter = adapter
+        self.interval_s = interval_s or settings.TIMESERIES_POLL_INTERVAL_S
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._write(self.adapter.backfill(time.time()))
+        self._thread = threading.Thread(target=self._loop, name="timeseries-ingest", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self._write(self.adapter.poll(time.time()))
+            except Exception:
+                # A failing feed must not kill ingestion; the next poll retries
+                continue
+
+    def _write(self, batches):
+        for metric, timestamps, values in batches:
+            self.store.ingest_many(metric, timestamps, values)
+
+
+def load_adapter(path: str) -> IngestionAdapter:
+    """Instantiate an adapter from "simulated" or a "package.module:ClassName" path"""
+    if path == "simulated":
+        return SimulatedTradeFeed()
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+_store = None
+_worker = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> TimeSeriesStore:
+    """Process-wide store; ingestion starts on first use"""
+    global _store, _worker
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = TimeSeriesStore()
+                _worker = IngestionWorker(store, load_adapter(settings.TIMESERIES_ADAPTER)).start()
+                _store = store
+    return _store
@@ -1,43 +1,93 @@
 from crewai.tools import BaseTool
 import random
 import json
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from pydantic import BaseModel, Field
+from config.settings import settings
+from config.tracing import traced
+from ..timeseries import get_store, resolve_time_range
+from ..datasources import DataSourceError, get_prometheus_source, get_status_source, run_sync
+from .tool_cache import tool_cache
+
+# Components reported by the system status endpoint
+COMPONENTS = ["OrderMatching", "Gateway", "RiskEngine"]
 
 class GetTradeVolumeInput(BaseModel):
     time_range: str = Field(..., description="The time range for the volume (e.g., 'last_hour', 'today').")
 
 class GetTradeVolumeTool(BaseTool):
     name: str = "Get Trade Volume"
-    description: str = "Get the trade volume for a specific time range."
+    description: str = "Get the trade volume for a specific time range. cache_age_s is the age of the data in seconds."
     args_schema: type[BaseModel] = GetTradeVolumeInput
 
+    @traced("tool.get_trade_volume")
     def _run(self, time_range: str) -> str:
-        # Mock data
-        volume = random.randint(1000, 50000)
-        return json.dumps({"metric": "trade_volume", "value": volume, "unit": "USD", "time_range": time_range})
+        # Keyed by source too: Prometheus and the local store windows differ
+        source = "local" if get_prometheus_source() is None else "prometheus"
+        try:
+            window, age = tool_cache.get(
+                ("trade_volume", source, time_range),
+                settings.TOOL_CACHE_VOLUME_TTL_S,
+                lambda: _fetch_trade_volume(time_range)
+            )
+        except (ValueError, DataSourceError) as e:
+            return json.dumps({"error": str(e)})
+        result = {
+            "metric": "trade_volume",
+            "value": round(window["sum"], 2),
+            "unit": "USD",
+            "time_range": time_range,
+            "cache_age_s": round(age, 1)
+        }
+        if window.get("count") is not None:
+            result["trades"] = window["count"]
+        return json.dumps(result)
+
+
+def _fetch_trade_volume(time_range: str) -> dict:
+    """Trade volume window from the metrics backend, or the local time-series store"""
+    source = get_prometheus_source()
+    if source is None:
+        return get_store().query("trade_volume", time_range)
+    start, end = resolve_time_range(time_range)
+    return {"sum": run_sync(source.query_window(settings.DATASOURCE_TRADE_VOLUME_QUERY, start, end)), "count": None}
 
 class GetSystemStatusInput(BaseModel):
     component: Optional[str] = Field("all", description="The component to check (e.g., 'OrderMatching', 'Gateway') or 'all'.")
 
 class GetSystemStatusTool(BaseTool):
     name: str = "Get System Status"
-    description: str = "Get the current status of system components."
+    description: str = "Get the current status of system components. cache_age_s is the age of the data in seconds."
     args_schema: type[BaseModel] = GetSystemStatusInput
 
+    @traced("tool.get_system_status")
     def _run(self, component: Optional[str] = "all") -> str:
-        statuses = ["Healthy", "Degraded", "Down"]
-        components = ["OrderMatching", "Gateway", "RiskEngine"]
-        
-        if not component:
-            component = "all"
-            
-        if component == "all":
-            result = {c: random.choice(statuses) for c in components}
+        # One fetch of "all" serves every per-component query within the TTL
+        try:
+            statuses, age = tool_cache.get(("system_status", "all"), settings.TOOL_CACHE_STATUS_TTL_S, _fetch_all_statuses)
+        except DataSourceError as e:
+            return json.dumps({"error": str(e)})
+
+        if not component or component.lower() == "all":
+            result = dict(statuses)
         else:
-            result = {component: random.choice(statuses)}
-            
-        return json.dumps(result)
+            name = next((c for c in statuses if c.lower() == component.lower()), None)
+            if name is None:
+                return json.dumps({"error": f"Unknown component '{component}'. Known components: {', '.join(statuses)}"})
+            result = {name: statuses[name]}
+
+        return json.dumps({"status": result, "cache_age_s": round(age, 1)})
+
+
+def _fetch_all_statuses() -> dict:
+    source = get_status_source()
+    if source is not None:
+        return run_sync(source.fetch_statuses())
+
+    # Mock data
+    statuses = ["Healthy", "Degraded", "Down"]
+    return {c: random.choice(statuses) for c in COMPONENTS}
 
 class GetMatchCountInput(BaseModel):
     dummy_arg: Optional[str] = Field("", description="Ignored argument.")
@@ -47,9 +97,67 @@ class GetMatchCountTool(BaseTool):
     description: str = "Get the number of matched orders today."
     args_schema: type[BaseModel] = GetMatchCountInput
 
+    @traced("tool.get_match_count")
     def _run(self, dummy_arg: Optional[str] = "") -> str:
-        return json.dumps({"metric": "match_count", "value": random.randint(500, 2000)})
+        # Every trade tick is one matched order; only the local store counts ticks
+        try:
+            count, age = tool_cache.get(
+                ("match_count", "today"),
+                settings.TOOL_CACHE_VOLUME_TTL_S,
+                lambda: get_store().query("trade_volume", "today").get("count")
+            )
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if count is None:
+            return json.dumps({"error": "match count is not available from the trade volume source"})
+        return json.dumps({"metric": "match_count", "value": count, "cache_age_s": round(age, 1)})
+
+class MetricRequest(BaseModel):
+    metric: str = Field(..., description="One of 'trade_volume', 'match_count', 'system_status'.")
+    time_range: Optional[str] = Field("today", description="Time range for trade_volume (e.g., 'last_hour', 'today').")
+    component: Optional[str] = Field("all", description="Component for system_status (e.g., 'Gateway') or 'all'.")
+
+class GetMetricsBatchInput(BaseModel):
+    requests: List[MetricRequest] = Field(..., description="All metrics needed to answer the question.")
+
+# Backend fetches of one batch run concurrently
+_batch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="metrics-batch")
+
+class GetMetricsBatchTool(BaseTool):
+    name: str = "Get Metrics Batch"
+    description: str = (
+        "Fetch several metrics in one step. Pass a list of requests, each with a metric "
+        "('trade_volume' with time_range, 'match_count', or 'system_status' with component). "
+        "Prefer this over calling the single-metric tools one by one."
+    )
+    args_schema: type[BaseModel] = GetMetricsBatchInput
+
+    @traced("tool.get_metrics_batch")
+    def _run(self, requests: List) -> str:
+        requests = [r if isinstance(r, MetricRequest) else MetricRequest(**r) for r in requests]
+        futures = [_batch_executor.submit(_fetch_metric, r) for r in requests]
+        results = [future.result() for future in futures]
+        return json.dumps({
+            "results": results,
+            "cache_age_s": max((r.pop("cache_age_s", 0) for r in results), default=0)
+        }, separators=(",", ":"))
+
+
+def _fetch_metric(request: MetricRequest) -> dict:
+    """Single batch item, tagged with what was requested"""
+    if request.metric == "trade_volume":
+        result = json.loads(get_trade_volume.run(time_range=request.time_range or "today"))
+        result.pop("metric", None)
+        return {"metric": "trade_volume", **result}
+    if request.metric == "match_count":
+        result = json.loads(get_match_count.run())
+        result.pop("metric", None)
+        return {"metric": "match_count", **result}
+    if request.metric == "system_status":
+        return {"metric": "system_status", **json.loads(get_system_status.run(component=request.component or "all"))}
+    return {"metric": request.metric, "error": "Unknown metric. Use 'trade_volume', 'match_count' or 'system_status'."}
 
 get_trade_volume = GetTradeVolumeTool()
 get_system_status = GetSystemStatusTool()
 get_match_count = GetMatchCountTool()
+get_metrics_batch = GetMetricsBatchTool()
@@ -1,6 +1,7 @@
 from crewai.tools import BaseTool
-from knowledge_base.retriever import KnowledgeRetriever
+from knowledge_base.retriever import get_retriever
 from pydantic import BaseModel, Field
+from config.tracing import traced
 
 class SearchKnowledgeBaseInput(BaseModel):
     search_query: str = Field(..., description="The text string to search for. Example: 'how to deploy'")
@@ -10,6 +11,7 @@ class SearchKnowledgeBaseTool(BaseTool):
     description: str = "Search the static knowledge base (Wiki, SOPs, Jira) for relevant information."
     args_schema: type[BaseModel] = SearchKnowledgeBaseInput
 
+    @traced("tool.search_knowledge_base")
     def _run(self, search_query: str) -> str:
         try:
             # Handle if search_query is passed as dict (CrewAI sometimes does this)
@@ -30,7 +32,7 @@ class SearchKnowledgeBaseTool(BaseTool):
             # Ensure search_query is a string
             search_query = str(search_query) if search_query else ""
 
-            retriever = KnowledgeRetriever()
+            retriever = get_retriever()
             results = retriever.search(search_query)
             if not results:
                 return "No relevant documents found."
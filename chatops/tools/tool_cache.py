@@ -0,0 +1,90 @@
+"""
+Shared Result Cache for the Dynamic Data Tools
+
+Within one turn the data agent often asks for the same data several times
+(status of "all", then of each component). Results are cached per key for
+a tool-specific freshness TTL, and concurrent identical calls are
+single-flighted: one caller fetches, the others wait for its result.
+
+Callers get the age of the result back so tool output can report how stale
+it is.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+from ..perf import perf
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at")
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class ToolCache:
+    """TTL cache with single-flight fetches"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+
+    def get(self, key: Hashable, ttl_s: float, fetch: Callable[[], Any]) -> Tuple[Any, float]:
+        """
+        Cached value for key, fetching it if missing or older than ttl_s
+
+        Args:
+            key: Cache key (e.g. ("system_status", "all"))
+            ttl_s: Freshness TTL in seconds (0 disables caching, but
+                concurrent calls are still coalesced)
+            fetch: Zero-argument callable producing the value
+
+        Returns:
+            (value, age in seconds)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.fetched_at < ttl_s:
+                perf.incr("tool_cache.hits")
+                return entry.value, time.monotonic() - entry.fetched_at
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            perf.incr("tool_cache.coalesced")
+            entry = future.result()
+            return entry.value, time.monotonic() - entry.fetched_at
+
+        perf.incr("tool_cache.misses")
+        try:
+            entry = _Entry(fetch(), time.monotonic())
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = entry
+            self._inflight.pop(key, None)
+        future.set_result(entry)
+        return entry.value, 0.0
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one entry (or all entries)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Shared by all tool instances and crews in the process
+tool_cache = ToolCache()
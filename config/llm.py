@@ -0,0 +1,146 @@
+"""
+LLM Client Factory
+
+Single place where LLM clients are built. Clients are cached per
+configuration and backed by shared keep-alive HTTP connection pools, so the
+ChatOpsCrew / IntentClassifier / HistoryManager instances recreated for
+every chat message reuse open TCP/TLS connections instead of dialing
+OpenAI or Ollama again.
+
+Pool limits, timeouts and retries come from settings (LLM_*). Retries are
+done in one layer only: the OpenAI SDK (max_retries) for OpenAI, LiteLLM
+(num_retries) for CrewAI agents, and the httpx transport for ChatOllama,
+whose client does not retry.
+"""
+
+import threading
+from typing import Optional
+import httpx
+from config.settings import settings
+
+_lock = threading.Lock()
+_http_client = None
+_async_http_client = None
+_clients = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE,
+        keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_S
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.LLM_TIMEOUT_S, connect=settings.LLM_CONNECT_TIMEOUT_S)
+
+
+def http_client() -> httpx.Client:
+    """Process-wide pooled HTTP client for synchronous LLM calls"""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            # No transport retries: the OpenAI SDK retries with backoff (max_retries)
+            _http_client = httpx.Client(timeout=_timeout(), transport=httpx.HTTPTransport(limits=_limits()))
+        return _http_client
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled HTTP client for async LLM calls"""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(
+                timeout=_timeout(), transport=httpx.AsyncHTTPTransport(limits=_limits())
+            )
+        return _async_http_client
+
+
+def get_chat_model(temperature: Optional[float] = None, streaming: bool = False):
+    """
+    LangChain chat model (ChatOllama or ChatOpenAI) on pooled connections
+
+    Args:
+        temperature: Optional sampling temperature (e.g. 0 for classification)
+        streaming: Whether the model is used for token streaming
+
+    Returns:
+        Cached chat model instance for this configuration
+    """
+    key = ("chat", settings.USE_LOCAL_LLM, temperature, streaming)
+    with _lock:
+        if key in _clients:
+            return _clients[key]
+
+    if settings.USE_LOCAL_LLM:
+        from langchain_ollama import ChatOllama
+
+        # ollama.Client / ollama.AsyncClient build their own httpx clients from
+        # these kwargs; caching the model instance is what keeps those pools
+        # alive across requests. The ollama client does not retry, so
+        # connection failures are retried by the transport.
+        kwargs = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        client = ChatOllama(
+            model=settings.OLLAMA_MODEL_NAME,
+            base_url=settings.OLLAMA_BASE_URL,
+            client_kwargs={"timeout": _timeout()},
+            sync_client_kwargs={
+                "transport": httpx.HTTPTransport(limits=_limits(), retries=settings.LLM_MAX_RETRIES),
+            },
+            async_client_kwargs={
+                "transport": httpx.AsyncHTTPTransport(limits=_limits(), retries=settings.LLM_MAX_RETRIES),
+            },
+            **kwargs
+        )
+    else:
+        from langchain_openai import ChatOpenAI
+
+        kwargs = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        client = ChatOpenAI(
+            model=settings.OPENAI_MODEL_NAME,
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            streaming=streaming,
+            timeout=settings.LLM_TIMEOUT_S,
+            max_retries=settings.LLM_MAX_RETRIES,
+            http_client=http_client(),
+            http_async_client=async_http_client(),
+            **kwargs
+        )
+
+    with _lock:
+        return _clients.setdefault(key, client)
+
+
+def get_agent_llm():
+    """
+    LLM for CrewAI agents
+
+    Returns:
+        CrewAI LLM (LiteLLM) for Ollama, or the pooled ChatOpenAI model
+    """
+    if not settings.USE_LOCAL_LLM:
+        return get_chat_model()
+
+    key = ("agent", settings.OLLAMA_MODEL_NAME, settings.OLLAMA_BASE_URL)
+    with _lock:
+        if key in _clients:
+            return _clients[key]
+
+    from crewai import LLM
+
+    # LiteLLM keeps its own cached httpx clients for the Ollama provider, so
+    # caching the LLM is enough; its module-wide sessions are left alone
+    client = LLM(
+        model=f"ollama/{settings.OLLAMA_MODEL_NAME}",
+        base_url=settings.OLLAMA_BASE_URL,
+        timeout=settings.LLM_TIMEOUT_S,
+        num_retries=settings.LLM_MAX_RETRIES
+    )
+    with _lock:
+        return _clients.setdefault(key, client)
@@ -19,6 +19,15 @@ class Settings:
         os.environ["OPENAI_API_KEY"] = "NA"
         
     OPENAI_MODEL_NAME = os.getenv("OPENAI_MODEL_NAME", "gpt-4-turbo-preview")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # None = api.openai.com
+
+    # LLM HTTP Clients (shared keep-alive pool, see config/llm.py)
+    LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "120"))
+    LLM_CONNECT_TIMEOUT_S = float(os.getenv("LLM_CONNECT_TIMEOUT_S", "10"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+    LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+    LLM_KEEPALIVE_EXPIRY_S = float(os.getenv("LLM_KEEPALIVE_EXPIRY_S", "60"))
     
     # Vector DB Paths
     VECTOR_DB_PATH = os.path.join(os.path.dirname(__file__), "../knowledge_base/faiss_index")
@@ -26,13 +35,98 @@ class Settings:
     # Mock Data Settings
     SIMULATE_ALERTS = True
 
+    # Time-Series Store (backs the dynamic data tools, see chatops/timeseries.py)
+    TIMESERIES_ADAPTER = os.getenv("TIMESERIES_ADAPTER", "simulated")  # or "package.module:ClassName"
+    TIMESERIES_POLL_INTERVAL_S = float(os.getenv("TIMESERIES_POLL_INTERVAL_S", "1"))
+    TIMESERIES_RAW_CAPACITY = int(os.getenv("TIMESERIES_RAW_CAPACITY", "100000"))
+
+    # Data-Source Backends for the data tools (unset URL = built-in data)
+    DATASOURCE_PROMETHEUS_URL = os.getenv("DATASOURCE_PROMETHEUS_URL", "")
+    DATASOURCE_TRADE_VOLUME_QUERY = os.getenv(
+        "DATASOURCE_TRADE_VOLUME_QUERY", "sum(increase(trade_notional_usd_total[{window}]))"
+    )
+    DATASOURCE_STATUS_URL = os.getenv("DATASOURCE_STATUS_URL", "")
+    DATASOURCE_STATUS_PATH = os.getenv("DATASOURCE_STATUS_PATH", "/status")
+    DATASOURCE_TIMEOUT_S = float(os.getenv("DATASOURCE_TIMEOUT_S", "5"))
+    DATASOURCE_MAX_CONCURRENCY = int(os.getenv("DATASOURCE_MAX_CONCURRENCY", "10"))
+    DATASOURCE_MAX_CONNECTIONS = int(os.getenv("DATASOURCE_MAX_CONNECTIONS", "20"))
+    DATASOURCE_BREAKER_FAILURES = int(os.getenv("DATASOURCE_BREAKER_FAILURES", "5"))
+    DATASOURCE_BREAKER_RESET_S = float(os.getenv("DATASOURCE_BREAKER_RESET_S", "30"))
+
+    # Data Tool Result Cache (freshness TTL per tool; 0 = always fetch)
+    TOOL_CACHE_STATUS_TTL_S = float(os.getenv("TOOL_CACHE_STATUS_TTL_S", "5"))
+    TOOL_CACHE_VOLUME_TTL_S = float(os.getenv("TOOL_CACHE_VOLUME_TTL_S", "10"))
+
     # Session Management
     SESSIONS_DIR = os.path.join(os.path.dirname(__file__), "../sessions")
     MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "50"))
+    SESSION_RETENTION_POLICY = os.getenv("SESSION_RETENTION_POLICY", "archive")  # "archive", "evict" or "off"
+    SESSION_ARCHIVE_IDLE_DAYS = float(os.getenv("SESSION_ARCHIVE_IDLE_DAYS", "30"))  # 0 disables idle archiving
+    SESSION_ARCHIVE_CODEC = os.getenv("SESSION_ARCHIVE_CODEC", "")  # "zstd", "zlib" or "" (zstd if installed)
+    SESSION_LIST_PAGE_SIZE = int(os.getenv("SESSION_LIST_PAGE_SIZE", "30"))
+    SESSION_MESSAGE_WINDOW = int(os.getenv("SESSION_MESSAGE_WINDOW", "30"))  # messages rendered per page
+    SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "64"))  # 0 disables the write-back cache
+    SESSION_FLUSH_INTERVAL_S = float(os.getenv("SESSION_FLUSH_INTERVAL_S", "1"))
+    SESSION_SEARCH_ENABLED = os.getenv("SESSION_SEARCH_ENABLED", "true").lower() == "true"
     SESSION_TITLE_MAX_LENGTH = int(os.getenv("SESSION_TITLE_MAX_LENGTH", "50"))
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "jsonl")  # "jsonl", "json" or "sqlite"
+    SESSION_FSYNC = os.getenv("SESSION_FSYNC", "interval")  # "always", "interval" or "never"
+    SESSION_FSYNC_INTERVAL_S = float(os.getenv("SESSION_FSYNC_INTERVAL_S", "1"))
+    SESSION_COMPACT_AFTER = int(os.getenv("SESSION_COMPACT_AFTER", "32"))
+
+    # Chat History Compaction
+    HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1500"))
+    HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "3"))
+    HISTORY_SUMMARY_MAX_WORDS = int(os.getenv("HISTORY_SUMMARY_MAX_WORDS", "150"))
 
     # Intent Classification
     ROUTING_CONFIDENCE_THRESHOLD = float(os.getenv("ROUTING_CONFIDENCE_THRESHOLD", "0.8"))
     USE_KEYWORD_ROUTING = os.getenv("USE_KEYWORD_ROUTING", "true").lower() == "true"
 
+    # DATA-intent fast path (direct tool calls, no agent loop)
+    USE_DATA_FAST_PATH = os.getenv("USE_DATA_FAST_PATH", "true").lower() == "true"
+
+    # Speculative prefetch while the LLM intent classifier runs
+    USE_SPECULATIVE_RETRIEVAL = os.getenv("USE_SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+    SPECULATIVE_STATUS_PREFETCH = os.getenv("SPECULATIVE_STATUS_PREFETCH", "true").lower() == "true"
+
+    # Semantic answer cache (KNOWLEDGE intent only)
+    USE_ANSWER_CACHE = os.getenv("USE_ANSWER_CACHE", "true").lower() == "true"
+    ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.92"))
+    ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "500"))
+    ANSWER_CACHE_TTL_S = float(os.getenv("ANSWER_CACHE_TTL_S", "86400"))
+
+    # Admission Control (process-wide limit on concurrent ChatOps requests)
+    CHATOPS_MAX_CONCURRENT = int(os.getenv("CHATOPS_MAX_CONCURRENT", "8"))
+    CHATOPS_MAX_QUEUE = int(os.getenv("CHATOPS_MAX_QUEUE", "32"))
+    CHATOPS_QUEUE_TIMEOUT_S = float(os.getenv("CHATOPS_QUEUE_TIMEOUT_S", "60"))
+
+    # AIOps Workflow (metric/log/change collectors run in parallel)
+    AIOPS_COLLECTOR_TIMEOUT_S = float(os.getenv("AIOPS_COLLECTOR_TIMEOUT_S", "15"))
+    AIOPS_CHECKPOINT_DB = os.getenv(  # paused/finished runs per alert_id (human-approval interrupt)
+        "AIOPS_CHECKPOINT_DB", os.path.join(os.path.dirname(__file__), "../checkpoints/aiops.db")
+    )
+    AIOPS_MAX_CONCURRENT_WORKFLOWS = int(os.getenv("AIOPS_MAX_CONCURRENT_WORKFLOWS", "8"))
+    AIOPS_MAX_QUEUED_WORKFLOWS = int(os.getenv("AIOPS_MAX_QUEUED_WORKFLOWS", "200"))
+
+    # Alert Intake (dedup and correlation before RCA, see aiops_workflow/intake.py)
+    ALERT_DEDUP_WINDOW_S = float(os.getenv("ALERT_DEDUP_WINDOW_S", "300"))
+    ALERT_CORRELATION_WINDOW_S = float(os.getenv("ALERT_CORRELATION_WINDOW_S", "120"))
+    ALERT_GROUP_WAIT_S = float(os.getenv("ALERT_GROUP_WAIT_S", "30"))
+    ALERT_DISPATCH_RETRY_S = float(os.getenv("ALERT_DISPATCH_RETRY_S", "5"))  # retry delay while the executor is full
+
+    # Log Scanner for log_agent (unset LOG_SCAN_PATHS = built-in mock logs, see aiops_workflow/log_scanner.py)
+    LOG_SCAN_PATHS = os.getenv("LOG_SCAN_PATHS", "")  # comma-separated globs; "{service}" = the alert's service
+    LOG_SCAN_PATTERN = os.getenv("LOG_SCAN_PATTERN", "")  # line regex; "" = errors, exceptions, timeouts
+    LOG_SCAN_BEFORE_S = float(os.getenv("LOG_SCAN_BEFORE_S", "600"))
+    LOG_SCAN_AFTER_S = float(os.getenv("LOG_SCAN_AFTER_S", "60"))
+    LOG_SCAN_MAX_RESULTS = int(os.getenv("LOG_SCAN_MAX_RESULTS", "50"))  # distinct messages returned
+    LOG_SCAN_MAX_MATCHES = int(os.getenv("LOG_SCAN_MAX_MATCHES", "100000"))
+
+    # Request Tracing (per-stage spans written to a rotating JSONL file)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(os.path.dirname(__file__), "../traces/chatops_trace.jsonl"))
+    TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+    TRACE_BACKUP_COUNT = int(os.getenv("TRACE_BACKUP_COUNT", "3"))
+
 settings = Settings()
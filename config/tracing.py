@@ -0,0 +1,254 @@
+"""
+Lightweight Span Tracing
+
+Spans (ChatOps request path, knowledge base retrieval) are written as JSON
+lines to a local rotating trace file and can be aggregated into a
+per-stage p50/p95 summary. Nested spans share a trace id (propagated
+through contextvars).
+
+Generators must not hold the current span across a yield (the consumer
+would run inside it). They use open_span(), which times the whole stream
+without becoming current, and activate() it around each step.
+
+When TRACING_ENABLED is false, span() returns a shared no-op object and
+@traced calls the wrapped function directly, so the overhead is one
+attribute lookup per instrumented call.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+from config.settings import settings
+
+_current_span = contextvars.ContextVar("chatops_current_span", default=None)
+_logger = None
+_logger_lock = threading.Lock()
+_summary_cache = (None, None)  # (trace file (path, mtime, size) tuple, rows)
+_summary_lock = threading.Lock()
+
+
+class _NoopSpan:
+    """Returned by span() when tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def activate(self):
+        return self
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed stage; written to the trace file when it ends"""
+
+    __slots__ = ("name", "attrs", "trace_id", "span_id", "parent_id", "start", "_t0", "_token", "_parent", "_current")
+
+    def __init__(self, name: str, attrs: Dict, parent: "Span" = None, current: bool = True):
+        self.name = name
+        self.attrs = attrs
+        self._parent = parent
+        self._current = current
+        self._token = None
+
+    def set(self, **attrs):
+        """Attach attributes (e.g. the routed intent) to the span"""
+        self.attrs.update(attrs)
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this span current for one step (spans opened inside nest under it)"""
+        token = _current_span.set(self)
+        try:
+            yield self
+        finally:
+            _current_span.reset(token)
+
+    def __enter__(self):
+        parent = self._parent or _current_span.get()
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = uuid.uuid4().hex[:16]
+        if self._current:
+            self._token = _current_span.set(self)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._t0
+        if self._token is not None:
+            _current_span.reset(self._token)
+
+        record = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(duration * 1000, 3),
+            "status": "error" if exc_type else "ok",
+        }
+        if exc_type:
+            record["error"] = repr(exc)[:200]
+        if self.attrs:
+            record["attrs"] = self.attrs
+        _get_logger().info(json.dumps(record, default=str))
+        return False
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a stage
+
+    Args:
+        name: Stage name (e.g. "intent.classify")
+        **attrs: Optional attributes recorded with the span
+
+    Returns:
+        Span, or a no-op when tracing is disabled
+    """
+    if not settings.TRACING_ENABLED:
+        return _NOOP_SPAN
+    return Span(name, attrs)
+
+
+def open_span(name: str, parent: Optional[Span] = None, **attrs):
+    """
+    Span that times its with-block without becoming the current span
+
+    For generators: the block may contain yields. Wrap each step in
+    span.activate() so the spans it opens nest under this one.
+
+    Args:
+        name: Stage name (e.g. "chatops.request")
+        parent: Parent span (default: the current span when the block starts)
+        **attrs: Optional attributes recorded with the span
+
+    Returns:
+        Span, or a no-op when tracing is disabled
+    """
+    if not settings.TRACING_ENABLED:
+        return _NOOP_SPAN
+    return Span(name, attrs, parent=parent, current=False)
+
+
+def current_span():
+    """Innermost active span (no-op when tracing is disabled or outside a span)"""
+    if not settings.TRACING_ENABLED:
+        return _NOOP_SPAN
+    return _current_span.get() or _NOOP_SPAN
+
+
+def traced(name: Optional[str] = None):
+    """Decorator wrapping a function call in a span"""
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.TRACING_ENABLED:
+                return fn(*args, **kwargs)
+            with Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _get_logger() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                os.makedirs(os.path.dirname(os.path.abspath(settings.TRACE_FILE)), exist_ok=True)
+                handler = RotatingFileHandler(
+                    settings.TRACE_FILE,
+                    maxBytes=settings.TRACE_MAX_BYTES,
+                    backupCount=settings.TRACE_BACKUP_COUNT,
+                    encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("chatops.trace")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+
+def summarize_traces(path: str = None) -> List[Dict]:
+    """
+    Aggregate span durations per stage
+
+    Args:
+        path: Trace file (defaults to settings.TRACE_FILE); rotated backups are included
+
+    Returns:
+        Rows of {stage, count, errors, mean_ms, p50_ms, p95_ms}, slowest p95 first
+        (re-read only when a trace file changed)
+    """
+    global _summary_cache
+    # Imported here so the span path (used outside chatops too) does not depend on it
+    from chatops.perf import percentile
+
+    path = path or settings.TRACE_FILE
+    files = []
+    for file_path in [path] + [f"{path}.{i}" for i in range(1, settings.TRACE_BACKUP_COUNT + 1)]:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+        files.append((file_path, stat.st_mtime_ns, stat.st_size))
+    files = tuple(files)
+    with _summary_lock:
+        if _summary_cache[0] == files:
+            return [dict(row) for row in _summary_cache[1]]
+
+    durations = defaultdict(list)
+    errors = defaultdict(int)
+    for file_path, _, _ in files:
+        try:
+            f = open(file_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            continue  # rotated away since the stat
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                durations[record["name"]].append(record["duration_ms"])
+                if record.get("status") == "error":
+                    errors[record["name"]] += 1
+
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append({
+            "stage": name,
+            "count": len(values),
+            "errors": errors[name],
+            "mean_ms": round(sum(values) / len(values), 1),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+        })
+    rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+    with _summary_lock:
+        _summary_cache = (files, rows)
+    return [dict(row) for row in rows]
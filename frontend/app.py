@@ -21,9 +21,17 @@ os.environ["CREWAI_TELEMETRY_OPT_OUT"] = "true"
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from chatops.crew import ChatOpsCrew
-from aiops_workflow.graph import create_aiops_graph
+from aiops_workflow.graph import get_aiops_app, alert_config
+from aiops_workflow.intake import alert_state
+from aiops_workflow.executor import get_workflow_executor, OverloadedError as WorkflowsOverloadedError
 from knowledge_base.ingest import add_document, get_uploaded_documents, remove_document
-from chatops.session_manager import SessionManager
+from chatops.session_manager import get_session_manager
+from chatops.history import HistoryManager
+from chatops.perf import perf
+from chatops.answer_cache import answer_cache
+from chatops.admission import admission, OverloadedError
+from config.tracing import summarize_traces
+from chatops.datasources import datasource_stats
 from config.settings import settings
 
 st.set_page_config(page_title="Enterprise ChatOps & AIOps", layout="wide")
@@ -177,7 +185,7 @@ with st.sidebar:
     if st.session_state.page == "ChatOps":
         if st.button("➕ New chat", key="new_chat_btn"):
             if st.session_state.session_manager is None:
-                st.session_state.session_manager = SessionManager(settings.SESSIONS_DIR)
+                st.session_state.session_manager = get_session_manager()
             new_session_id = st.session_state.session_manager.create_session("New Chat")
             st.session_state.current_session_id = new_session_id
             st.rerun()
@@ -189,14 +197,22 @@ with st.sidebar:
 
         # Load sessions
         if st.session_state.session_manager is None:
-            st.session_state.session_manager = SessionManager(settings.SESSIONS_DIR)
+            st.session_state.session_manager = get_session_manager()
 
         session_manager = st.session_state.session_manager
-        sessions = session_manager.list_sessions()
+        if "session_list_limit" not in st.session_state:
+            st.session_state.session_list_limit = settings.SESSION_LIST_PAGE_SIZE
+        show_archived = st.session_state.get("show_archived", False)
 
-        # Filter by search
+        # Full-text search over titles and messages, otherwise load one page (+1 to detect more)
         if search:
-            sessions = [s for s in sessions if search.lower() in s["title"].lower()]
+            sessions = session_manager.search_sessions(search, limit=st.session_state.session_list_limit)
+        else:
+            sessions = session_manager.list_sessions(
+                limit=st.session_state.session_list_limit + 1, include_archived=show_archived
+            )
+        has_more = len(sessions) > st.session_state.session_list_limit
+        sessions = sessions[:st.session_state.session_list_limit]
 
         # Initialize current session if needed
         if st.session_state.current_session_id is None and sessions:
@@ -204,12 +220,12 @@ with st.sidebar:
         elif st.session_state.current_session_id is None and not sessions:
             new_id = session_manager.create_session("New Chat")
             st.session_state.current_session_id = new_id
-            sessions = session_manager.list_sessions()
+            sessions = session_manager.list_sessions(limit=st.session_state.session_list_limit)
 
         # Display chat sessions
         for session in sessions:
             session_id = session["id"]
-            title = session["title"]
+            title = ("🗄 " if session.get("archived") else "") + session["title"]
             is_current = (session_id == st.session_state.current_session_id)
 
             # Session row with delete button
@@ -226,15 +242,46 @@ with st.sidebar:
                     ):
                         st.session_state.current_session_id = session_id
                         st.rerun()
+                if session.get("snippet"):
+                    st.caption(session["snippet"])
 
             with col2:
                 # Direct X delete button (no menu)
                 if st.button("✕", key=f"del_{session_id}", help="Delete chat"):
                     session_manager.delete_session(session_id)
-                    remaining = session_manager.list_sessions()
+                    remaining = session_manager.list_sessions(limit=1)
                     st.session_state.current_session_id = remaining[0]["id"] if remaining else None
                     st.rerun()
 
+        if has_more and st.button("Show more", use_container_width=True):
+            st.session_state.session_list_limit += settings.SESSION_LIST_PAGE_SIZE
+            st.rerun()
+        st.checkbox("Show archived", key="show_archived")
+
+        st.markdown("---")
+
+        # Process-wide counters (TTFT, fast path, speculation, ...)
+        with st.expander("⚡ Performance"):
+            st.json(perf.snapshot())
+            st.caption("Knowledge answer cache")
+            st.json(answer_cache.stats())
+            st.caption("Admission control")
+            st.json(admission.stats())
+            if datasource_stats():
+                st.caption("Data sources")
+                st.json(datasource_stats())
+            st.caption("Session archive (disk savings)")
+            st.json(session_manager.archive_stats())
+
+        # Per-stage latency from the trace file
+        if settings.TRACING_ENABLED:
+            with st.expander("🔎 Stage Latency (p50/p95)"):
+                stage_rows = summarize_traces()
+                if stage_rows:
+                    st.dataframe(stage_rows, hide_index=True, use_container_width=True)
+                else:
+                    st.caption("No spans recorded yet.")
+
     # Get current page
     page = st.session_state.get("page", "ChatOps")
 
@@ -243,27 +290,42 @@ if "ChatOps" in page:
     # Get session manager (initialized in sidebar)
     session_manager = st.session_state.session_manager
 
-    # Load current session
+    # Load current session metadata (messages are read per window below)
     current_session_id = st.session_state.current_session_id
-    current_session = session_manager.get_session(current_session_id)
+    session_info = session_manager.get_session_metadata(current_session_id) if current_session_id else None
 
-    if current_session:
-        messages = current_session.get("messages", [])
+    if session_info:
         # Show session title as header
-        st.title(f"💬 {current_session.get('title', 'New Chat')}")
+        st.title(f"💬 {session_info.get('title', 'New Chat')}")
     else:
-        messages = []
         st.title("💬 New Chat")
 
+    # Render only the most recent messages; older ones are loaded on demand
+    window_key = f"message_window_{current_session_id}"
+    window = st.session_state.get(window_key, settings.SESSION_MESSAGE_WINDOW)
+    total_messages = session_info["message_count"] if session_info else 0
+    if total_messages > window:
+        if st.button(f"⬆ Load older messages ({total_messages - window} more)"):
+            st.session_state[window_key] = window + settings.SESSION_MESSAGE_WINDOW
+            st.rerun()
+    visible_messages = session_manager.get_messages(current_session_id, -window) if session_info else []
+
     # Display chat messages
-    for message in messages:
+    for message in visible_messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            if message.get("timings"):
+                timings = message["timings"]
+                st.caption(f"⏱ first token {timings['ttft_s']:.1f}s · total {timings['total_s']:.1f}s")
 
     # Chat Input
     if prompt := st.chat_input("How can I help you?"):
         from datetime import datetime
 
+        # The full session is only needed to answer and save
+        current_session = session_manager.get_session(current_session_id) if session_info else None
+        messages = current_session.get("messages", []) if current_session else []
+
         # Add user message
         user_msg = {"role": "user", "content": prompt, "timestamp": datetime.now().isoformat()}
         messages.append(user_msg)
@@ -273,42 +335,64 @@ if "ChatOps" in page:
 
         # Get response
         with st.chat_message("assistant"):
-            with st.spinner("🤖 CrewAI Agents working..."):
-                try:
-                    # Format history
-                    history_str = "\n".join([f"{m['role']}: {m['content']}" for m in messages[:-1]])
-
-                    crew = ChatOpsCrew()
-                    response = crew.run(prompt, chat_history=history_str)
-
-                    # Convert CrewOutput to string for display and storage
-                    response_str = str(response)
-                    st.markdown(response_str)
-
-                    # Add assistant message
-                    asst_msg = {"role": "assistant", "content": response_str, "timestamp": datetime.now().isoformat()}
-                    messages.append(asst_msg)
-
-                    # Save session
-                    # Generate title from first message if this is a new session
-                    if current_session:
-                        title = current_session.get("title")
-                        if len(messages) == 2 and title == "New Chat":
-                            title = session_manager.generate_title(prompt)
-
-                        session_manager.update_session(
-                            current_session_id,
-                            messages,
-                            title=title
-                        )
-
-                    # Update UI to show new title
-                    st.rerun()
-
-                except Exception as e:
-                    st.error(f"Error: {e}")
-                    import traceback
-                    st.error(traceback.format_exc())
+            try:
+                # Bounded history: recent turns verbatim + rolling summary of older ones
+                history_str, summary = HistoryManager().build(
+                    messages[:-1],
+                    current_session.get("summary") if current_session else None
+                )
+
+                crew = ChatOpsCrew()
+
+                # Show a working indicator until the first token arrives
+                status = st.empty()
+                status.markdown("🤖 CrewAI Agents working...")
+
+                def token_stream():
+                    # Shares the process-wide concurrency limit with ChatOpsCrew.arun
+                    with admission.slot():
+                        for i, token in enumerate(crew.stream(prompt, chat_history=history_str)):
+                            if i == 0:
+                                status.empty()
+                            yield token
+
+                response_str = st.write_stream(token_stream())
+                if not isinstance(response_str, str):
+                    response_str = "".join(str(part) for part in response_str)
+
+                # Add assistant message (only once the stream has completed)
+                asst_msg = {
+                    "role": "assistant",
+                    "content": response_str,
+                    "timestamp": datetime.now().isoformat(),
+                    "timings": dict(crew.last_timings) if "ttft_s" in crew.last_timings else None
+                }
+                messages.append(asst_msg)
+
+                # Save session
+                # Generate title from first message if this is a new session
+                if current_session:
+                    title = current_session.get("title")
+                    if len(messages) == 2 and title == "New Chat":
+                        title = session_manager.generate_title(prompt)
+
+                    session_manager.update_session(
+                        current_session_id,
+                        messages,
+                        title=title,
+                        summary=summary
+                    )
+
+                # Update UI to show new title
+                st.rerun()
+
+            except OverloadedError as e:
+                st.warning(f"⏳ {e}")
+
+            except Exception as e:
+                st.error(f"Error: {e}")
+                import traceback
+                st.error(traceback.format_exc())
 
 # --- AIOps Page ---
 elif "AIOps Dashboard" in page:
@@ -316,45 +400,77 @@ elif "AIOps Dashboard" in page:
     st.markdown("Simulate system alerts and view the automated RCA workflow.")
     
     col1, col2 = st.columns(2)
+    workflows = get_workflow_executor()
     
     with col1:
         alert_type = st.selectbox("Simulate Alert Type", ["High CPU Usage", "API Latency Spike", "Pod Crash"])
         if st.button("Trigger Alert"):
-            st.session_state.alert_triggered = True
-            st.session_state.alert_type = alert_type
-            st.session_state.graph_state = {
-                "alert_id": "ALERT-001",
+            # Each alert is its own checkpointed run (thread_id = alert_id)
+            state = alert_state({
                 "alert_type": alert_type,
                 "alert_details": {"severity": "High", "source": "Production"},
-                "human_approval": None
-            }
+            })
+            st.session_state.alert_id = state["alert_id"]
+            with st.spinner("Running Diagnostic Agents..."):
+                # Runs the collectors and RCA once (on the shared workflow pool),
+                # then pauses at the human-approval interrupt
+                try:
+                    workflows.wait(workflows.submit(state))
+                except WorkflowsOverloadedError as e:
+                    st.error(str(e))
+        
+        executor_stats = workflows.stats()
+        st.caption(f"Workflows: {executor_stats['running']} running, {executor_stats['queued']} queued, "
+                   f"{executor_stats['completed']} completed")
             
     with col2:
-        if st.session_state.get("alert_triggered"):
+        if st.session_state.get("alert_id"):
             st.subheader("Workflow Execution")
             
-            app = create_aiops_graph()
+            # Reruns only read the checkpoint; diagnostics never run again for this alert
+            app = get_aiops_app()
+            config = alert_config(st.session_state.alert_id)
+            snapshot = app.get_state(config)
+            final_state = snapshot.values
+            run = workflows.status(st.session_state.alert_id)
             
-            # Run the graph
-            current_state = st.session_state.graph_state
-            
-            with st.spinner("Running Diagnostic Agents..."):
-                final_state = app.invoke(current_state)
-                st.session_state.graph_state = final_state
-            
-            st.success("Diagnostics Complete")
+            if run and run["status"] in ("queued", "running"):
+                st.info(f"Workflow {run['status']}...")
+            elif run and run["status"] in ("failed", "cancelled", "shed"):
+                st.error(f"Workflow {run['status']}: {run['error'] or ''}")
+            else:
+                st.success("Diagnostics Complete")
             
             st.json(final_state)
             
-            if final_state.get("suggested_action"):
+            if "human_approval" in snapshot.next and final_state.get("suggested_action"):
                 st.info(f"Suggested Action: {final_state['suggested_action']}")
                 
-                if st.button("Approve Action"):
-                    # Re-run with approval
-                    final_state["human_approval"] = True
+                approve_col, reject_col = st.columns(2)
+                decision = None
+                if approve_col.button("Approve Action"):
+                    decision = True
+                if reject_col.button("Reject Action"):
+                    decision = False
+                if decision is not None:
+                    # Resume from the interrupt straight into execution_agent
                     with st.spinner("Executing Remediation..."):
-                        post_approval_state = app.invoke(final_state)
-                        st.success(post_approval_state.get("final_report"))
+                        try:
+                            if workflows.resume(st.session_state.alert_id, decision):
+                                workflows.wait(st.session_state.alert_id)
+                            else:
+                                st.warning("This incident is no longer awaiting approval "
+                                           f"({(workflows.status(st.session_state.alert_id) or {}).get('status', 'unknown')}).")
+                                st.stop()
+                        except WorkflowsOverloadedError as e:
+                            st.error(str(e))
+                            st.stop()
+                    st.rerun()
+            elif final_state.get("final_report"):
+                if final_state.get("human_approval"):
+                    st.success(final_state["final_report"])
+                else:
+                    st.warning(final_state["final_report"])
 
 # --- Knowledge Management Page ---
 elif "Knowledge Management" in page:
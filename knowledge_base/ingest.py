@@ -1,6 +1,7 @@
 import os
 import shutil
 from config.settings import settings
+from knowledge_base.manifest import content_hash, write_manifest
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.text_splitter import CharacterTextSplitter
@@ -72,6 +73,9 @@ def ingest_documents():
     
     if not texts:
         print("No documents to ingest.")
+        # Still bump the index version so answers cached from removed sources are invalidated
+        os.makedirs(settings.VECTOR_DB_PATH, exist_ok=True)
+        write_manifest({})
         return
 
     # Embeddings
@@ -88,7 +92,10 @@ def ingest_documents():
         os.makedirs(os.path.dirname(save_path))
         
     db.save_local(save_path)
-    print(f"--- Ingestion Complete. Index saved to {save_path} ---")
+
+    # Record index version and per-source hashes (used for cache invalidation)
+    manifest = write_manifest({doc.metadata["source"]: content_hash(doc.page_content) for doc in documents})
+    print(f"--- Ingestion Complete. Index v{manifest['version']} saved to {save_path} ---")
 
 def add_document(file_content: bytes, file_type: str, filename: str = "uploaded_file"):
     """
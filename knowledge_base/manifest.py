@@ -0,0 +1,72 @@
+"""
+Knowledge Index Manifest
+
+Written next to the FAISS index on every ingestion. Records a monotonically
+increasing index version and a content hash per source document so that
+consumers (retriever, answer cache) can tell which sources a re-ingestion
+actually changed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict
+from config.settings import settings
+
+MANIFEST_FILENAME = "manifest.json"
+
+_cache = {"mtime": None, "manifest": None}
+
+
+def manifest_path() -> str:
+    return os.path.join(settings.VECTOR_DB_PATH, MANIFEST_FILENAME)
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a source document's text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_manifest() -> Dict:
+    """
+    Load the current index manifest
+
+    Returns:
+        {"version": int or None, "sources": {source: content hash}}
+    """
+    path = manifest_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {"version": None, "sources": {}}
+
+    # Re-parse only when the file changed
+    if _cache["mtime"] != mtime:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                _cache["manifest"] = json.load(f)
+            _cache["mtime"] = mtime
+        except (json.JSONDecodeError, IOError):
+            return {"version": None, "sources": {}}
+    return _cache["manifest"]
+
+
+def write_manifest(sources: Dict[str, str]) -> Dict:
+    """
+    Write a new manifest with the next index version
+
+    Args:
+        sources: Mapping of source name to content hash
+
+    Returns:
+        The written manifest
+    """
+    previous = load_manifest().get("version") or 0
+    manifest = {"version": previous + 1, "sources": sources}
+
+    path = manifest_path()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return manifest
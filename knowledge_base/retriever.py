@@ -1,31 +1,72 @@
 from config.settings import settings
+from config.tracing import span
+from knowledge_base.manifest import load_manifest
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
 import os
+import threading
 
 class KnowledgeRetriever:
     def __init__(self):
-        self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        with span("retriever.load_model"):
+            self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
         self.db = None
+        self.index_version = None
         self.load_db()
 
     def load_db(self):
         path = settings.VECTOR_DB_PATH
         if os.path.exists(path):
             try:
-                self.db = FAISS.load_local(path, self.embeddings, allow_dangerous_deserialization=True)
+                self.index_version = load_manifest().get("version")
+                with span("retriever.load_index"):
+                    self.db = FAISS.load_local(path, self.embeddings, allow_dangerous_deserialization=True)
             except Exception as e:
                 print(f"Error loading DB: {e}")
         else:
             print("Vector DB not found. Please run ingest.py first.")
 
+    def embed_query(self, query: str):
+        return self.embeddings.embed_query(query)
+
+    def search_documents(self, query: str, k: int = 3):
+        if not self.db:
+            return []
+        with span("retriever.search"):
+            return self.db.similarity_search(query, k=k)
+
+    def search_by_vector(self, embedding, k: int = 3):
+        if not self.db:
+            return []
+        with span("retriever.search"):
+            return self.db.similarity_search_by_vector(embedding, k=k)
+
     def search(self, query: str, k: int = 3):
         if not self.db:
             return ["Vector DB not initialized."]
-        
-        docs = self.db.similarity_search(query, k=k)
+        return self.format_results(self.search_documents(query, k=k))
+
+    @staticmethod
+    def format_results(docs):
         results = []
         for doc in docs:
             source = doc.metadata.get('source', 'Unknown Source')
             results.append(f"Source: {source}\nContent: {doc.page_content}")
         return results
+
+
+_shared_retriever = None
+_shared_lock = threading.Lock()
+
+def get_retriever() -> KnowledgeRetriever:
+    """
+    Process-wide retriever, so the embedding model is loaded once.
+    The index is reloaded when ingestion has bumped the manifest version.
+    """
+    global _shared_retriever
+    with _shared_lock:
+        if _shared_retriever is None:
+            _shared_retriever = KnowledgeRetriever()
+        elif _shared_retriever.index_version != load_manifest().get("version"):
+            _shared_retriever.load_db()
+        return _shared_retriever
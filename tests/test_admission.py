@@ -0,0 +1,30 @@
+import asyncio
+import threading
+
+from chatops.admission import AdmissionController
+
+
+def test_cancelled_follower_does_not_cancel_shared_result():
+    admission = AdmissionController(max_concurrent=2, max_queue=4, queue_timeout_s=5)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "answer"
+
+    async def scenario():
+        leader = asyncio.create_task(admission.run(slow, key="q"))
+        await asyncio.sleep(0.05)
+        followers = [asyncio.create_task(admission.run(slow, key="q")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        followers[0].cancel()
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(leader, *followers, return_exceptions=True)
+        return results
+
+    results = asyncio.run(scenario())
+    assert results[0] == "answer"
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[2:] == ["answer", "answer"]
+    assert admission.stats()["active"] == 0
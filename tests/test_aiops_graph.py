@@ -0,0 +1,26 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiops_workflow.graph import with_deadline
+
+
+def slow_collector(delay_s):
+    def node(state):
+        time.sleep(delay_s)
+        return {"metrics_data": {"cpu": 1}}
+    return node
+
+
+def test_collector_timeout_is_recorded():
+    update = with_deadline("metric_agent", slow_collector(1), 0.1)({})
+    assert "metrics_data" not in update
+    assert update["collection_status"]["metric_agent"]["status"] == "timeout"
+
+
+def test_deadline_starts_when_the_collector_starts():
+    # More concurrent collectors than a small shared pool would run at once
+    node = with_deadline("metric_agent", slow_collector(0.3), 0.6)
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        updates = list(pool.map(node, [{}] * 40))
+    assert all(u["collection_status"]["metric_agent"]["status"] == "ok" for u in updates)
+    assert all(u["metrics_data"] == {"cpu": 1} for u in updates)
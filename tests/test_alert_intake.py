@@ -0,0 +1,36 @@
+from aiops_workflow.executor import OverloadedError
+from aiops_workflow.intake import AlertIntake
+
+
+def test_overloaded_dispatch_is_retried():
+    started = []
+    overloaded = [True]
+
+    def dispatch(state):
+        if overloaded[0]:
+            raise OverloadedError("full")
+        started.append(state["alert_id"])
+
+    intake = AlertIntake(dispatch=dispatch, group_wait_s=10, retry_s=5, tick_s=0)
+    _, incident_id = intake.submit({"alert_type": "CPU", "service": "api", "timestamp": 1000.0})
+
+    assert intake.dispatch_due(1010.0) == 0
+    assert intake.stats()["dispatch_retries"] == 1
+    assert intake.stats()["pending"] == 1
+
+    overloaded[0] = False
+    assert intake.dispatch_due(1014.0) == 0  # retry not due yet
+    assert intake.dispatch_due(1015.0) == 1
+    assert started == [incident_id]
+    stats = intake.stats()
+    assert (stats["dispatched"], stats["pending"], stats["dispatch_failed"]) == (1, 0, 0)
+
+
+def test_failed_dispatch_is_counted():
+    def dispatch(state):
+        raise RuntimeError("boom")
+
+    intake = AlertIntake(dispatch=dispatch, group_wait_s=0, tick_s=0)
+    intake.submit({"alert_type": "CPU", "service": "api", "timestamp": 1000.0})
+    stats = intake.stats()
+    assert (stats["dispatched"], stats["dispatch_failed"], stats["pending"]) == (0, 1, 0)
@@ -0,0 +1,23 @@
+from chatops.session_backends import cold_archive
+from chatops.session_backends.cold_archive import ColdArchiveBackend
+
+
+def session(session_id, text="hello"):
+    return {"id": session_id, "title": session_id, "created_at": "2026-01-01T00:00:00",
+            "last_updated": "2026-01-01T00:00:00", "messages": [{"role": "user", "content": text * 50}]}
+
+
+def test_compact_keeps_session_archived_again_after_delete(tmp_path, monkeypatch):
+    monkeypatch.setattr(cold_archive, "SEGMENT_MAX_BYTES", 200)
+    archive = ColdArchiveBackend(str(tmp_path), codec="zlib")
+    archive.create(session("sess_a"))
+    archive.create(session("sess_filler"))
+    archive.delete("sess_a")  # tombstone in a later segment
+    archive.create(session("sess_a", "again"))  # archived again, in the newest segment
+
+    assert archive.compact(min_dead_fraction=0.0) > 0
+    assert archive.load("sess_a")["messages"][0]["content"].startswith("again")
+
+    archive.index.rebuild()  # from the segments alone
+    assert archive.load("sess_a")["messages"][0]["content"].startswith("again")
+    assert archive.load("sess_filler") is not None
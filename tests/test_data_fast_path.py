@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("crewai")  # the dynamic data tools are CrewAI tools
+
+from chatops.data_fast_path import DataFastPath
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("What is the current system status?", [("system_status", {"component": "all"})]),
+    ("Is the Gateway down?", [("system_status", {"component": "Gateway"})]),
+    ("Status of the order matching engine", [("system_status", {"component": "OrderMatching"})]),
+    ("Trade volume for the last hour", [("trade_volume", {"time_range": "last_hour"})]),
+])
+def test_plan(query, expected):
+    assert DataFastPath().plan(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "Is the gateway or the risk engine down?",
+    "Status of Gateway and RiskEngine",
+])
+def test_several_components_fall_back_to_the_agent(query):
+    assert DataFastPath().plan(query) is None
+
+
+def test_missing_match_count_is_reported_unavailable():
+    calls = [("match_count", {}), ("trade_volume", {"time_range": "today"})]
+    results = {"match_count": {"metric": "match_count", "value": None},
+               "trade_volume": {"value": 1250.0, "unit": "USD", "time_range": "today"}}
+    answer = DataFastPath().format(calls, results)
+    assert "**Match count**: unavailable" in answer
+    assert "1,250.0 USD" in answer
@@ -0,0 +1,10 @@
+from chatops.history import HistoryManager
+
+
+def test_summary_without_covered_count_is_accepted():
+    history = HistoryManager(token_budget=1000, keep_last_turns=2)
+    messages = [{"role": "user", "content": "hi"}]
+
+    text, summary = history.build(messages, {"text": "earlier"})
+    assert summary == {"text": "earlier", "covered": 0}
+    assert text.endswith("user: hi")
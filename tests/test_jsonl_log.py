@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+
+from chatops.session_backends.jsonl_log import AppendLogBackend
+
+
+def new_session(session_id="sess_20260101_000000_0001"):
+    return {"id": session_id, "title": "Test", "created_at": "2026-01-01T00:00:00",
+            "last_updated": "2026-01-01T00:00:00", "messages": []}
+
+
+def messages(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"} for i in range(n)]
+
+
+def read_records(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data.endswith(b"\n")
+    return [json.loads(line) for line in data.splitlines()]
+
+
+def test_torn_final_record_is_ignored_then_truncated(tmp_path):
+    session = new_session()
+    backend = AppendLogBackend(str(tmp_path), fsync="never")
+    backend.create(session)
+    backend.update(session["id"], messages(2), {"last_updated": "2026-01-01T00:01:00"})
+    backend.close()
+
+    path = tmp_path / f"{session['id']}.jsonl"
+    with open(path, "ab") as f:
+        f.write(b'{"type": "message", "seq": 2, "message": {"role": "us')  # crash mid-write
+
+    backend = AppendLogBackend(str(tmp_path), fsync="never")
+    assert backend.load(session["id"])["messages"] == messages(2)
+    assert backend.load_messages(session["id"]) == messages(2)
+
+    assert backend.update(session["id"], messages(3), {"last_updated": "2026-01-01T00:02:00"})
+    records = read_records(path)  # every line decodes: the torn bytes were cut off
+    assert [r["seq"] for r in records if r["type"] == "message"] == [0, 1, 2]
+    assert backend.load(session["id"])["messages"] == messages(3)
+    backend.close()
+
+
+def test_legacy_json_session_is_converted_on_first_update(tmp_path):
+    session = dict(new_session(), messages=messages(2))
+    legacy_path = tmp_path / f"{session['id']}.json"
+    legacy_path.write_text(json.dumps(session), encoding="utf-8")
+
+    backend = AppendLogBackend(str(tmp_path), fsync="never")
+    assert backend.load(session["id"])["messages"] == messages(2)
+    assert backend.list_metadata()[0]["message_count"] == 2
+
+    assert backend.update(session["id"], messages(4), {"last_updated": "2026-01-01T00:05:00"})
+    assert not legacy_path.exists()
+    assert (tmp_path / f"{session['id']}.jsonl").exists()
+    loaded = backend.load(session["id"])
+    assert loaded["messages"] == messages(4)
+    assert loaded["last_updated"] == "2026-01-01T00:05:00"
+    assert backend.list_metadata()[0]["message_count"] == 4
+    backend.close()
+
+
+def test_compaction_while_appends_are_in_flight(tmp_path):
+    session = new_session()
+    backend = AppendLogBackend(str(tmp_path), fsync="never", compact_after=2)
+    backend.create(session)
+
+    # Slow the rewrite down so appends queue up behind a running compaction
+    rewrite = backend._rewrite
+    compactions = []
+
+    def slow_rewrite(session_data):
+        if threading.current_thread().name.startswith("session-compact"):
+            compactions.append(len(session_data["messages"]))
+            time.sleep(0.005)
+        return rewrite(session_data)
+
+    backend._rewrite = slow_rewrite
+    total = 120
+    for n in range(2, total + 1, 2):
+        assert backend.update(session["id"], messages(n), {"last_updated": f"2026-01-01T00:00:{n % 60:02d}"})
+    backend.close()
+
+    assert compactions, "no compaction ran"
+    assert backend.load(session["id"])["messages"] == messages(total)
+    assert backend.load_messages(session["id"], offset=total - 2) == messages(total)[-2:]
+
+    reopened = AppendLogBackend(str(tmp_path), fsync="never")
+    assert reopened.load(session["id"])["messages"] == messages(total)
+    records = read_records(tmp_path / f"{session['id']}.jsonl")
+    assert records[0]["type"] == "header"
+    reopened.close()
+
+
+def test_edit_before_the_last_message_is_not_lost(tmp_path):
+    session = new_session()
+    backend = AppendLogBackend(str(tmp_path), fsync="never")
+    backend.create(session)
+    backend.update(session["id"], messages(3), {"last_updated": "2026-01-01T00:01:00"})
+
+    edited = messages(4)
+    edited[0] = dict(edited[0], content="edited")  # the stored last message (index 2) is unchanged
+    assert backend.update(session["id"], edited, {"last_updated": "2026-01-01T00:02:00"})
+    assert backend.load(session["id"])["messages"] == edited
+    backend.close()
+
+    reopened = AppendLogBackend(str(tmp_path), fsync="never")
+    assert reopened.load(session["id"])["messages"] == edited
+    reopened.close()
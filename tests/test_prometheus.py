@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from chatops.datasources.base import DataSourceError
+from chatops.datasources.prometheus import PrometheusSource
+
+
+@pytest.mark.parametrize("payload", [
+    {"status": "success", "data": {"resultType": "vector", "result": [{"metric": {}}]}},
+    {"status": "success", "data": {"resultType": "vector", "result": [{"value": [1.0]}]}},
+    {"status": "success", "data": {"resultType": "scalar", "result": None}},
+    {"status": "success", "data": {"resultType": "vector", "result": [{"value": [1.0, "n/a"]}]}},
+    ["not", "an", "object"],
+])
+def test_malformed_payload_raises_datasource_error(payload, monkeypatch):
+    source = PrometheusSource("prometheus", "http://prometheus.invalid")
+
+    async def get_json(path, params=None):
+        return payload
+
+    monkeypatch.setattr(source, "get_json", get_json)
+    with pytest.raises(DataSourceError):
+        asyncio.run(source.query("up"))
@@ -0,0 +1,21 @@
+from chatops.session_backends.json_file import JsonFileBackend
+from chatops.session_backends.jsonl_log import AppendLogBackend
+from chatops.session_backends.migrate import migrate
+
+
+def session(n):
+    return {"id": f"sess_20260101_00000{n}_0001", "title": f"Chat {n}", "created_at": "2026-01-01T00:00:00",
+            "last_updated": f"2026-01-01T00:00:0{n}", "messages": [{"role": "user", "content": f"hi {n}"}]}
+
+
+def test_file_backends_in_one_directory_keep_separate_indexes(tmp_path):
+    source = AppendLogBackend(str(tmp_path), fsync="never")
+    for n in range(3):
+        source.create(session(n))
+    source.close()
+
+    assert JsonFileBackend(str(tmp_path)).list_metadata() == []
+    assert migrate(str(tmp_path), "jsonl", "json") == {"copied": 3, "skipped": 0, "failed": 0}
+    target = JsonFileBackend(str(tmp_path))
+    assert sorted(m["id"] for m in target.list_metadata()) == [session(n)["id"] for n in range(3)]
+    assert target.load(session(1)["id"])["messages"] == session(1)["messages"]
@@ -0,0 +1,25 @@
+from chatops.session_manager import SessionManager
+from config.settings import settings
+
+
+def test_retention_applies_to_cached_sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_SESSIONS", 3)
+    monkeypatch.setattr(settings, "SESSION_RETENTION_POLICY", "archive")
+    monkeypatch.setattr(settings, "SESSION_ARCHIVE_IDLE_DAYS", 0)
+    monkeypatch.setattr(settings, "SESSION_SEARCH_ENABLED", False)
+    manager = SessionManager(str(tmp_path), backend="jsonl", cache_size=64)
+
+    ids = []
+    for n in range(6):
+        session_id = manager.create_session(f"Chat {n}")
+        manager.update_session(session_id, [{"role": "user", "content": f"question {n}"}])
+        ids.append(session_id)
+    manager._background.submit(lambda: None).result()  # let queued retention runs finish
+    manager.enforce_retention()
+
+    live = [m["id"] for m in manager.list_sessions()]
+    assert sorted(live) == sorted(ids[3:])
+    archived = [m["id"] for m in manager.list_sessions(include_archived=True) if m.get("archived")]
+    assert sorted(archived) == sorted(ids[:3])
+    assert manager.get_messages(ids[0]) == [{"role": "user", "content": "question 0"}]
+    manager.flush()
@@ -0,0 +1,41 @@
+import sqlite3
+
+from chatops.session_backends.sqlite import SqliteBackend
+
+
+def new_session(session_id="sess_20260101_000000_0001"):
+    return {"id": session_id, "title": "Test", "created_at": "2026-01-01T00:00:00",
+            "last_updated": "2026-01-01T00:00:00", "messages": []}
+
+
+def messages(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"} for i in range(n)]
+
+
+def test_edit_before_the_last_message_is_not_lost(tmp_path):
+    session = new_session()
+    backend = SqliteBackend(str(tmp_path / "sessions.db"))
+    backend.create(session)
+    backend.update(session["id"], messages(3), {"last_updated": "2026-01-01T00:01:00"})
+
+    edited = messages(4)
+    edited[0] = dict(edited[0], content="edited")  # the stored last message (index 2) is unchanged
+    assert backend.update(session["id"], edited, {"last_updated": "2026-01-01T00:02:00"})
+    assert backend.load(session["id"])["messages"] == edited
+
+    assert backend.update(session["id"], edited + messages(6)[4:], {"last_updated": "2026-01-01T00:03:00"})
+    assert backend.load(session["id"])["messages"] == edited + messages(6)[4:]
+
+
+def test_database_without_digest_column_is_upgraded(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    backend = SqliteBackend(path)
+    session = new_session()
+    backend.create(session)
+    backend.update(session["id"], messages(2), {"last_updated": "2026-01-01T00:01:00"})
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE sessions DROP COLUMN messages_digest")
+
+    backend = SqliteBackend(path)
+    assert backend.update(session["id"], messages(4), {"last_updated": "2026-01-01T00:02:00"})
+    assert backend.load(session["id"])["messages"] == messages(4)
@@ -0,0 +1,49 @@
+import json
+
+from config import tracing
+from config.settings import settings
+
+
+def read_spans(path):
+    with open(path, encoding="utf-8") as f:
+        return {record["name"]: record for record in map(json.loads, f)}
+
+
+def test_generator_span_is_not_current_between_yields(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACE_FILE", str(tmp_path / "trace.jsonl"))
+    monkeypatch.setattr(tracing, "_logger", None)
+
+    def stream():
+        with tracing.open_span("request") as request:
+            with request.activate():
+                with tracing.span("classify"):
+                    pass
+            for chunk in ("a", "b"):
+                yield chunk
+
+    seen = []
+    for chunk in stream():
+        seen.append(tracing.current_span())
+        with tracing.span("consumer"):
+            pass
+    assert all(current is tracing._NOOP_SPAN for current in seen)
+
+    spans = read_spans(settings.TRACE_FILE)
+    assert spans["classify"]["parent_id"] == spans["request"]["span_id"]
+    assert spans["consumer"]["parent_id"] is None
+
+
+def test_summary_is_recomputed_only_when_the_trace_changes(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(json.dumps({"name": "stage", "duration_ms": 10}) + "\n", encoding="utf-8")
+    monkeypatch.setattr(tracing, "_summary_cache", (None, None))
+
+    assert tracing.summarize_traces(str(path))[0]["count"] == 1
+    cached = tracing._summary_cache
+    tracing.summarize_traces(str(path))
+    assert tracing._summary_cache is cached
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"name": "stage", "duration_ms": 30}) + "\n")
+    assert tracing.summarize_traces(str(path))[0]["count"] == 2
@@ -0,0 +1,43 @@
+import os
+import threading
+import time
+
+import pytest
+
+from aiops_workflow.checkpoint import SqliteCheckpointer
+from aiops_workflow.executor import OverloadedError, WorkflowExecutor
+from aiops_workflow.graph import create_aiops_graph
+
+
+def incident(alert_id, severity, approval=None):
+    return {"alert_id": alert_id, "alert_type": "API Latency Spike",
+            "alert_details": {"severity": severity, "source": "Production"}, "human_approval": approval}
+
+
+def test_queued_approval_is_not_shed(tmp_path):
+    app = create_aiops_graph(checkpointer=SqliteCheckpointer(os.path.join(tmp_path, "aiops.db")))
+    executor = WorkflowExecutor(app, max_workers=1, max_queue=1)
+    assert executor.wait(executor.submit(incident("INC-LOW", "low")))["status"] == "awaiting_approval"
+
+    # Hold the only worker so the resumed run stays queued
+    gate = threading.Event()
+    execute = executor._execute
+
+    def held(run, payload):
+        gate.wait(5)
+        execute(run, payload)
+
+    executor._execute = held
+    executor.submit(incident("INC-BUSY", "high", approval=True))
+    while executor.stats()["running"] == 0:
+        time.sleep(0.01)
+
+    assert executor.resume("INC-LOW", True)
+    with pytest.raises(OverloadedError):
+        executor.submit(incident("INC-CRIT", "critical"))
+    assert executor.status("INC-LOW")["status"] == "queued"
+
+    gate.set()
+    assert executor.wait("INC-LOW", timeout=10)["status"] == "completed"
+    assert app.get_state({"configurable": {"thread_id": "INC-LOW"}}).next == ()
+    executor.close()